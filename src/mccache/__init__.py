@@ -53,8 +53,11 @@ SEE: https://highscalability.com/gossip-protocol-explained/
     Are we so crazy to think of this design and implementation?
     Surely, this is a solved problem or the herd mentality is on the client-server model.
 """
+import asyncio
 import atexit
 import base64
+import functools
+import hashlib
 import logging
 import logging.handlers
 import os
@@ -63,16 +66,19 @@ import queue
 import random
 import re
 import socket
+import stat
 import struct
 import subprocess
 import sys
+import tempfile
 import threading
 import time
 import traceback
+from collections.abc        import Callable, Iterable, Iterator, Mapping
 from cryptography.fernet    import Fernet
 from dataclasses            import dataclass, fields
 from enum                   import Enum, Flag, IntEnum, StrEnum
-from inspect                import getframeinfo, stack
+from inspect                import getframeinfo, iscoroutinefunction, stack
 from logging.handlers       import QueueListener  #,RotatingFileHandler
 from types                  import FunctionType
 
@@ -84,12 +90,18 @@ import psutil
 #
 from mccache.__about__ import __app__, __version__  # noqa
 from pycache import Cache as PyCache
+from pycache import CallbackDispatcher
 from pycache import CallbackType
+from pycache import SerializedValue
+from pycache import SingleFlight
 
 # McCache Section.
 #
 # FOR:  from mccache import *
-__all__ = [ 'clear_cache',
+__all__ = [ 'cached',
+            'McCacheAgentMode',
+            'McCacheProxy',
+            'clear_cache',
             'get_cache',
             'get_mtu',
             'get_hops',
@@ -97,6 +109,7 @@ __all__ = [ 'clear_cache',
             'get_local_checksum',
             'get_cluster_metrics',
             'get_cluster_checksum',
+            'set_callback_loop',
             'McCacheDebugLevel',
             'McCacheOption',
             'McCacheDebugLevel',
@@ -108,13 +121,22 @@ __all__ = [ 'clear_cache',
 BACKOFF     = {1 ,2 ,3 ,5 ,8 ,13}       # Fibonacci backoff.  Seen lots of dropped packets in dev if without backing off.
 ONE_MIB     = 1_048_576                 # 1 Mib
 ONE_NS_SEC  = 1_000_000_000             # One Nano second.
-MAGIC_BYTE  = 0b11111001                # 241 (Pattern + Version)
+MAGIC_BYTE  = 0b11111010                # 250 (Pattern + Version 2)  The cached values are sent as raw pickled bytes.
+MAGIC_BYTE1 = 0b11111001                # 249 (Pattern + Version 1)  The cached values are pickled within the message.
 HEADER_SIZE = 18                        # The fixed length header for each fragment packet.
 STRUCT_PACK = '@BBBBHHQH'               # The structure of the pickled header.
 SEASON_TIME = 2.00                      # Seasoning time to wait before considering a retry. Max of 3 second.  Work with backoff.
 HUNDRED     = 100                       # Hundred percent.
 UINT2       = 65535                     # Unsigned 2 bytes.
+BATCH_SIZE  = 45_000                    # Serialized bytes per batch message.  Leave room for the encryption overhead within UINT2.
 RETRIES     = 3                         # Number of retries before giving up.
+SNAPSHOT_VER= 1                         # Format version of the cache snapshot file.
+AGENT_FRAME = '!I'                      # The length prefix of a pickled request/response on the host agent socket.
+AGENT_CREDS = '3i'                      # The (pid ,uid ,gid) of the peer of the host agent socket.  SEE: SO_PEERCRED
+AGENT_DIR   = os.environ.get('XDG_RUNTIME_DIR') or os.path.join( tempfile.gettempdir() ,f"mccache-{os.getuid() if hasattr( os ,'getuid' ) else 0}")
+AGENT_CALLS = frozenset({'__contains__' ,'__delitem__' ,'__getitem__' ,'__len__' ,'__setitem__' ,'clear' ,'delete_many'
+                        ,'get' ,'get_many' ,'items' ,'keys' ,'pop' ,'set' ,'set_many' ,'values' ,'claim' ,'metrics'
+                        ,'checksum' ,'clear_cache' ,'cluster_checksum' ,'cluster_metrics'})
 
 class EnableMultiCast( Flag ):
     YES = True      # Multicast out the change.
@@ -146,6 +168,17 @@ class McCacheMode( IntEnum ):
     def __str__(self):
         return str(self.value)
 
+class McCacheAgentMode( IntEnum ):
+    DISABLE = 0     # Every process is a member of the cluster with its own replica of the caches.
+    AGENT   = 1     # This process is the member for the host.  It own the caches and serve the other processes on the host.
+    CLIENT  = 2     # This process proxy its caches to the host agent.  It is not a member of the cluster.
+
+    def __repr__(self):
+        return self.value
+
+    def __str__(self):
+        return str(self.value)
+
 class McCacheDebugLevel(IntEnum):
     DISABLE     =   0   # Disabled.
     BASIC       =   1   # Basic detail output.
@@ -161,10 +194,23 @@ class McCacheDebugLevel(IntEnum):
 class McCacheOption( StrEnum ):
     # Constants for linter to catch typos instead of at runtime.
     MCCACHE_CACHE_TTL       = 'MCCACHE_CACHE_TTL'
+    MCCACHE_CACHE_TTI       = 'MCCACHE_CACHE_TTI'
     MCCACHE_CACHE_MAX       = 'MCCACHE_CACHE_MAX'
     MCCACHE_CACHE_MODE      = 'MCCACHE_CACHE_MODE'
     MCCACHE_CACHE_SIZE      = 'MCCACHE_CACHE_SIZE'
     MCCACHE_CACHE_PULSE     = 'MCCACHE_CACHE_PULSE'
+    MCCACHE_CACHE_ARENA     = 'MCCACHE_CACHE_ARENA'
+    MCCACHE_CACHE_COMPRESS  = 'MCCACHE_CACHE_COMPRESS'
+    MCCACHE_CACHE_CMPSIZE   = 'MCCACHE_CACHE_CMPSIZE'
+    MCCACHE_CACHE_CHECKSUM  = 'MCCACHE_CACHE_CHECKSUM'
+    MCCACHE_CACHE_EVICT     = 'MCCACHE_CACHE_EVICT'
+    MCCACHE_CACHE_JITTER    = 'MCCACHE_CACHE_JITTER'
+    MCCACHE_CACHE_POLICY    = 'MCCACHE_CACHE_POLICY'
+    MCCACHE_CACHE_REAPER    = 'MCCACHE_CACHE_REAPER'
+    MCCACHE_CACHE_REFRESH   = 'MCCACHE_CACHE_REFRESH'
+    MCCACHE_CACHE_SIZER     = 'MCCACHE_CACHE_SIZER'
+    MCCACHE_CACHE_SERIALIZE = 'MCCACHE_CACHE_SERIALIZE'
+    MCCACHE_CACHE_XFETCH    = 'MCCACHE_CACHE_XFETCH'
     MCCACHE_CONGESTION      = 'MCCACHE_CONGESTION'
     MCCACHE_CRYPTO_KEY      = 'MCCACHE_CRYPTO_KEY'
     MCCACHE_PACKET_MTU      = 'MCCACHE_PACKET_MTU'
@@ -173,6 +219,12 @@ class McCacheOption( StrEnum ):
     MCCACHE_MULTICAST_PORT  = 'MCCACHE_MULTICAST_PORT'
     MCCACHE_MULTICAST_HOPS  = 'MCCACHE_MULTICAST_HOPS'
     MCCACHE_CALLBACK_WIN    = 'MCCACHE_CALLBACK_WIN'
+    MCCACHE_CALLBACK_WORKERS= 'MCCACHE_CALLBACK_WORKERS'
+    MCCACHE_CALLBACK_BACKLOG= 'MCCACHE_CALLBACK_BACKLOG'
+    MCCACHE_CLAIM_TIMEOUT   = 'MCCACHE_CLAIM_TIMEOUT'
+    MCCACHE_AGENT_MODE      = 'MCCACHE_AGENT_MODE'
+    MCCACHE_AGENT_SOCKET    = 'MCCACHE_AGENT_SOCKET'
+    MCCACHE_SNAPSHOT_FILE   = 'MCCACHE_SNAPSHOT_FILE'
     MCCACHE_DAEMON_SLEEP    = 'MCCACHE_DAEMON_SLEEP'
     MCCACHE_LOG_FILENAME    = 'MCCACHE_LOG_FILENAME'
     MCCACHE_LOG_FORMAT      = 'MCCACHE_LOG_FORMAT'
@@ -190,7 +242,9 @@ class McCacheOption( StrEnum ):
 class OpCode(StrEnum):
     # Keep everything here as 3 character fixed length strings.
     ACK = 'ACK'     # Acknowledgement of a received message fragment.
+    BAT = 'BAT'     # Batch of cache entry changes.
     BYE = 'BYE'     # Member announcing it is leaving the group.
+    CLM = 'CLM'     # Member claiming the load of a missing cache entry.
     DBG = 'DBG'     # Member communicating debug information..
     DEL = 'DEL'     # Member requesting the group to delete the cache entry.
     ERR = 'ERR'     # Member announcing an error to the group.
@@ -224,9 +278,22 @@ class McCacheConfig:
     alert_email: str    = None          # Email address to send alert messages. Scheme: smtp://username;password@server:port
     cache_ttl: int      = 3600          # Total Time to Live in seconds for a cached entry.
                                         # SEE: https://dev.acquia.com/blog/how-choose-right-cache-expiry-lifetime
+    cache_tti: int      = 0             # Time to Idle in seconds for a cached entry that is not looked up.  Evicted locally only.  0=Disabled.
     cache_max: int      = 256           # Max entries threshold for triggering entries eviction.
     cache_size: int     = 256*4096*8    # Max size in bytes threshold for triggering entries eviction.
     cache_pulse:int     = 5             # Cache synchronization heartbeat pulse in minutes.
+    cache_arena: int    = 0             # Initial bytes of the mmap arena to store the values serialized off the Python heap.  0=Disabled.
+    cache_compress: str = None          # Algorithm to compress the large values with.  zlib ,lzma.  SEE: pycache.CompressType
+    cache_cmpsize: int  = 1024          # Pickled size in bytes from which a value is compressed.
+    cache_checksum: str = 'md5'         # Strategy to checksum a cached value with.  md5 ,blake2b ,pickle.  SEE: pycache.ChecksumType
+    cache_evict: int    = 1             # Capacity eviction mode.  0=Local only ,1=Multicast the eviction to the cluster.
+    cache_jitter: int   = 0             # Percentage (0-99) to randomly shorten the ttl of each entry by.  Spread out the expiry.
+    cache_policy: str   = 'fifo'        # Eviction policy on capacity.  fifo ,lru ,lfu ,tinylfu.  SEE: pycache.PolicyType
+    cache_reaper:int    = 0             # Background ttl reaper batch size.  0=Expired entries are evicted inline by the application threads.
+    cache_refresh:int   = 0             # Percentage (1-99) of the ttl after which an entry with a loader is served stale and reloaded.  0=Disabled.
+    cache_xfetch: float = 0.0           # Beta of the probabilistic early reload of an entry with a loader.  1.0 is typical.  0=Disabled.
+    cache_sizer: str    = 'deep'        # Strategy to size a cached value with.  deep ,shallow ,sample ,pickle.  SEE: pycache.SizerType
+    cache_serialize:int = 0             # 1=Pickle the value on the application thread that set it.  0=Pickle on the multicaster thread.
     cache_mode: int     = 1             # Cache consistent syncing mode.  0=Partial sync ,1=Full sync.
     cache_sync_on: float= 0.0           # Cache last synchronized time from this node to the members.
     congestion: int     = 25            # The maximum cutoff to start congestion control.
@@ -244,6 +311,12 @@ class McCacheConfig:
 #   queue_ib_size: int  = 65536         # Internal  in-bound queue size to prevent run away memory consumption.  Set it large but no infinite.
 #   queue_ob_size: int  = 65536         # Internal out-bound queue size to prevent run away memory consumption.  Set it large but no infinite.
     callback_win: int   = 5             # Change callback window size seconds (1-999).
+    callback_workers:int= 2             # Max worker threads to deliver the change callbacks.
+    callback_backlog:int= 1024          # Max keys waiting for their change callback to be delivered.  The rest are dropped.
+    claim_timeout: float= 1.0           # Max seconds to wait for the member that claimed the load of a missing entry.  0=Disabled.
+    agent_mode: int     = 0             # Host agent mode.  0=Disabled ,1=Agent ,2=Client of the agent.  SEE: McCacheAgentMode
+    agent_socket: str   = os.path.join( AGENT_DIR ,'mccache.sock')  # Unix domain socket of the host agent in a per user directory.
+    snapshot_file: str  = None          # File to snapshot the caches into on exit and to warm them up from on start.  None=Disabled.
     monkey_tantrum: int = 0             # Chaos monkey tantrum % level (0 - 99).
     daemon_sleep: float = SEASON_TIME   # House keeping snooze seconds (0.33 - 3.0).
     random_seed: int    = int(str(socket.getaddrinfo(socket.gethostname() ,0 ,socket.AF_INET )[0][4][0]).split(".")[3])
@@ -258,10 +331,16 @@ _lock = threading.RLock()               # Module-level lock for serializing acce
 _mySelf:    dict[str]         = {}      # All my IP address.
 _mcConfig:  McCacheConfig     = None    # Private McCache configuration.
 _mcCrypto:  Fernet            = None    # Private encryption/decryption function.
+_mcDispatch:CallbackDispatcher= None    # Private bounded pool to deliver the change callbacks of all the caches.
 _mcCache:   dict[str   ,dict] = {}      # Private dictionary to segregate the cache namespace.
 _mcArrived: dict[tuple ,dict] = {}      # Private dictionary to manage arriving fragments to be assemble into a value message.
 _mcPending: dict[tuple ,dict] = {}      # Private dictionary to manage send fragment needing acknowledgements.
 _mcMember:  dict[str   ,int]  = {}      # Private dictionary to manage members in the group.  IP: Timestamp.
+_mcClaims:  dict[tuple ,tuple]= {}      # Private dictionary to manage the claimed loads.  (namespace ,key): (IP ,deadline).
+_mcProxy:   dict[str   ,object]={}      # Private dictionary of the cache namespace proxied to the host agent.
+_mcAgent:   threading.local = threading.local() # Private per thread connection to the host agent.
+_mcMissing: object = object()           # Private sentinel for an entry that is not in the cache.
+_mcBatchTsm:int    = 0                  # Private last timestamp that identify a batch message.  Strictly increasing per process.
 _mcLgLsnr:QueueListener= None           # Private log listener.
 _mcIBQueue:queue.Queue = queue.Queue()  # Private inbound  operation queue.
 _mcOBQueue:queue.Queue = queue.Queue()  # Private outbound operation queue.
@@ -322,7 +401,7 @@ def _default_callback(ctx: dict) -> bool:
                                             ,msg=f"^   WRN {ctx['key']} got incoherent  within {ctx['elp']:6} sec in the background." )
     return  True
 
-def get_cache( name: str | None='mccache' ,callback: FunctionType = _default_callback ) -> PyCache:
+def get_cache( name: str | None='mccache' ,callback: FunctionType = _default_callback ,policy: str | None = None ,loader: Callable | None = None ) -> PyCache:
     """Return a cache with the specified name ,creating it if necessary.
 
     If no name is provided, it shall be defaulted to `mccache`.
@@ -331,6 +410,10 @@ def get_cache( name: str | None='mccache' ,callback: FunctionType = _default_cal
     Args:
         name:       Name to isolate different caches.  Namespace dot notation is suggested.
         callback:   Your function to call if a value got updated just after you have read it.
+                    Not applicable to a client of the host agent.  SEE: `McCacheProxy`
+        policy:     Eviction policy for a new cache.  fifo ,lru ,lfu ,tinylfu.  Default to the configured `cache_policy`.
+        loader:     Your function to call with a key to reload a stale entry in the background.
+                    SEE: `cache_refresh` and `cache_xfetch`.
     Return:
         Cache instance identified with given name or the default `mccache`.
     """
@@ -340,8 +423,16 @@ def get_cache( name: str | None='mccache' ,callback: FunctionType = _default_cal
     else:
         name  =  'mccache'
 
+    if  _mcConfig.agent_mode == McCacheAgentMode.CLIENT:
+        # NOTE: The cache is owned by the host agent.  The callback, policy and loader of the agent's cache apply.
+        if  name not in _mcProxy:
+            _mcProxy[ name ] = McCacheProxy( name )
+        return  _mcProxy[ name ]
+
     if  name  in _mcCache:
         cache =  _mcCache[ name ]
+        if  loader:
+            cache.loader = loader
     else:
         debug =(_mcConfig.debug_level >= McCacheDebugLevel.SUPERFLUOUS)
         msgbdy= _mcConfig.log_msgfmt.replace('{iam}' ,SRC_IP_ADD ).replace('{sdr}' ,f'   {FRM_IP_PAD}').replace('{msg}' ,'>>> {msg}')
@@ -350,11 +441,27 @@ def get_cache( name: str | None='mccache' ,callback: FunctionType = _default_cal
                     max     =_mcConfig.cache_max,
                     size    =_mcConfig.cache_size,
                     ttl     =_mcConfig.cache_ttl,
+                    tti     =_mcConfig.cache_tti,
+                    jitter  =_mcConfig.cache_jitter,
+                    localevict=_mcConfig.cache_evict == 0,
+                    reaper  =_mcConfig.cache_reaper > 0,
+                    checksum=_mcConfig.cache_checksum,
+                    policy  = policy or _mcConfig.cache_policy,
+                    sizer   =_mcConfig.cache_sizer,
+                    serialize=_mcConfig.cache_serialize > 0,
+                    arena   =_mcConfig.cache_arena,
+                    compress=_mcConfig.cache_compress,
+                    cmpsize =_mcConfig.cache_cmpsize,
                     msgbdy  = msgbdy,
                     logger  = logger,
                     queue   =_mcOBQueue,
                     callback= callback,
                     cbwindow=_mcConfig.callback_win,
+                    dispatcher=_mcDispatch,
+                    claimer =_claim_load if _mcConfig.claim_timeout > 0 else None,
+                    loader  = loader,
+                    refresh =_mcConfig.cache_refresh,
+                    xfetch  =_mcConfig.cache_xfetch,
                     debug   = debug # Enable extra debugging inside this object.
                 )
         _mcCache[ name ] = cache
@@ -365,6 +472,7 @@ def clear_cache( name: str | None=None ,node: str | None = None ) -> None:
 
     Request all the members in the cluster to clear their cache without rebooting their instance.
     This method is intended to be used from a node that is not participating in the cluster.
+    A client of the host agent request it through the agent.
 
     Args:
         name:   Name of the cache.  If none is provided, all caches checksum shall be produced.
@@ -373,6 +481,9 @@ def clear_cache( name: str | None=None ,node: str | None = None ) -> None:
     Return:
         None
     """
+    if  _mcConfig.agent_mode == McCacheAgentMode.CLIENT:
+        return  _agent_request(('clear_cache' ,name ,(node ,) ,{}))
+
     # TODO: Rethink querying local and all nodes.
     if  node and node not in _mcMember and node not in _mySelf:
         logger.error(f"Node: {node} does not exist in the cluster.")
@@ -445,6 +556,7 @@ def get_cluster_metrics( name: str | None = None ,node: str | None = None ) -> N
     """Inquire the metrics for all the distributed caches into their log.
 
     Queue the `MET` operation into the cluster.
+    A client of the host agent request it through the agent.
 
     Args:
         name:   Name of the cache.  If none is provided, all caches checksum shall be produced.
@@ -453,6 +565,9 @@ def get_cluster_metrics( name: str | None = None ,node: str | None = None ) -> N
     Return:
         None
     """
+    if  _mcConfig.agent_mode == McCacheAgentMode.CLIENT:
+        return  _agent_request(('cluster_metrics' ,name ,(node ,) ,{}))
+
     # TODO: Rethink querying local and all nodes.
     if  node and node not in _mcMember and node not in _mySelf:
         logger.error(f"Node: {node} does not exist in the cluster.")
@@ -462,13 +577,17 @@ def get_cluster_metrics( name: str | None = None ,node: str | None = None ) -> N
 
 def get_local_metrics( name: str | None = None ) -> dict:
     """Inquire the local cache metrics.
+    A client of the host agent inquire the agent's metrics.
     """
+    if  _mcConfig.agent_mode == McCacheAgentMode.CLIENT:
+        return  _agent_request(('metrics' ,name ,() ,{}))
     return  _get_local_metrics( name )
 
 def get_cluster_checksum( name: str | None = None ,key: str | None = None ,node: str | None = None ) -> None:
     """Inquire the checksum for all the distributed caches into their log.
 
     Queue the `INQ` operation into the cluster.
+    A client of the host agent request it through the agent.
 
     Args:
         name:   Name of the cache.  If none is provided, all caches checksum shall be produced.
@@ -478,6 +597,9 @@ def get_cluster_checksum( name: str | None = None ,key: str | None = None ,node:
     Return:
         None
     """
+    if  _mcConfig.agent_mode == McCacheAgentMode.CLIENT:
+        return  _agent_request(('cluster_checksum' ,name ,(key ,node) ,{}))
+
     # TODO: Rethink querying local and all nodes.
     if  node and not( node in _mySelf or node in _mcMember ):
         logger.error(f"Input node: {node} does not exist in the cluster.")
@@ -496,11 +618,337 @@ def get_cluster_checksum( name: str | None = None ,key: str | None = None ,node:
 def get_local_checksum( name: str | None = None ,key: str | None = None ) -> dict:
     """
     Inquire the local cache checksum.
+    A client of the host agent inquire the agent's checksum.
     """
+    if  _mcConfig.agent_mode == McCacheAgentMode.CLIENT:
+        return  _agent_request(('checksum' ,name ,(key ,) ,{}))
     return  _get_local_checksum( name ,key )
 
+def set_callback_loop( loop: asyncio.AbstractEventLoop | None ) -> None:
+    """Deliver the change callbacks to an asyncio event loop instead of calling them on the worker threads.
+
+    A coroutine function callback is scheduled as a task in the loop.  Other callbacks are called soon in the loop.
+
+    Args:
+        loop:   The event loop to deliver to.  None to revert to calling them on the worker threads.
+    """
+    _mcDispatch.loop = loop
+
+def cached( name: str | None = None ,ttl: int | None = None ) -> Callable:
+    """Decorator to memoize the result of a function in a cache that is replicated to the cluster.
+
+    The cache key is made from the positional and keyword arguments, that must be hashable or picklable.
+    A miss is loaded through `get_or_load()`, so only one caller per key call the function.
+    Coroutine functions are awaited, with the concurrent misses of the same key awaiting the same call.
+
+    Usage:
+        @mccache.cached( 'demo.price' ,ttl=60 )
+        def get_price( sku: str ) -> float:
+            ...
+
+    The decorated function has a `metrics()` method that return its hit, miss and load time counters.
+    A miss is a call that ran the function.
+
+    Args:
+        name:   Name of the cache.  Default to a namespace of its own from the module and name of the function.
+        ttl:    Optional time to live in seconds for the results.  Default to the configured `cache_ttl`.
+    Return:
+        The decorator.
+    """
+    def decorator( fn: Callable ) -> Callable:
+        nms: str  = name or f"{fn.__module__}.{fn.__qualname__}"
+        pfx: str  = fn.__qualname__ if name else None   # NOTE: Only qualify the key in a shared namespace.
+        mtr: dict = {'hits': 0 ,'misses': 0 ,'loadInt': 0.0}
+
+        def record( bgn: int ) -> None:
+            mtr['loadInt'] = ((mtr['loadInt'] * mtr['misses']) + (time.monotonic_ns() - bgn)) / (mtr['misses'] + 1)
+            mtr['misses'] += 1
+
+        def metrics() -> dict:
+            return  {   'hits':     mtr['hits'],
+                        'misses':   mtr['misses'],
+                        'loadInt':  round( mtr['loadInt'] / ONE_NS_SEC ,4 ),
+                    }
+
+        if  iscoroutinefunction( fn ):
+            inflight: dict = {}     # Key to the task loading it.
+
+            async def load( mcc: PyCache ,key: object ,args: tuple ,kwargs: dict ) -> object:
+                # NOTE: Wait for the member that claimed it, if any.  SEE: get_or_load()
+                wait = _claim_load( nms ,key ) if _mcConfig.claim_timeout > 0 else 0
+                ddl  = time.monotonic() + wait
+                while wait > 0 and key not in mcc and time.monotonic() < ddl:
+                    await asyncio.sleep( 0.01 )
+                val = mcc.get( key ,_mcMissing )   # NOTE: One lookup.  It can expire or be evicted in between two.
+                if  val is not _mcMissing:
+                    return  val
+
+                bgn = time.monotonic_ns()
+                val = await fn( *args ,**kwargs )
+                record( bgn )
+                mcc.__setitem__( key ,val ,ttl=ttl )
+                return  val
+
+            @functools.wraps( fn )
+            async def awrapper( *args ,**kwargs ) -> object:
+                key = _make_cached_key( pfx ,args ,kwargs )
+                mcc = get_cache( nms )
+                val = mcc.get( key ,_mcMissing )   # NOTE: One lookup.  It can expire or be evicted in between two.
+                if  val is not _mcMissing:
+                    mtr['hits'] += 1
+                    return  val
+
+                tsk = inflight.get( key )
+                if  tsk is None or tsk.get_loop() is not asyncio.get_running_loop():
+                    tsk = inflight[ key ] = asyncio.ensure_future( load( mcc ,key ,args ,kwargs ))
+                    tsk.add_done_callback( lambda t: inflight.pop( key ,None ) if inflight.get( key ) is t else None )
+                else:
+                    mtr['hits'] += 1
+                return  await asyncio.shield( tsk )
+
+            awrapper.metrics   = metrics
+            awrapper.namespace = nms
+            return  awrapper
+
+        @functools.wraps( fn )
+        def wrapper( *args ,**kwargs ) -> object:
+            key = _make_cached_key( pfx ,args ,kwargs )
+            ran = False
+
+            def load( _ky: object ) -> object:
+                nonlocal ran
+                bgn = time.monotonic_ns()
+                val = fn( *args ,**kwargs )
+                record( bgn )
+                ran = True
+                return  val
+
+            val = get_cache( nms ).get_or_load( key ,load ,ttl )
+            if  not ran:
+                mtr['hits'] += 1
+            return  val
+
+        wrapper.metrics   = metrics
+        wrapper.namespace = nms
+        return  wrapper
+
+    return  decorator
+
+class McCacheProxy:
+    """Proxy to a cache that is owned by the host agent.
+
+    Every call is forwarded over the Unix domain socket of the agent, so all the processes on a host share one replica
+    and one member of the cluster.  Keys and values are pickled across.  Each thread keep its own connection.
+    Reads that are served locally by a cache, such as `metadata`, are not available.
+
+    SEE: `McCacheAgentMode`
+    """
+    def __init__(self ,name: str) -> None:
+        self.__name     :str    = name
+        self.__flight   :SingleFlight = SingleFlight()  # In flight loads of this process.
+
+    @property
+    def name(self) -> str:
+        return  self.__name
+
+    @property
+    def flight(self) -> SingleFlight:
+        return  self.__flight
+
+    def _call(self ,mtd: str ,*args ,**kwargs) -> object:
+        return  _agent_request((mtd ,self.__name ,args ,kwargs))
+
+    def __contains__(self ,key: object) -> bool:
+        return  self._call('__contains__' ,key )
+
+    def __delitem__(self ,key: object) -> None:
+        self._call('__delitem__' ,key )
+
+    def __getitem__(self ,key: object) -> object:
+        return  self._call('__getitem__' ,key )
+
+    def __iter__(self) -> Iterator:
+        return  iter( self._call('keys'))
+
+    def __len__(self) -> int:
+        return  self._call('__len__')
+
+    def __setitem__(self ,key: object ,value: object ,ttl: float | None = None) -> None:
+        self._call('__setitem__' ,key ,value ,ttl=ttl )
+
+    def clear(self) -> None:
+        self._call('clear')
+
+    def delete_many(self ,keys: Iterable) -> int:
+        return  self._call('delete_many' ,list( keys ))
+
+    def get(self ,key: object ,default: object | None = None) -> object:
+        return  self._call('get_many' ,[ key ]).get( key ,default )  # NOTE: The default is not pickled across, so a sentinel stay itself.
+
+    def get_many(self ,keys: Iterable) -> dict:
+        return  self._call('get_many' ,list( keys ))
+
+    def get_or_load(self ,key: object ,loader: Callable ,ttl: float | None = None) -> object:
+        """Get the value of the key, loading and setting it on a miss.
+        Concurrent misses of the same key in this process call the loader once.  The load is claimed through the agent,
+        so the other members of the cluster wait for it instead of loading it themselves.  SEE: `PyCache.get_or_load()`
+        """
+        try:
+            return  self.__getitem__( key )
+        except  KeyError:
+            pass
+
+        def load() -> object:
+            wait = self._call('claim' ,key )
+            ddl  = time.monotonic() + wait
+            while wait > 0 and time.monotonic() < ddl:
+                time.sleep( 0.01 )
+                val = self.get( key ,_mcMissing )  # NOTE: One agent lookup.  It can expire or be evicted in between two.
+                if  val is not _mcMissing:
+                    return  val
+
+            val = loader( key )
+            self.__setitem__( key ,val ,ttl=ttl )
+            return  val
+
+        val ,_ = self.__flight.do( key ,load )
+        return  val
+
+    def items(self) -> list:
+        return  self._call('items')
+
+    def keys(self) -> list:
+        return  self._call('keys')
+
+    def metrics(self) -> dict:
+        return  self._call('metrics')
+
+    def pop(self ,key: object ,default: object | None = None) -> object:
+        return  self._call('pop' ,key ,default )
+
+    def set(self ,key: object ,value: object ,ttl: float | None = None) -> None:
+        self._call('set' ,key ,value ,ttl )
+
+    def set_many(self ,items: Mapping | Iterable ,ttl: float | None = None) -> None:
+        self._call('set_many' ,dict( items ) ,ttl=ttl )
+
+    def values(self) -> list:
+        return  self._call('values')
+
 # Private utilities methods.
 #
+def _agent_send( sock: socket.socket ,obj: object ) -> None:
+    """Send a length prefixed pickled object over the host agent socket.
+
+    Args:
+        sock:   A connected Unix domain socket.
+        obj:    Object to pickle over.
+    """
+    pay_b = pickle.dumps( obj ,protocol=pickle.HIGHEST_PROTOCOL )
+    sock.sendall( struct.pack( AGENT_FRAME ,len( pay_b )) + pay_b )
+
+def _agent_recv( sock: socket.socket ) -> object:
+    """Receive a length prefixed pickled object over the host agent socket.
+
+    Args:
+        sock:   A connected Unix domain socket.
+    Return:
+        The unpickled object or None if the other end closed the connection.
+    """
+    buf_b = bytearray()
+    hdr_s = struct.calcsize( AGENT_FRAME )
+    size  = hdr_s
+    while len( buf_b ) < size:
+        chk_b = sock.recv( size - len( buf_b ))
+        if  not chk_b:
+            return  None
+        buf_b += chk_b
+        if  size == hdr_s and len( buf_b ) == hdr_s:
+            size += struct.unpack( AGENT_FRAME ,buf_b )[0]  # NOTE: Got the length prefix.  Now receive the payload.
+    return  pickle.loads( buf_b[ hdr_s: ])   # noqa: S301  NOTE: The peer is checked to be of the same user.  SEE: _agent_is_peer_trusted()
+
+def _agent_is_peer_trusted( sock: socket.socket ) -> bool:
+    """Check that the other end of the host agent socket is a process of the same user as this process.
+    Nothing is unpickled from a peer that is not trusted.
+
+    Args:
+        sock:   A connected Unix domain socket.
+    Return:
+        True if the peer run as the same user.  Where the peer credential is not available, the per user directory
+        of the socket is relied upon.
+    """
+    if  not hasattr( socket ,'SO_PEERCRED' ):
+        return  True
+    _ ,uid ,_ = struct.unpack( AGENT_CREDS ,sock.getsockopt( socket.SOL_SOCKET ,socket.SO_PEERCRED ,struct.calcsize( AGENT_CREDS )))
+    return  uid == os.getuid()
+
+def _agent_request( req: tuple ) -> object:
+    """Forward a cache call to the host agent and return its result.
+    The connection is kept per thread and is reconnected once if the agent got restarted.
+    The call is only retried if it was not sent, so a call that is not idempotent is never made twice.
+
+    Args:
+        req:    The call as (method ,namespace ,args ,kwargs).
+    Return:
+        The result of the call.
+    Raise:
+        The exception raised by the call in the agent.
+        OSError if the agent cannot be reached.
+    """
+    for attempt in range( 2 ):
+        sock: socket.socket = getattr( _mcAgent ,'sock' ,None )
+        sent = False
+        try:
+            if  sock is not None:
+                try:
+                    if  sock.recv( 1 ,socket.MSG_PEEK | socket.MSG_DONTWAIT ) == b'':
+                        raise ConnectionResetError(f"Host agent {_mcConfig.agent_socket} was restarted.")
+                except  BlockingIOError:
+                    pass    # NOTE: Still connected and nothing pending.
+            else:
+                sock = socket.socket( socket.AF_UNIX ,socket.SOCK_STREAM )
+                sock.connect( _mcConfig.agent_socket )
+                if  not _agent_is_peer_trusted( sock ):
+                    sock.close()
+                    raise PermissionError(f"Host agent {_mcConfig.agent_socket} is owned by another user!")
+                _mcAgent.sock = sock
+            _agent_send( sock ,req )
+            sent = True
+            rsp = _agent_recv( sock )
+            if  rsp is None:
+                raise ConnectionResetError(f"Host agent {_mcConfig.agent_socket} closed the connection.")
+            break
+        except  OSError:
+            if  sock is not None:
+                sock.close()
+            _mcAgent.sock = None
+            if  attempt or sent:
+                raise
+
+    okay ,val = rsp
+    if  not okay:
+        raise val
+    return  val
+
+def _make_cached_key( pfx: str | None ,args: tuple ,kwargs: dict ) -> object:
+    """Make a compact cache key from the arguments of a call.
+
+    Args:
+        pfx:    Optional prefix to qualify the key with.
+        args:   Positional arguments of the call.
+        kwargs: Keyword arguments of the call.
+    Return:
+        A hashable tuple of the arguments, or a 16 bytes digest of the pickled arguments if they are not hashable.
+    """
+    key = (args ,tuple(sorted( kwargs.items() )))
+    if  pfx:
+        key = (pfx ,key)
+    try:
+        hash( key )
+        return  key
+    except  TypeError:
+        return  hashlib.blake2b( pickle.dumps( key ) ,digest_size=16 ).digest()
+
 def _is_valid_multicast_ip( ip: str ) -> bool:
     """Validate the input is a valid multicast ip address.
 
@@ -757,7 +1205,8 @@ def _get_local_metrics( name: str | None = None ) -> dict:
                 'meminfo':   f'{psutil.Process().memory_info()}',   # Memory info for current process.
                 'netioinfo': f'{psutil.net_io_counters()}'
             },
-            'mqueue':   _mcQueueStats
+            'mqueue':   _mcQueueStats,
+            'callback': _mcDispatch.metrics()
         }   # Process stats.
     nms =   {n: {   'count':    len(_mcCache[ n ]),
                     'size':     _mcCache[ n ].ttlSize,
@@ -766,10 +1215,24 @@ def _get_local_metrics( name: str | None = None ) -> dict:
                         round(  _mcCache[ n ].spikeInt / ONE_NS_SEC ,4 ),
                     'misses':   _mcCache[ n ].misses,
                     'lookups':  _mcCache[ n ].lookups,
+                    'hitratio':
+                        round(  _mcCache[ n ].hitratio ,4 ),
                     'inserts':  _mcCache[ n ].inserts,
                     'updates':  _mcCache[ n ].updates,
                     'deletes':  _mcCache[ n ].deletes,
                     'evicts':   _mcCache[ n ].evicts,   # Normal ttl or capacity evictions.
+                    'localEvicts':  _mcCache[ n ].localEvicts,  # Evictions that were not multicast out.
+                    'expires':  _mcCache[ n ].expires,     # Ttl expiries.  Every member expire on its own.
+                    'replDeletes':  _mcCache[ n ].replDeletes,  # Deletes and evictions that arrived from other members.
+                    'loader':   _mcCache[ n ].flight.metrics(), # Read-through loads.
+                    'refreshes':_mcCache[ n ].refreshes,   # Stale entries reloaded in the background.
+                    'unpickles':_mcCache[ n ].unpickles,   # Replicated values unpickled on their first read.
+                    'compress': {   # Values compressed in memory.
+                        'count':    _mcCache[ n ].compresses,
+                        'ratio':    round(  _mcCache[ n ].cmpratio ,4 ),
+                        'cmpTime':  round(  _mcCache[ n ].cmpTime / ONE_NS_SEC ,4 ),
+                        'dcmTime':  round(  _mcCache[ n ].dcmTime / ONE_NS_SEC ,4 ),
+                    },
                 }
                 for n in _mcCache.keys() if n == name or name is None
         }   # Namespace stats.
@@ -1014,8 +1477,10 @@ def _collect_fragment( pkt_b: bytes ,sender: str ) -> tuple:
     hdr_b = pkt_b[ 0 : HEADER_SIZE ]
     mgc ,_ ,seq ,frg_c ,key_s ,_ ,tsm ,rcv = struct.unpack( STRUCT_PACK ,hdr_b)     # Unpack the packet
 
-    if  mgc != MAGIC_BYTE:
-        logger.warning(f"Received a foreign non McCache packet from {sender}.")
+    if  mgc == MAGIC_BYTE1:
+        pass    # NOTE: From a member that is not upgraded yet.  Its values are unpickled with the message.
+    elif mgc != MAGIC_BYTE:
+        logger.warning(f"Received a foreign non McCache packet, or a packet of a newer wire format, from {sender}.")
         return  False
 
     #   Deep Tracing
@@ -1052,6 +1517,7 @@ def _assemble_message( aky_t: tuple ) -> tuple[tuple ,object]:  # (tuple ,object
     frg_b: bytes  = []  # Fragment bytes.
     frg_s: int    = 0   # Fragment size.
     hdr_b: bytes  = []  # Fixed packet Header bytes
+    mgc: int      = MAGIC_BYTE  # Packet magic byte.  The wire format version.
     key_b: bytes  = []  # Serialized Key bytes.
     key_t: tuple  = None
     key_s: int    = 0
@@ -1068,7 +1534,7 @@ def _assemble_message( aky_t: tuple ) -> tuple[tuple ,object]:  # (tuple ,object
         bgn   = HEADER_SIZE
         frg_s = len( frg_b )
         hdr_b = frg_b[ 0 : HEADER_SIZE ]    # Fix size 16 bytes of packet header.
-        _ ,_ ,_ ,_ ,key_s ,val_s ,_ ,rcv = struct.unpack( STRUCT_PACK ,hdr_b)   # Unpack the fragment header.
+        mgc ,_ ,_ ,_ ,key_s ,val_s ,_ ,rcv = struct.unpack( STRUCT_PACK ,hdr_b)   # Unpack the fragment header.
 
         if  not key_t:
             key_bal: int = ( key_s - len( key_b ))      # The size of the incomplete key.
@@ -1090,6 +1556,12 @@ def _assemble_message( aky_t: tuple ) -> tuple[tuple ,object]:  # (tuple ,object
             val_b = _mcCrypto.decrypt(bytes( val_b ))
 
         val_o =  pickle.loads(bytes( val_b ))   # noqa: S301    De-Serialized the value.
+        if  mgc == MAGIC_BYTE:
+            # NOTE: The cached values arrived as raw pickled bytes.  Stored as is and only unpickled on their first local read.
+            if  val_o[0] in {OpCode.INS ,OpCode.UPD} and isinstance( val_o[2] ,bytes ):
+                val_o = (*val_o[:2] ,SerializedValue( val_o[2] ) ,*val_o[3:])
+            elif val_o[0] == OpCode.BAT:
+                val_o = (*val_o[:2] ,[ ent if ent[4] is None else (*ent[:4] ,SerializedValue( ent[4] ) ,*ent[5:]) for ent in val_o[2]] ,*val_o[3:])
     
     # Delete the completely received message.
     del _mcArrived[ aky_t ]
@@ -1124,6 +1596,95 @@ def _send_fragment( sock:socket.socket ,fragment: bytes ) -> None:
 
     sock.sendto( fragment ,(_mcConfig.multicast_ip ,_mcConfig.multicast_port))
 
+def _queue_batch( pky_t: tuple ,entries: list ,members: dict ) -> list:
+    """Track a batch message pending acknowledgement and return its fragments to be sent.
+
+    Args:
+        pky_t:      Key tuple object made up of (namespace ,None ,timestamp).
+        entries:    List of (opc ,key ,tsm ,crc ,val) entries.
+        members:    Set of members in the cluster, excluding self.
+    Return:
+        Ordered list of fragments for the batch message.
+    """
+    _mcPending[ pky_t ] = _make_pending_ack( pky_t ,(OpCode.BAT ,None ,entries) ,members ,_mcConfig.packet_mtu )
+    return  _mcPending[ pky_t ]['message']
+
+def _queue_batches( nms: str ,tsm: int ,entries: list ,members: dict ) -> list:
+    """Split the entries of a batch into messages that fits within the UINT2 size limit and return their fragments to be sent.
+    Each sub batch is tracked on its own with a timestamp that is unique to this process, so batches that were queued
+    at the same nano second on a coarse clock don't collide in the pending and arrived messages.
+    An entry too large to be batched is sent on its own in its place, after the sub batch before it, so the changes to
+    the same key arrive in order.
+
+    Args:
+        nms:        Namespace of the cache.
+        tsm:        Timestamp of the batch.
+        entries:    List of (opc ,key ,tsm ,crc ,val ,[ttl]) entries.
+        members:    Set of members in the cluster, excluding self.
+    Return:
+        Ordered list of fragments for the messages.
+    """
+    frgs: list = []
+    sub:  list = []
+    siz:  int  = 0
+
+    def flush() -> None:
+        global  _mcBatchTsm
+        nonlocal sub ,siz
+        if  sub:
+            _mcBatchTsm = max( tsm ,_mcBatchTsm + 1 )
+            frgs.extend( _queue_batch((nms ,None ,_mcBatchTsm) ,sub ,members ))
+            sub  = []
+            siz  = 0
+
+    for ent in entries:
+        blob = ent[4]
+        if  blob is not None and not isinstance( blob ,SerializedValue ):
+            blob = SerializedValue( pickle.dumps( blob ,protocol=pickle.HIGHEST_PROTOCOL ))
+        # NOTE: Sized off the serialized value.  Only the small rest of the entry is pickled to size it.
+        esz = len( pickle.dumps((*ent[:4] ,*ent[5:]))) + (len( blob ) if blob is not None else 0)
+        if  esz > BATCH_SIZE:
+            flush()
+            frgs.extend( _queue_message((nms ,ent[1] ,ent[2]) ,ent[0] ,ent[3] ,blob ,ent[5] if len( ent ) > 5 else None ,members ))
+            continue
+        if  siz + esz > BATCH_SIZE:
+            flush()
+        sub.append( ent if blob is None else (*ent[:4] ,bytes( blob ) ,*ent[5:]))  # NOTE: Plain bytes, so the message unpickle without `pycache`.
+        siz += esz
+    flush()
+    return  frgs
+
+def _queue_message( pky_t: tuple ,opc: str ,crc: bytes ,val: object ,ttl: float | None ,members: dict ) -> list:
+    """Track a message pending acknowledgement, if it need one, and return its fragments to be sent.
+
+    Args:
+        pky_t:      Key tuple object made up of (namespace ,key ,timestamp).
+        opc:        Op code of the message.
+        crc:        Checksum of the value.
+        val:        The value.  The value of an `INS` or `UPD` is sent as raw pickled bytes.
+        ttl:        Optional per entry ttl.
+        members:    Set of members to send the message to.
+    Return:
+        Ordered list of fragments for the message.  Empty if the message is already pending acknowledgement.
+    """
+    if  opc in {OpCode.INS ,OpCode.UPD}:
+        # NOTE: Pickle the value on its own for the receivers to store it as is and unpickle it on its first read.
+        #       Sent as plain bytes, so the message unpickle without `pycache`.  SEE: MAGIC_BYTE
+        val = bytes( val ) if isinstance( val ,SerializedValue ) else pickle.dumps( val ,protocol=pickle.HIGHEST_PROTOCOL )
+
+    #   ONLY for members.         key_t , val_t
+    val_t = (opc ,crc ,val) if ttl is None else (opc ,crc ,val ,ttl)   # NOTE: Older members ignore the trailing ttl.
+    ack: dict= _make_pending_ack( pky_t ,val_t ,members ,_mcConfig.packet_mtu )
+
+    if  opc in {OpCode.DEL ,OpCode.INS ,OpCode.UPD}:
+        if  pky_t not in _mcPending or  not _mcPending[ pky_t ]['members']:
+            # Acknowledgement is needed for Insert ,Update and Delete.
+            _mcPending[ pky_t ] = ack
+            return  _mcPending[ pky_t ]['message']
+        return  []
+    # Acknowledgement is NOT needed for others.
+    return  ack['message']
+
 def _check_expr_pending() -> None:
     """Check the pending list of messages that are obsolete due to more recent update.
 
@@ -1133,7 +1694,8 @@ def _check_expr_pending() -> None:
     prv_nms: str    = None
     prv_key: object = None
     prv_tsm: int    = None
-    for pky_t in sorted(_mcPending.keys() ,reverse=True ):  # Descending key(nms ,key ,tsm) for this message pending acknowledgement.
+    # NOTE: Batch messages are pending without a key.  They are not superseded by a later change.
+    for pky_t in sorted((k for k in _mcPending.keys() if k[1] is not None) ,reverse=True ):  # Descending key(nms ,key ,tsm) for this message pending acknowledgement.
         if  prv_nms and prv_nms == pky_t[0] and \
             prv_key and prv_key == pky_t[1] and \
             prv_tsm and(prv_tsm >  pky_t[2] or ((PyCache.tsm_version() - pky_t[2]) > (5*PyCache.ONE_NS_SEC))) and \
@@ -1318,6 +1880,27 @@ def _check_sync_metadata() -> None:
         if  i > RETRIES:
             logger.warning(f"Encounter issue during metadata serialization for SYC operation after {RETRIES} retries." ,extra=LOG_EXTRA)
 
+def _check_expr_claims() -> None:
+    """Drop the claimed loads that are past their deadline.  The claimant is presumed dead or failed.
+    """
+    now = PyCache.tsm_version()
+    for clm_t ,(_ ,ddl) in list(_mcClaims.items()):
+        if  ddl < now:
+            _ = _mcClaims.pop( clm_t ,None )
+
+def _check_ttl_expiry() -> None:
+    """Reap the expired entries in the background.
+
+    Expired entries are evicted in bounded batches per namespace so that the cache lock is only held briefly
+    and the application threads never pay for the eviction.
+    """
+    for nms in list(_mcCache.keys()):
+        mcc: PyCache = _mcCache[ nms ]
+        if  not mcc.reaper:
+            continue
+        while mcc.evict_expired( _mcConfig.cache_reaper ) >= _mcConfig.cache_reaper:
+            time.sleep( 0 )     # Yield in between batches.
+
 def _check_congestion() -> None:
     """Check the queue depth for congestion.
     """
@@ -1329,6 +1912,27 @@ def _check_congestion() -> None:
             msg = f"Internal message queue size. IB:{ibs:>6} ,OB:{obs:>4}"
             _log_ops_msg( logging.WARNING ,opc=OpCode.WRN ,tsm=PyCache.tsm_version() ,msg=msg )
 
+def _claim_load( nms: str ,key: object ) -> float:
+    """Claim the load of a missing entry for this member, unless another member had already claimed it.
+
+    The claim is multicast out for the other members to wait for the resulting `INS` instead of loading it themselves.
+    It is best effort.  Members that claimed the same key at the same time shall both load it.
+
+    Args:
+        nms:    Namespace of the cache.
+        key:    The missing key to be loaded.
+    Return:
+        Seconds to wait for the entry from the member that claimed it.  0 = Load it now.
+    """
+    now = PyCache.tsm_version()
+    clm = _mcClaims.get((nms ,key))
+    if  clm and clm[1] > now:
+        return  (clm[1] - now) / ONE_NS_SEC
+
+    if  _mcMember:
+        _mcOBQueue.put((OpCode.CLM ,now ,nms ,key ,None ,None ,None))
+    return  0
+
 def _get_local_value( key: object ,mcc: dict ) -> tuple:
     """Get the value from the local cache along with  its checksum and timestamp.
 
@@ -1383,6 +1987,52 @@ def _process_ACK( nms: str ,key: object ,tsm: int ,lts: int ,opc: str ,crc: str
         _log_ops_msg( logging.WARNING   ,opc=opc ,sdr=sdr ,tsm=tsm ,nms=nms ,key=key ,crc=crc
                                         ,msg=f">   {pky} NOT found for acknowledgment from {sdr}." )
 
+def _process_BAT( nms: str ,key: object ,tsm: int ,lts: int ,opc: str ,crc: str ,lcs: bytes ,val: object ,sdr: str ):    # noqa: N802
+    """Process BAT message.
+
+    The value is a list of (opc ,key ,tsm ,crc ,val) entries that are applied in order under the cache lock against
+    concurrent writers.  Local readers do not take the lock and can observe a partially applied batch.
+    Each entry is checked for collision on its own timestamp.  The batch is acknowledged once.
+    """
+    mcc: dict = get_cache( nms )
+    applied: dict = {}  # Applied key and its timestamp.
+
+    # NOTE: The SerializedValue are stored as is and only unpickled on their first local read.
+    entries = [(eop ,eky ,ets ,ecs ,evl ,ext[0] if ext else None) for eop ,eky ,ets ,ecs ,evl ,*ext in val]
+    with  mcc.lock:
+        for eop ,eky ,ets ,ecs ,evl ,ettl in entries:
+            ent = mcc.metadata.get( eky )
+            if  ent is not None and ent['tsm'] > ets:   # NOTE: Local entry is newer than the arriving entry.
+                continue
+            try:
+                if  eop in {OpCode.DEL ,OpCode.EVT}:
+                    if  eky in mcc:
+                        mcc.__delitem__( eky ,ets ,EnableMultiCast.NO ,replicated=True )
+                elif(ent is None or ent['tsm'] < ets) and not mcc.has_expired( ets ,ettl ):
+                    mcc.__setitem__( eky ,evl ,ets ,EnableMultiCast.NO ,ecs ,ettl )
+                applied[ eky ] = ets
+                _ = _mcClaims.pop((nms ,eky) ,None)
+            except  KeyError:   # NOTE: Got deleted in another thread.
+                if  _mcConfig.debug_level >= McCacheDebugLevel.EXTRA:
+                    _log_ops_msg( logging.DEBUG ,opc=eop ,sdr=sdr ,tsm=ets ,nms=nms ,key=eky ,crc=ecs
+                                                ,msg=f">>  ERR:{eky} NOT found in cache while processing {opc}." )
+
+    # NOTE: Invalidate pending acks for the applied keys.  We got a newer entry.
+    for pky_t in list(_mcPending.keys()):
+        try:
+            if  pky_t[0] == nms and pky_t[1] is not None and pky_t[1] in applied and pky_t[2] < applied[ pky_t[1] ]:
+                del _mcPending[ pky_t ]
+        except  (KeyError ,TypeError):  # NOTE: Got deleted in another thread or an unhashable key.
+            pass
+
+    #   Deep Tracing
+    if  _mcConfig.debug_level >= McCacheDebugLevel.EXTRA:
+        _log_ops_msg( logging.DEBUG ,opc=opc ,sdr=sdr ,tsm=tsm ,nms=nms ,key=key ,crc=crc
+                                    ,msg=f">   Applied {len( val )} batched entries." )
+
+    # Acknowledge it.
+    _mcOBQueue.put((OpCode.ACK ,tsm ,nms ,key ,crc ,None ,sdr))
+
 def _process_BYE( nms: str ,key: object ,tsm: int ,lts: int ,opc: str ,crc: str ,lcs: bytes ,val: object ,sdr: str ):    # noqa: N802
     """Process BYE message.
     """
@@ -1392,6 +2042,11 @@ def _process_BYE( nms: str ,key: object ,tsm: int ,lts: int ,opc: str ,crc: str
             _log_ops_msg( logging.DEBUG ,opc=opc ,tsm=tsm ,nms=nms ,key=key ,crc=crc
                                         ,msg=f">   Member {sdr} exited." )
 
+    # Clear claimed loads.  Stop waiting for the member.
+    for clm_t ,(ip ,_) in list(_mcClaims.items()):
+        if  ip == sdr:
+            _ = _mcClaims.pop( clm_t ,None )
+
     # Clear pending ack.
     for pky_t in list(_mcPending.keys()):   # Key for this message pending acknowledgement.
         if  pky_t in _mcPending:
@@ -1403,6 +2058,12 @@ def _process_BYE( nms: str ,key: object ,tsm: int ,lts: int ,opc: str ,crc: str
                     _log_ops_msg( logging.DEBUG ,opc=opc ,tsm=tsm ,nms=nms ,key=key ,crc=crc
                                                 ,msg=f">>  Delete tracking entry {pky_t}." )
 
+def _process_CLM( nms: str ,key: object ,tsm: int ,lts: int ,opc: str ,crc: str ,lcs: bytes ,val: object ,sdr: str ):    # noqa: N802
+    """Process CLM message.
+    """
+    if  sdr not in _mySelf:
+        _mcClaims[(nms ,key)] = (sdr ,PyCache.tsm_version() + int( _mcConfig.claim_timeout * ONE_NS_SEC ))
+
 def _process_DEL( nms: str ,key: object ,tsm: int ,lts: int ,opc: str ,crc: str ,lcs: bytes ,val: object ,sdr: str ):    # noqa: N802
     """Process DEL message.
     """
@@ -1422,7 +2083,7 @@ def _process_DEL( nms: str ,key: object ,tsm: int ,lts: int ,opc: str ,crc: str
         # Delete it locally and dont multicast it out.
         # TODO: Check for collision.  See: UPD.
         try:
-            mcc.__delitem__( key ,tsm ,EnableMultiCast.NO )
+            mcc.__delitem__( key ,tsm ,EnableMultiCast.NO ,replicated=True )
         except  KeyError:
             #   Deep Tracing
             if  _mcConfig.debug_level >= McCacheDebugLevel.EXTRA:
@@ -1502,8 +2163,9 @@ def _process_REQ( nms: str ,key: object ,tsm: int ,lts: int ,opc: str ,crc: str
         try:
             tsm = mcc.metadata[ key ]['tsm']
             crc = mcc.metadata[ key ]['crc']
+            ttl = mcc.metadata[ key ]['ttl'] or None
             val = mcc[ key ]
-            _mcOBQueue.put((OpCode.UPD ,tsm ,nms ,key ,crc ,val ,sdr))
+            _mcOBQueue.put((OpCode.UPD ,tsm ,nms ,key ,crc ,val ,sdr ,ttl))
         except  KeyError:
             #   Deep Tracing
             if  _mcConfig.debug_level >= McCacheDebugLevel.EXTRA:
@@ -1516,7 +2178,7 @@ def _process_RST( nms: str ,key: object ,tsm: int ,lts: int ,opc: str ,crc: str
     """
     for n in filter( lambda nk: nk == nms or nms is None ,_mcCache.keys() ):            # Namespace
         for k in filter( lambda kk: kk == key or key is None ,_mcCache[ n ].keys() ):   # Keys within namespace.
-            _mcCache[ n ].__delitem__( k ,EnableMultiCast.NO )
+            _mcCache[ n ].__delitem__( k ,None ,EnableMultiCast.NO ,replicated=True )
 
 def _process_SYC( nms: str ,_ky: object ,tsm: int ,lts: int ,opc: str ,crc: str ,lcs: bytes ,val: object ,sdr: str ):    # noqa: N802
     """Process SYC message.
@@ -1529,12 +2191,16 @@ def _process_SYC( nms: str ,_ky: object ,tsm: int ,lts: int ,opc: str ,crc: str
             frcrc = val[ key ]['crc']           # Foreign crc.
             mytsm = mcc.metadata[ key ]['tsm']  # Local   tsm.
             mycrc = mcc.metadata[ key ]['crc']  # Local   crc.
-            if  frtsm < mytsm and frcrc != mycrc and key in mcc:
+            if  frtsm > mytsm and frcrc != mycrc:
+                # Local entry is older, such as restored from a snapshot.  Request the sender for its newer value.
+                _mcOBQueue.put((OpCode.REQ ,PyCache.tsm_version() ,nms ,key ,None ,None ,sdr))
+            elif frtsm < mytsm and frcrc != mycrc and key in mcc:
                 # Incoming key/value is older than in local cache therefore send back to the sender my current local cache value.
                 myval = mcc[ key ]
+                myttl = mcc.metadata[ key ]['ttl'] or None
 
                 # Send my latest value back to the sender thst has the older value.
-                _mcOBQueue.put((OpCode.UPD ,mytsm ,nms ,key ,mycrc ,myval ,sdr))
+                _mcOBQueue.put((OpCode.UPD ,mytsm ,nms ,key ,mycrc ,myval ,sdr ,myttl))
 
                 #   Deep Tracing
                 if  _mcConfig.debug_level >= McCacheDebugLevel.EXTRA:
@@ -1543,10 +2209,14 @@ def _process_SYC( nms: str ,_ky: object ,tsm: int ,lts: int ,opc: str ,crc: str
                 if  mcc.callback:
                     # Let the user know that there is an incoherence event.
                     arg = {'typ': CallbackType.INCOHERENT ,'nms': mcc.name ,'key': key ,'lkp': frtsm ,'tsm': mytsm ,'elp': 0 ,'prvcrc': frcrc ,'newcrc': mycrc}
-                    t1 = threading.Thread( target=mcc.callback ,args=[arg] ,name='McCache Sync' )
-                    t1.start()  # NOTE: Launch and forget.
+                    _ = mcc.dispatcher.submit( mcc.callback ,arg )
         else:
             # We don't have this entry.
+            if  mcc.is_dropped( key ):
+                continue    # NOTE: We let it go locally.  Don't want it back until the application ask for it.
+            if  mcc.has_expired( val[ key ]['tsm'] ,val[ key ].get('ttl') ):
+                continue    # NOTE: Expired from its origin timestamp.  No point to request it.
+
             #   Deep Tracing
             if  _mcConfig.debug_level >= McCacheDebugLevel.EXTRA:
                 _log_ops_msg( logging.DEBUG ,opc=opc ,sdr=sdr ,tsm=tsm ,nms=nms ,key=key ,crc=crc
@@ -1555,13 +2225,19 @@ def _process_SYC( nms: str ,_ky: object ,tsm: int ,lts: int ,opc: str ,crc: str
             # Not in local cache therefore request the syncing sender to resend this key/value.
             _mcOBQueue.put((OpCode.REQ ,PyCache.tsm_version() ,nms ,key ,None ,None ,sdr))
 
-def _process_UPD( nms: str ,key: object ,tsm: int ,lts: int ,opc: str ,crc: str ,lcs: bytes ,val: object ,sdr: str ):    # noqa: N802
+def _process_UPD( nms: str ,key: object ,tsm: int ,lts: int ,opc: str ,crc: str ,lcs: bytes ,val: object ,sdr: str ,ttl: float | None = None ):    # noqa: N802
     """Process UPD message.
+    The optional per entry ttl that arrived with the value is kept with the entry.
     """
     mcc: dict = get_cache( nms )
 
     try:
-        if  lts is None or  lts < tsm:  # NOTE: Local timestamp is older than the new arriving message timestamp.
+        if  mcc.has_expired( tsm ,ttl ):
+            # NOTE: Expired from its origin timestamp.  Every member have evicted it locally by now.
+            if  _mcConfig.debug_level >= McCacheDebugLevel.EXTRA:
+                _log_ops_msg( logging.DEBUG ,opc=opc ,sdr=sdr ,tsm=tsm ,nms=nms ,key=key ,crc=crc
+                                            ,msg=f">   {key} from {sdr} arrived expired.  Ignored." )
+        elif lts is None or  lts < tsm: # NOTE: Local timestamp is older than the new arriving message timestamp.
             #   Deep Tracing
             if  _mcConfig.debug_level >= McCacheDebugLevel.EXTRA:
                 tsmcmp = __get_msgcomp( lts ,tsm )
@@ -1572,9 +2248,10 @@ def _process_UPD( nms: str ,key: object ,tsm: int ,lts: int ,opc: str ,crc: str
                     _log_ops_msg( logging.DEBUG ,opc=opc ,sdr=sdr ,tsm=tsm ,nms=nms ,key=key ,crc=crc
                                                 ,msg=">>  Calling: cache.__setitem__( {key} ,{crc} ,None ,{tsm} )" )
 
-            # Update it locally and DONT multicast it out.
+            # Update it locally and DONT multicast it out.  Reuse the checksum that arrived with the value.
             # TODO: Implement "cache_sync_mode" == 0 to ONLY update existing local entry.
-            mcc.__setitem__( key ,val ,tsm ,EnableMultiCast.NO )
+            mcc.__setitem__( key ,val ,tsm ,EnableMultiCast.NO ,crc ,ttl )
+            _ = _mcClaims.pop((nms ,key) ,None) # NOTE: The claimed load arrived.
 
             # NOTE: Invalidate pending acks for this key.  We got a newer entry.
             for pky_t in list(_mcPending.keys()):
@@ -1669,7 +2346,8 @@ def _decode_message( aky_t: tuple ,key_t: tuple ,val_o: object ,sdr: str ) -> No
     tsm: int    = key_t[2]  # Timestamp
     opc: str    = val_o[0]  # Op Code
     crc: str    = val_o[1]  # Checksum
-    val: object = val_o[2]  # Value
+    val: object = val_o[2]  # Value.  A SerializedValue is stored as is and only unpickled on its first local read.  SEE: PyCache._decode_value()
+    ttl: float  = val_o[3] if len( val_o ) > 3 else None    # Optional per entry ttl.
     lcs: bytes  = None      # Local checksum
     lts: int    = None      # Local timestamp
 
@@ -1690,9 +2368,16 @@ def _decode_message( aky_t: tuple ,key_t: tuple ,val_o: object ,sdr: str ) -> No
         case OpCode.ACK:    # Acknowledgment.
             _process_ACK(   nms ,key ,tsm ,lts ,opc ,crc ,lcs ,val ,sdr )
 
+        case OpCode.BAT:    # Batch of changes.
+            _process_BAT(   nms ,key ,tsm ,lts ,opc ,crc ,lcs ,val ,sdr )
+            val = None
+
         case OpCode.BYE:    # Goodbye from member.
             _process_BYE(   nms ,key ,tsm ,lts ,opc ,crc ,lcs ,val ,sdr )
 
+        case OpCode.CLM:    # Claimed load.
+            _process_CLM(   nms ,key ,tsm ,lts ,opc ,crc ,lcs ,val ,sdr )
+
         case OpCode.DEL | OpCode.EVT:   # Delete/Eviction.
             _process_DEL(   nms ,key ,tsm ,lts ,opc ,crc ,lcs ,val ,sdr )
             val = None
@@ -1722,7 +2407,7 @@ def _decode_message( aky_t: tuple ,key_t: tuple ,val_o: object ,sdr: str ) -> No
             _process_SYC(   nms ,key ,tsm ,lts ,opc ,crc ,lcs ,val ,sdr )
 
         case OpCode.UPD | OpCode.INS:   # Insert and Update.
-            _process_UPD(   nms ,key ,tsm ,lts ,opc ,crc ,lcs ,val ,sdr )
+            _process_UPD(   nms ,key ,tsm ,lts ,opc ,crc ,lcs ,val ,sdr ,ttl )
             val = None
 
         case _:
@@ -1757,11 +2442,82 @@ def _goodbye() -> None:
     """
     _mcOBQueue.put((OpCode.BYE ,PyCache.tsm_version() ,None ,None ,None ,None ,None))
 
+    if  _mcConfig.agent_mode == McCacheAgentMode.AGENT and os.path.exists( _mcConfig.agent_socket ):
+        os.unlink( _mcConfig.agent_socket )
+
+    if  _mcConfig.snapshot_file:
+        _snapshot( _mcConfig.snapshot_file )
+
     # Stop the log listner.
     _mcLgLsnr.stop()
 
     time.sleep( 1 ) # Give enough time to send out the above ops to other cluster members.  Needed to output metrics.
 
+def _snapshot( path: str ) -> int:
+    """Snapshot all the local caches into a file to warm up from on the next start.
+
+    The snapshot is written into a temporary file that then replace the previous snapshot,
+    so a crash while writing never leave a partial snapshot behind.
+    A failure, such as a key that cannot be pickled, is logged and never fail the exit.
+
+    Args:
+        path:   Path of the snapshot file.
+    Return:
+        Number of entries in the snapshot.  0 if it failed.
+    """
+    cnt = 0
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        snp = { 'ver': SNAPSHOT_VER ,'tsm': PyCache.tsm_version() ,'nms': { nms: _mcCache[ nms ].snapshot() for nms in list( _mcCache.keys() )}}
+        with open( os.open( tmp ,os.O_WRONLY | os.O_CREAT | os.O_TRUNC ,0o600 ) ,'wb' ) as fp:
+            pickle.dump( snp ,fp ,protocol=pickle.HIGHEST_PROTOCOL )
+        os.replace( tmp ,path )
+        cnt = sum( len( ents ) for ents in snp['nms'].values() )
+        logger.info(f"Snapshot {cnt} entries into {path}." ,extra=LOG_EXTRA)
+    except  Exception as ex:    # noqa: BLE001
+        logger.warning(f"Fail to snapshot into {path}.  {ex}" ,extra=LOG_EXTRA)
+    finally:
+        try:
+            if  os.path.exists( tmp ):
+                os.unlink( tmp )    # NOTE: Left behind by a failure.
+        except  OSError as ex:
+            logger.warning(f"Fail to remove {tmp}.  {ex}" ,extra=LOG_EXTRA)
+    return  cnt
+
+def _warm_up( path: str ) -> int:
+    """Restore the local caches from the snapshot taken on the last exit.
+
+    The entries are restored with their original timestamp and checksum, and are not multicast out.
+    The `SYC` from the other members then only request back the entries that are newer than the snapshot.
+    The values stay pickled until their first read.  Expired entries are skipped.
+
+    Args:
+        path:   Path of the snapshot file.
+    Return:
+        Number of entries restored.
+    """
+    try:
+        with open( path ,'rb' ) as fp:
+            snp = pickle.load( fp )     # noqa: S301   Our own file.
+    except  FileNotFoundError:
+        return  0
+    except  (OSError ,pickle.UnpicklingError ,EOFError) as ex:
+        logger.warning(f"Fail to warm up from {path}.  {ex}" ,extra=LOG_EXTRA)
+        return  0
+    if  not isinstance( snp ,dict ) or snp.get('ver') != SNAPSHOT_VER:
+        logger.warning(f"Unsupported snapshot {path}.  Ignored." ,extra=LOG_EXTRA)
+        return  0
+
+    cnt = 0
+    for nms ,ents in snp['nms'].items():
+        mcc: PyCache = get_cache( nms )
+        for key ,blob ,tsm ,crc ,ttl in ents:
+            if  not mcc.has_expired( tsm ,ttl ):
+                mcc.__setitem__( key ,SerializedValue( blob ) ,tsm ,EnableMultiCast.NO ,crc ,ttl )
+                cnt += 1
+    logger.info(f"Warmed up {cnt} entries from {path}." ,extra=LOG_EXTRA)
+    return  cnt
+
 def _multicaster() -> None:
     """Dequeue and multicast out the cache operation to all the members in the group.
 
@@ -1805,6 +2561,7 @@ def _multicaster() -> None:
             crc: bytes  = msg[4]    # Checksum
             val: object = msg[5]    # Value
             rcv: str    = msg[6]    # Addressed to receiving member. None == multicast to all members.
+            ttl: float  = msg[7] if len( msg ) > 7 else None    # Optional per entry ttl.
             frgs: list  = []
 
             # TODO: Handle self targetting operation.  Check the "rcv" value for specifc MET operation.
@@ -1835,22 +2592,15 @@ def _multicaster() -> None:
                     elif  _mcConfig.debug_level >= McCacheDebugLevel.EXTRA:
                         _log_ops_msg( logging.WARNING   ,opc=opc ,tsm=tsm ,nms=nms ,key=key ,crc=crc
                                                         ,msg=f">   {pky_t} no longer exist in pending!" )
+                case OpCode.BAT:    # Batch of changes from the bulk cache methods.
+                    frgs = _queue_batches( nms ,tsm ,val ,_mcMember )
+
                 case _:
                     if  opc == OpCode.ACK and rcv is not None:  # TODO: Handle REQ from a spcific sender.
                         mbrs = {rcv: None}  #   Unicast, simulated.
                     else:
                         mbrs = _mcMember    #   Muticast.
-                    #   ONLY for members.         key_t , val_t
-                    ack: dict= _make_pending_ack( pky_t ,(opc ,crc ,val) ,mbrs ,_mcConfig.packet_mtu )
-
-                    if  opc in {OpCode.DEL ,OpCode.INS ,OpCode.UPD}:
-                        if  pky_t not in _mcPending or  not _mcPending[ pky_t ]['members']:
-                            # Acknowledgement is needed for Insert ,Update and Delete.
-                            _mcPending[ pky_t ] = ack
-                            frgs = _mcPending[ pky_t ]['message']
-                    else:
-                        # Acknowledgement is NOT needed for others.
-                        frgs = ack['message']
+                    frgs = _queue_message( pky_t ,opc ,crc ,val ,ttl ,mbrs )
 
             # Transmit the fragments out ASAP.
             for frg_b in frgs:
@@ -1889,6 +2639,7 @@ def _housekeeper() -> None:
 
     Request acknowledgment for messages that was send.
     Request resent missing fragments of a message.
+    Reap the expired cache entries, if enabled.
 
     Args:
     Return:
@@ -1919,6 +2670,14 @@ def _housekeeper() -> None:
             #
             _check_sync_metadata()
 
+            # Check claimed loads that are expired.
+            #
+            _check_expr_claims()
+
+            # Reap the expired cache entries.
+            #
+            _check_ttl_expiry()
+
             # Monitor the internal message queues.
             #
             _check_congestion()
@@ -1926,6 +2685,105 @@ def _housekeeper() -> None:
             logger.error( ex )
             traceback.print_exc()
 
+def _agent( path: str | None = None ) -> None:
+    """Host agent to serve the caches to the other processes on this host over an Unix domain socket.
+    Each connected client process thread is served on its own thread.
+
+    Args:
+        path:   Optional path of the socket.  Default to the configured `agent_socket`.
+    Return:
+        None
+    """
+    path = path or _mcConfig.agent_socket
+    sock: socket.socket = socket.socket( socket.AF_UNIX ,socket.SOCK_STREAM )
+    try:
+        pdir = os.path.dirname( os.path.abspath( path ))
+        os.makedirs( pdir ,mode=0o700 ,exist_ok=True )
+        st = os.stat( pdir )
+        if  st.st_uid != os.getuid() or st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+            raise PermissionError(f"Directory {pdir} is not owned by this user or is writable by others!")
+        if  os.path.exists( path ) and stat.S_ISSOCK( os.lstat( path ).st_mode ):
+            os.unlink( path )   # NOTE: Left over from the previous agent.
+
+        umask = os.umask( 0o177 )   # NOTE: Only the processes of the same user can connect.  No window before a chmod.
+        try:
+            sock.bind( path )
+        finally:
+            os.umask( umask )
+        sock.listen()
+    except  OSError as ex:
+        logger.error(f"McCache agent cannot listen on {path}.  {ex}" ,extra=LOG_EXTRA)
+        sock.close()
+        return
+
+    # Keep the format consistent to make it easy for the test to parse.
+    logger.debug(f'McCache agent is ready on {path}.')
+
+    while True:
+        try:
+            conn ,_ = sock.accept()
+            threading.Thread( target=_agent_serve ,args=(conn ,) ,daemon=True ,name="McCache agent client" ).start()
+        except  Exception as ex:    # noqa: BLE001
+            logger.error( ex )
+            traceback.print_exc()
+
+def _agent_serve( conn: socket.socket ) -> None:
+    """Serve the cache calls of a connected client until it disconnect.
+
+    Args:
+        conn:   The connection of the client.
+    Return:
+        None
+    """
+    with  conn:
+        try:
+            if  not _agent_is_peer_trusted( conn ):
+                logger.warning("Host agent client of another user refused." ,extra=LOG_EXTRA)
+                return
+            while (req := _agent_recv( conn )) is not None:
+                _agent_send( conn ,_agent_call( req ))
+        except  OSError as ex:
+            logger.warning(f"Host agent client disconnected.  {ex}" ,extra=LOG_EXTRA)
+
+def _agent_call( req: tuple ) -> tuple:
+    """Make a cache call for a client of the host agent.
+
+    Args:
+        req:    The call as (method ,namespace ,args ,kwargs).
+    Return:
+        A tuple of (True ,result) or (False ,exception) if the call raised.
+    """
+    mtd ,nms ,args ,kwargs = req
+    if  mtd not in AGENT_CALLS:
+        return  (False ,AttributeError(f"Unsupported host agent call '{mtd}'."))
+    try:
+        match mtd:
+            case 'claim':
+                val = _claim_load( nms ,*args ) if _mcConfig.claim_timeout > 0 else 0
+                if  val == 0 and _mcConfig.claim_timeout > 0:
+                    # NOTE: Granted.  The other processes on this host wait for it instead of loading it themselves.
+                    _mcClaims[(nms ,args[0])] = (SRC_IP_ADD ,PyCache.tsm_version() + int( _mcConfig.claim_timeout * ONE_NS_SEC ))
+            case 'metrics':
+                val = _get_local_metrics( nms )
+            case 'checksum':
+                val = _get_local_checksum( nms ,*args )
+            case 'clear_cache':
+                val = clear_cache( nms ,*args )
+            case 'cluster_checksum':
+                val = get_cluster_checksum( nms ,*args )
+            case 'cluster_metrics':
+                val = get_cluster_metrics( nms ,*args )
+            case 'items' | 'keys' | 'values':
+                val = list( getattr( get_cache( nms ) ,mtd )() )
+            case _:
+                val = getattr( get_cache( nms ) ,mtd )( *args ,**kwargs )
+                if  mtd in {'__setitem__' ,'set' ,'set_many'}:
+                    for key in ( args[0] if mtd == 'set_many' else args[:1] ):
+                        _ = _mcClaims.pop((nms ,key) ,None) # NOTE: The claimed load arrived.
+        return  (True ,val)
+    except  Exception as ex:    # noqa: BLE001
+        return  (False ,ex)
+
 def _listener() -> None:
     """Listen in the group for new cache operation from all members.
     Queue up the incoming cache operation to be processed by a different tread.
@@ -2016,6 +2874,8 @@ logger.debug( _mcConfig )
 if  _mcConfig.crypto_key and len( _mcConfig.crypto_key.strip() ) > 0:
     _mcCrypto = Fernet( str(_mcConfig.crypto_key) )
 
+_mcDispatch = CallbackDispatcher( workers=_mcConfig.callback_workers ,backlog=_mcConfig.callback_backlog ,name='McCache' )
+
 # TODO: Need a better way to seperate out testing and production code.
 if 'TEST_APERTURE'  in  os.environ:
     # Resize is to prevent run away memory consumption during stress test.
@@ -2024,19 +2884,30 @@ if 'TEST_APERTURE'  in  os.environ:
 
 # Main section to start the background daemon threads.
 #
-atexit.register( _goodbye ) # SEE: https://docs.python.org/3.12/library/atexit.html#module-atexit
-
-if  sys.platform == 'win32':
-    _ = psutil.getloadavg() # Windows only simulate the load, so pre-warm it in the background.
-
-t1 = threading.Thread( target=_listener    ,daemon=True ,name="McCache listener" )
-t1.start()
-t2 = threading.Thread( target=_multicaster ,daemon=True ,name="McCache multicaster" )
-t2.start()
-t3 = threading.Thread( target=_processor   ,daemon=True ,name="McCache processor" )
-t3.start()
-t4 = threading.Thread( target=_housekeeper ,daemon=True ,name="McCache housekeeper" )
-t4.start()
+if  _mcConfig.agent_mode == McCacheAgentMode.CLIENT:
+    # NOTE: The host agent is the member of the cluster.  This process neither join the group nor start the daemons.
+    _mcConfig.claim_timeout = 0 # NOTE: Loads are claimed through the agent.  SEE: McCacheProxy.get_or_load()
+else:
+    atexit.register( _goodbye ) # SEE: https://docs.python.org/3.12/library/atexit.html#module-atexit
+
+    if  _mcConfig.snapshot_file:
+        _ = _warm_up( _mcConfig.snapshot_file )    # NOTE: Before joining the group, so the SYC find the restored entries.
+
+    if  sys.platform == 'win32':
+        _ = psutil.getloadavg() # Windows only simulate the load, so pre-warm it in the background.
+
+    t1 = threading.Thread( target=_listener    ,daemon=True ,name="McCache listener" )
+    t1.start()
+    t2 = threading.Thread( target=_multicaster ,daemon=True ,name="McCache multicaster" )
+    t2.start()
+    t3 = threading.Thread( target=_processor   ,daemon=True ,name="McCache processor" )
+    t3.start()
+    t4 = threading.Thread( target=_housekeeper ,daemon=True ,name="McCache housekeeper" )
+    t4.start()
+
+    if  _mcConfig.agent_mode == McCacheAgentMode.AGENT:
+        t5 = threading.Thread( target=_agent   ,daemon=True ,name="McCache agent" )
+        t5.start()
 
 
 # The MIT License (MIT)
@@ -4,26 +4,44 @@ Pycache package provide the Cache class to support the parent McCache package.
 Cache is inherited from Python's `OrderedDict` class.
 Functionality:
     - LRU (Least Recently Updated) cache.
+    - Pluggable eviction policy.  FIFO (Least Recently Updated) ,LRU (Least Recently Used) ,LFU (Least Frequently Used) and W-TinyLFU.
     - Maintain usage metrics.
     - Maintain spike metrics.  Rapid updates within the default 3 seconds.
     - Support time-to-live (ttl) eviction.  Updated item will have its ttl reset.
+    - Support background time-to-live (ttl) reaping off the read path.
     - Support telemetry communication with external via queue.
+    - Support serializing the value once on the writing thread for the queue.
+    - Support bulk get/set/delete of many items under one lock and one queued out batch.
+    - Support per entry time-to-live (ttl) that override the cache ttl, with optional jitter.
+    - Support read-through loading with one loader call per key in flight.
+    - Support serving stale entries while they are reloaded in the background.  Optionally ahead of time (XFetch).
 """
 # See MIT license at the bottom of this script.
 #
+import  asyncio
 import  base64
+import  bisect
 import  hashlib
+import  heapq
+import  itertools
+import  lzma
 import  logging
+import  math
+import  mmap
 import  os
+import  pickle
 import  queue
+import  random
 import  socket
 import  sys
 import  time
-from    collections     import OrderedDict
-from    collections.abc import Callable, Iterable, Iterator, ItemsView, KeysView ,ValuesView
-from    enum            import Flag, IntEnum
-from    inspect         import getframeinfo, stack
-from    threading       import RLock, Thread  #,Lock
+import  zlib
+from    collections     import OrderedDict, defaultdict
+from    contextlib      import AbstractContextManager, nullcontext
+from    collections.abc import Callable, Iterable, Iterator, ItemsView, KeysView ,Mapping ,ValuesView
+from    enum            import Flag, IntEnum, StrEnum
+from    inspect         import getframeinfo, iscoroutinefunction, stack
+from    threading       import Condition, Event, RLock, Thread  #,Lock
 from    types           import FunctionType, ModuleType
 from    typing          import Any  #,Callable
 
@@ -56,23 +74,761 @@ class CallbackType( IntEnum ):
         return str( self.value )
 
 
+class SizerType( StrEnum ):
+    DEEP        = 'deep'        # Recursively walk the nested objects.  This is the default.
+    SHALLOW     = 'shallow'     # Only the top level object.  SEE: sys.getsizeof()
+    SAMPLE      = 'sample'      # Walk a bounded depth of the nested objects and extrapolate from a sample of the items.
+    PICKLE      = 'pickle'      # The length of the serialized object.
+
+    def __repr__(self):
+        return self.value
+
+    def __str__(self):
+        return str( self.value )
+
+
+class ChecksumType( StrEnum ):
+    MD5         = 'md5'         # MD5 of the string representation of the value.  This is the default.
+    BLAKE2B     = 'blake2b'     # 16 bytes BLAKE2b of the string representation of the value.  Faster than MD5.
+    PICKLE      = 'pickle'      # 16 bytes BLAKE2b of the pickled value.  Avoid the string representation of large nested values.
+
+    def __repr__(self):
+        return self.value
+
+    def __str__(self):
+        return str( self.value )
+
+
+class CompressType( StrEnum ):
+    ZLIB        = 'zlib'        # Fast with a good ratio for text and JSON like values.
+    LZMA        = 'lzma'        # Slower with a better ratio.
+
+    def __repr__(self):
+        return self.value
+
+    def __str__(self):
+        return str( self.value )
+
+
+class PolicyType( StrEnum ):
+    FIFO        = 'fifo'        # Least recently updated.  Evict the entry that was inserted or updated the longest ago.  This is the default.
+    LRU         = 'lru'         # Least recently used.  Lookups also refresh the entry.
+    LFU         = 'lfu'         # Least frequently used.  Ties are broken by the least recently used.
+    TINYLFU     = 'tinylfu'     # Window LRU in front of a main LRU.  A frequency sketch admit the window spill over into the main.
+
+    def __repr__(self):
+        return self.value
+
+    def __str__(self):
+        return str( self.value )
+
+
+class EvictionPolicy:
+    """Base eviction policy.
+    Track the keys in the cache and nominate the victim to evict when the cache is over its capacity.
+    The cache call the hooks while holding its instance lock, so the policy need not be thread safe.
+    """
+    tracks_access: bool = False     # The cache skip the lookup hook, and its lock, if the policy ignore lookups.
+
+    def insert(self ,key: Any) -> None:
+        """A new key was inserted into the cache."""
+
+    def update(self ,key: Any) -> None:
+        """An existing key was updated in the cache."""
+
+    def access(self ,key: Any) -> None:
+        """An existing key was looked up in the cache."""
+
+    def discard(self ,key: Any) -> None:
+        """A key was removed from the cache.  The key may not be tracked."""
+
+    def victim(self) -> Any:
+        """Nominate the key to evict.
+
+        Raise:
+            KeyError    If there is no key to nominate.
+        """
+        raise KeyError('No eviction victim.')
+
+    def clear(self) -> None:
+        """All the keys were removed from the cache."""
+
+
+class FIFOPolicy( EvictionPolicy ):
+    """First in first out.  An update move the key to the end of the line.
+    """
+    def __init__(self) -> None:
+        self._order: OrderedDict = OrderedDict()
+
+    def insert(self ,key: Any) -> None:
+        self._order[ key ] = None
+        self._order.move_to_end( key )
+
+    def update(self ,key: Any) -> None:
+        self.insert( key )
+
+    def discard(self ,key: Any) -> None:
+        self._order.pop( key ,None )
+
+    def victim(self) -> Any:
+        try:
+            return  next(iter( self._order ))
+        except  StopIteration as ex:
+            raise KeyError('No eviction victim.') from ex
+
+    def clear(self) -> None:
+        self._order.clear()
+
+
+class LRUPolicy( FIFOPolicy ):
+    """Least recently used.  A lookup also move the key to the end of the line.
+    """
+    tracks_access: bool = True
+
+    def access(self ,key: Any) -> None:
+        try:
+            self._order.move_to_end( key )
+        except  KeyError:
+            pass    # NOTE: Deleted from another thread.
+
+
+class LFUPolicy( EvictionPolicy ):
+    """Least frequently used.  Keys are bucketed by their use count so that every hook is O(1).
+    Within the same count the least recently used key is nominated.
+    """
+    tracks_access: bool = True
+
+    def __init__(self) -> None:
+        self._count : dict = {}                         # Use count of each key.
+        self._bucket: defaultdict = defaultdict( OrderedDict )  # Keys grouped by their use count in recency order.
+        self._lowest: int  = 0                          # Lowest use count.  May be stale after a discard.
+
+    def _bump(self ,key: Any) -> None:
+        cnt = self._count[ key ]
+        del self._bucket[ cnt ][ key ]
+        if  not self._bucket[ cnt ]:
+            del self._bucket[ cnt ]
+            if  self._lowest == cnt:
+                self._lowest += 1
+        self._count[ key ] = cnt + 1
+        self._bucket[ cnt + 1 ][ key ] = None
+
+    def insert(self ,key: Any) -> None:
+        if  key in self._count:
+            self._bump( key )
+            return
+        self._count[ key ] = 1
+        self._bucket[ 1 ][ key ] = None
+        self._lowest = 1
+
+    def update(self ,key: Any) -> None:
+        self.insert( key )
+
+    def access(self ,key: Any) -> None:
+        if  key in self._count:
+            self._bump( key )
+
+    def discard(self ,key: Any) -> None:
+        cnt = self._count.pop( key ,None )
+        if  cnt is not None:
+            del self._bucket[ cnt ][ key ]
+            if  not self._bucket[ cnt ]:
+                del self._bucket[ cnt ]
+
+    def victim(self) -> Any:
+        if  not self._count:
+            raise KeyError('No eviction victim.')
+        if  self._lowest not in self._bucket:
+            self._lowest = min( self._bucket )
+        return  next(iter( self._bucket[ self._lowest ]))
+
+    def clear(self) -> None:
+        self._count.clear()
+        self._bucket.clear()
+        self._lowest = 0
+
+
+class CountMinSketch:
+    """Compact frequency estimator of the keys.
+    Each row is a byte array of saturating 4 bit counters.  A key is hashed into one counter per row and the
+    estimate is the smallest of the counters.  All counters are halved after a sample of additions so that
+    the history age out and the sketch follow a changing workload.
+
+    SEE:
+        - https://arxiv.org/abs/1512.00727
+    """
+    DEPTH   = 4
+    MAXCNT  = 15
+    HALVE   = bytes( i >> 1 for i in range( 256 ))  # Translation table to halve every counter.
+
+    def __init__(self ,capacity: int) -> None:
+        """Count-min sketch constructor.
+
+        Args:
+            capacity    Expected number of distinct keys to track.  Sized the counters and the aging sample.
+        """
+        width = 16
+        while width < capacity:
+            width <<= 1
+        self._mask  : int   = width - 1
+        self._rows  : list  = [ bytearray( width ) for _ in range( CountMinSketch.DEPTH )]
+        self._sample: int   = 10 * max( capacity ,1 )   # Additions before the counters are aged.
+        self._added : int   = 0
+
+    def _indexes(self ,key: Any) -> Iterator[int]:
+        h  = (hash( key ) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF   # NOTE: Spread out small integer hashes.
+        h1 =  h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+        for i in range( CountMinSketch.DEPTH ):
+            yield (h1 + i * h2) & self._mask
+
+    def add(self ,key: Any) -> None:
+        """Increment the frequency of the key."""
+        for row ,idx in zip( self._rows ,self._indexes( key )):
+            if  row[ idx ] < CountMinSketch.MAXCNT:
+                row[ idx ] += 1
+        self._added += 1
+        if  self._added >= self._sample:
+            self.age()
+
+    def age(self) -> None:
+        """Halve all the counters."""
+        self._rows  = [ row.translate( CountMinSketch.HALVE ) for row in self._rows ]
+        self._added = self._added // 2
+
+    def estimate(self ,key: Any) -> int:
+        """Estimated frequency of the key."""
+        return  min( row[ idx ] for row ,idx in zip( self._rows ,self._indexes( key )))
+
+    def clear(self) -> None:
+        for row in self._rows:
+            row[:] = bytes( len( row ))
+        self._added = 0
+
+
+class TinyLFUPolicy( EvictionPolicy ):
+    """Window TinyLFU.
+    New keys enter a small window LRU.  When the window spill over, its least recently used key contest the
+    least recently used key of the main LRU and only the more frequent of the two, as estimated by a
+    count-min sketch, is kept.  Scans and one hit wonders are evicted from the window without flushing the
+    working set out of the main region.
+
+    SEE:
+        - https://arxiv.org/abs/1512.00727
+    """
+    tracks_access: bool = True
+
+    def __init__(self ,capacity: int = 512 ,window: float = 0.01) -> None:
+        """Window TinyLFU constructor.
+
+        Args:
+            capacity    Expected max entries of the cache.
+            window      Fraction of the entries kept in the window LRU.
+        """
+        self._window: OrderedDict = OrderedDict()
+        self._main  : OrderedDict = OrderedDict()
+        self._wmax  : int   = max( 1 ,int( capacity * window ))    # Max keys in the window region.
+        self._mmax  : int   = max( 1 ,capacity - self._wmax )       # Max keys in the main region.
+        self._sketch: CountMinSketch = CountMinSketch( capacity )
+        self.admitted   :int = 0    # Window keys that won the contest into the main region.
+        self.rejected   :int = 0    # Window keys that lost the contest and were evicted.
+
+    def _touch(self ,key: Any) -> bool:
+        self._sketch.add( key )
+        for region in (self._window ,self._main):
+            if  key in region:
+                region.move_to_end( key )
+                return  True
+        return  False
+
+    def insert(self ,key: Any) -> None:
+        if  not self._touch( key ):
+            self._window[ key ] = None
+            # NOTE: While the main region is not full the window spill over into it without a contest.
+            while len( self._window ) > self._wmax and len( self._main ) < self._mmax:
+                cand ,_ = self._window.popitem( last=False )
+                self._main[ cand ] = None
+
+    def update(self ,key: Any) -> None:
+        self.insert( key )
+
+    def access(self ,key: Any) -> None:
+        _ = self._touch( key )
+
+    def discard(self ,key: Any) -> None:
+        self._window.pop( key ,None )
+        self._main.pop( key ,None )
+
+    def victim(self) -> Any:
+        """Nominate the key to evict.  The window key that win its contest is moved into the main region.
+        The cache evict before it insert, so a full window make way for the incoming key by a contest.
+        """
+        while self._window and len( self._window ) >= self._wmax:
+            cand = next(iter( self._window ))
+            if  not self._main:
+                del self._window[ cand ]
+                self._main[ cand ] = None
+                continue
+            vict = next(iter( self._main ))
+            if  self._sketch.estimate( cand ) > self._sketch.estimate( vict ):
+                del self._window[ cand ]
+                self._main[ cand ] = None
+                self.admitted += 1
+                return  vict
+            self.rejected += 1
+            return  cand
+
+        for region in (self._main ,self._window):
+            if  region:
+                return  next(iter( region ))
+        raise KeyError('No eviction victim.')
+
+    def clear(self) -> None:
+        self._window.clear()
+        self._main.clear()
+        self._sketch.clear()
+
+
+class CallbackDispatcher:
+    """Bounded pool of worker threads to deliver the change callbacks.
+    Events for the same key that are still waiting to be delivered are coalesced into the latest event, keeping the
+    checksum prior to the first of them.  When the backlog is full the events for the keys not already waiting are dropped.
+    The callbacks can optionally be delivered to an asyncio event loop instead of being called on the worker threads.
+    """
+    def __init__(self ,workers: int = 2 ,backlog: int = 1024 ,loop: asyncio.AbstractEventLoop | None = None ,name: str = 'PyCache') -> None:
+        """Callback dispatcher constructor.
+
+        Args:
+            workers     Max number of worker threads.  They are started on demand.
+            backlog     Max number of keys waiting to be delivered.
+            loop        Optional asyncio event loop to deliver the callbacks to.
+            name        Name prefix of the worker threads.
+        """
+        self.loop       :asyncio.AbstractEventLoop = loop
+        self.__workers  :int    = max( 1 ,abs(int( workers )))
+        self.__backlog  :int    = max( 1 ,abs(int( backlog )))
+        self.__name     :str    = name
+        self.__pending  :OrderedDict = OrderedDict()   # (namespace ,key) to the latest (callback ,event).
+        self.__cond     :Condition   = Condition()
+        self.__threads  :list   = []
+        self.__busy     :int    = 0         # Workers that are delivering a callback.
+        self.delivered  :int    = 0         # Total number of delivered callbacks.
+        self.coalesced  :int    = 0         # Total number of events folded into a later event for the same key.
+        self.dropped    :int    = 0         # Total number of events dropped for the backlog was full.
+        self.errors     :int    = 0         # Total number of callbacks that raised an exception.
+
+    def submit(self ,callback: Callable ,arg: dict) -> bool:
+        """Submit an event to be delivered to the callback.
+
+        Args:
+            callback    Function to call with the event.  Can be a coroutine function.
+            arg         Event context dictionary.
+        Return:
+            False if the event was dropped.
+        """
+        ky = (arg.get('nms') ,arg.get('key'))
+        with  self.__cond:
+            if  ky in self.__pending:
+                _ ,prv = self.__pending[ ky ]
+                if 'prvcrc' in prv:
+                    arg['prvcrc'] = prv['prvcrc']
+                self.__pending[ ky ] = (callback ,arg)
+                self.coalesced += 1
+                return  True
+            if  len( self.__pending ) >= self.__backlog:
+                self.dropped += 1
+                return  False
+
+            self.__pending[ ky ] = (callback ,arg)
+            if  len( self.__threads ) < self.__workers and self.__busy + len( self.__pending ) > len( self.__threads ):
+                t = Thread( target=self._run ,daemon=True ,name=f'{self.__name} callback {len( self.__threads )}')
+                self.__threads.append( t )
+                t.start()
+            self.__cond.notify()
+        return  True
+
+    def join(self ,timeout: float | None = None) -> bool:
+        """Wait for all the waiting events to be delivered.
+
+        Args:
+            timeout     Optional max seconds to wait.
+        Return:
+            True if everything was delivered.
+        """
+        with  self.__cond:
+            return  self.__cond.wait_for( lambda: not self.__pending and not self.__busy ,timeout )
+
+    def metrics(self) -> dict:
+        return  {   'workers':  len( self.__threads ),
+                    'pending':  len( self.__pending ),
+                    'delivered':self.delivered,
+                    'coalesced':self.coalesced,
+                    'dropped':  self.dropped,
+                    'errors':   self.errors,
+                }
+
+    def _run(self) -> None:
+        """Worker thread loop."""
+        while True:
+            with  self.__cond:
+                while not self.__pending:
+                    self.__cond.wait()
+                _ ,(callback ,arg) = self.__pending.popitem( last=False )
+                self.__busy += 1
+            try:
+                self._deliver( callback ,arg )
+            finally:
+                with  self.__cond:
+                    self.__busy -= 1
+                    self.__cond.notify_all()
+
+    def _deliver(self ,callback: Callable ,arg: dict) -> None:
+        """Call the callback, or hand it over to the event loop."""
+        try:
+            if  self.loop is not None:
+                if  iscoroutinefunction( callback ):
+                    _ = asyncio.run_coroutine_threadsafe( callback( arg ) ,self.loop )
+                else:
+                    self.loop.call_soon_threadsafe( callback ,arg )
+            elif iscoroutinefunction( callback ):
+                asyncio.run( callback( arg ))
+            else:
+                callback( arg )
+            self.delivered += 1
+        except  Exception:   # noqa: BLE001
+            self.errors += 1
+            logging.getLogger('pycache').exception(f"Callback failed for key '{arg.get('key')}'.")
+
+
+class SingleFlight:
+    """Coalesce the concurrent loads of the same key into one call of the loader.
+    The first caller of a key run the loader on its own thread and the later callers wait for its result.
+    An exception raised by the loader is raised to every caller that waited on it.
+    """
+    def __init__(self) -> None:
+        self.__lock     :RLock  = RLock()
+        self.__flights  :dict   = {}        # Key to its in flight load.
+        self.loads      :int    = 0         # Total number of loader calls.
+        self.loadInt    :float  = 0.0       # Average loader latency in nano seconds.
+        self.errors     :int    = 0         # Total number of loader calls that raised an exception.
+        self.waits      :int    = 0         # Total number of callers that waited on the load of another caller.
+        self.waitMax    :int    = 0         # Most callers waiting on the same load.
+        self.deferred   :int    = 0         # Total number of loads satisfied by a value set by another party while waiting.
+        self.timeouts   :int    = 0         # Total number of loads that gave up waiting on another party and loaded locally.
+
+    def do(self ,key: Any ,loader: Callable[[] ,Any]) -> tuple[Any ,bool]:
+        """Call the loader for the key unless a load of the same key is already in flight.
+
+        Args:
+            key         Key to coalesce the loads on.
+            loader      Function to call, without argument, to load the value.
+        Return:
+            Tuple of the loaded value and True if this caller ran the loader.
+        """
+        with  self.__lock:
+            flt = self.__flights.get( key )
+            leader: bool = flt is None
+            if  leader:
+                flt = self.__flights[ key ] = {'done': Event() ,'value': None ,'error': None ,'waiters': 0}
+            else:
+                flt['waiters'] += 1
+                self.waits += 1
+                if  flt['waiters'] > self.waitMax:
+                    self.waitMax = flt['waiters']
+
+        if  not leader:
+            flt['done'].wait()
+            if  flt['error'] is not None:
+                raise flt['error']
+            return  flt['value'] ,False
+
+        bgn = time.monotonic_ns()
+        try:
+            flt['value'] = loader()
+            return  flt['value'] ,True
+        except  BaseException as ex:
+            flt['error'] = ex
+            self.errors += 1
+            raise
+        finally:
+            with  self.__lock:
+                self.loadInt = ((self.loadInt * self.loads) + (time.monotonic_ns() - bgn)) / (self.loads + 1)
+                self.loads  += 1
+                del self.__flights[ key ]
+            flt['done'].set()
+
+    def inflight(self ,key: Any) -> bool:
+        """Check if a load of the key is in flight."""
+        return  key in self.__flights
+
+    def metrics(self) -> dict:
+        return  {   'inflight': len( self.__flights ),
+                    'loads':    self.loads,
+                    'loadInt':  round( self.loadInt / Cache.ONE_NS_SEC ,4 ),
+                    'errors':   self.errors,
+                    'waits':    self.waits,
+                    'waitMax':  self.waitMax,
+                    'deferred': self.deferred,
+                    'timeouts': self.timeouts,
+                }
+
+
+class SerializedValue( bytes ):
+    """Pickled value produced by the writing thread.
+    Queued out in place of the live value so that the value is serialized once, can not be mutated after it was set,
+    and the checksum and size can be computed off the same bytes.  The receiver can store it as is in a `Cache`,
+    where it is unpickled on its first read.
+    """
+    __slots__ = ()
+
+
+class CompressedValue( bytes ):
+    """Compressed pickled value stored in a `Cache` in place of a large value.  Decompressed on every read.
+    """
+    __slots__ = ()
+
+
+class ArenaSlot:
+    """Location of a serialized value in an `Arena`.  The only part of an off heap value that is kept in the Python heap.
+    """
+    __slots__ = ('off' ,'siz' ,'cmp')
+
+    def __init__(self ,off: int ,siz: int ,cmp: bool = False) -> None:
+        self.off: int  = off    # Offset of the value into the arena.
+        self.siz: int  = siz    # Length of the serialized value.
+        self.cmp: bool = cmp    # The serialized value is compressed.
+
+    def __repr__(self) -> str:
+        return  f"ArenaSlot(off={self.off} ,siz={self.siz} ,cmp={self.cmp})"
+
+
+class Arena:
+    """Off heap storage for serialized values in an anonymous `mmap`.
+    Blocks are allocated first fit from an address ordered free list, and a freed block is coalesced with its free
+    neighbours.  The arena double in size when there is no free block large enough.
+    Not thread safe.  The owner shall serialize the access to it.
+    """
+    ALIGN = 16  # Block size granularity in bytes.
+
+    def __init__(self ,size: int = 1_048_576) -> None:
+        self._size: int  = self._align( max( size ,Arena.ALIGN ))
+        self._mmap: mmap.mmap = mmap.mmap( -1 ,self._size )
+        self._free: list = [[0 ,self._size]]    # Address ordered [offset ,size] of the free blocks.
+        self.used : int  = 0                    # Bytes allocated.
+
+    @property
+    def size(self) -> int:
+        return  self._size
+
+    @staticmethod
+    def _align(siz: int) -> int:
+        return  (siz + Arena.ALIGN - 1) // Arena.ALIGN * Arena.ALIGN
+
+    def _grow(self ,need: int) -> None:
+        """Grow the arena to at least fit a block of the needed size at its end.
+        The content is copied into a new larger map, so the offsets of the allocated blocks stay valid.
+        """
+        old = self._size
+        new = self._align( max( old * 2 ,old + need ))
+        mm  = mmap.mmap( -1 ,new )
+        mm[ :old ] = self._mmap[ :old ]
+        self._mmap.close()
+        self._mmap = mm
+        self._size = new
+        if  self._free and sum( self._free[-1] ) == old:
+            self._free[-1][1] += new - old  # NOTE: Extend the free block at the end.
+        else:
+            self._free.append([ old ,new - old ])
+
+    def alloc(self ,siz: int) -> int:
+        """Allocate a block.
+
+        Args:
+            siz     Size in bytes of the block.
+        Return:
+            Offset of the block.
+        """
+        need = self._align( siz )
+        for i ,(off ,fsz) in enumerate( self._free ):
+            if  fsz >= need:
+                if  fsz == need:
+                    del self._free[ i ]
+                else:
+                    self._free[ i ] = [ off + need ,fsz - need ]
+                self.used += need
+                return  off
+        self._grow( need )
+        return  self.alloc( siz )
+
+    def free(self ,off: int ,siz: int) -> None:
+        """Free a block and coalesce it with its free neighbours.
+
+        Args:
+            off     Offset of the block.
+            siz     Size in bytes the block was allocated with.
+        """
+        need = self._align( siz )
+        self.used -= need
+        i = bisect.bisect( self._free ,[ off ])
+        self._free.insert( i ,[ off ,need ])
+        if  i + 1 < len( self._free ) and off + need == self._free[ i + 1 ][0]:
+            self._free[ i ][1] += self._free.pop( i + 1 )[1]
+        if  i > 0 and sum( self._free[ i - 1 ]) == off:
+            self._free[ i - 1 ][1] += self._free.pop( i )[1]
+
+    def put(self ,blob: bytes ,cmp: bool = False) -> ArenaSlot:
+        """Copy the serialized value into the arena."""
+        off = self.alloc( len( blob ))
+        self._mmap[ off :off + len( blob )] = blob
+        return  ArenaSlot( off ,len( blob ) ,cmp )
+
+    def get(self ,slot: ArenaSlot) -> bytes:
+        """Copy the serialized value out of the arena."""
+        return  self._mmap[ slot.off :slot.off + slot.siz ]
+
+    def release(self ,slot: ArenaSlot) -> None:
+        """Free the block of the serialized value."""
+        self.free( slot.off ,slot.siz )
+
+    def clear(self) -> None:
+        """Free all the blocks."""
+        self._free = [[0 ,self._size]]
+        self.used  = 0
+
+
+class CacheEntry:
+    """Compact metadata record of a cache entry.
+    Slotted to avoid a dictionary per entry.  Fields can also be read like a dictionary for backward compatibility.
+    """
+    __slots__ = ('tsm' ,'crc' ,'lkp' ,'siz' ,'ttl' ,'otl')
+    FIELDS    = __slots__
+
+    def __init__(self ,tsm: int = 0 ,crc: bytes | None = None ,lkp: int = 0 ,siz: int = 0 ,ttl: float = 0 ,otl: float = 0) -> None:
+        self.tsm: int   = tsm   # Timestamp version of the value.
+        self.crc: bytes = crc   # Checksum of the value.
+        self.lkp: int   = lkp   # Last looked up timestamp.
+        self.siz: int   = siz   # Size of the value computed by the sizer.
+        self.ttl: float = ttl   # Time to live in seconds for this entry.  0 = The cache ttl.
+        self.otl: float = otl   # Time to live as it was requested, before the jitter.  0 = The cache ttl.
+
+    def __getitem__(self ,field: str) -> Any:
+        try:
+            return  getattr( self ,field )
+        except  (AttributeError ,TypeError) as ex:
+            raise KeyError( field ) from ex
+
+    def __contains__(self ,field: str) -> bool:
+        return  field in CacheEntry.FIELDS
+
+    def __iter__(self) -> Iterator[str]:
+        return  iter( CacheEntry.FIELDS )
+
+    def __eq__(self ,other: object) -> bool:
+        if  isinstance( other ,CacheEntry | dict ):
+            return  self.as_dict() == dict( other.items() )
+        return  NotImplemented
+
+    def __repr__(self) -> str:
+        return  repr( self.as_dict() )
+
+    def get(self ,field: str ,default: Any | None = None) -> Any:
+        return  getattr( self ,field ,default )
+
+    def keys(self) -> tuple:
+        return  CacheEntry.FIELDS
+
+    def items(self) -> Iterator[tuple]:
+        return  ((f ,getattr( self ,f )) for f in CacheEntry.FIELDS)
+
+    def as_dict(self) -> dict:
+        return  {f: getattr( self ,f ) for f in CacheEntry.FIELDS}
+
+
+class MetadataView( Mapping ):
+    """Read-only view of the cache metadata.
+    `copy()` return plain dictionaries of the records that are safe to pickle and send to older members.
+    """
+    __slots__ = ('_meta',)
+
+    def __init__(self ,meta: dict) -> None:
+        self._meta = meta
+
+    def __getitem__(self ,key: Any) -> CacheEntry:
+        return  self._meta[ key ]
+
+    def __contains__(self ,key: Any) -> bool:
+        return  key in self._meta
+
+    def __iter__(self) -> Iterator:
+        return  iter( self._meta )
+
+    def __len__(self) -> int:
+        return  len( self._meta )
+
+    def __repr__(self) -> str:
+        return  repr( self.copy() )
+
+    def copy(self) -> dict:
+        return  {k: e.as_dict() for k ,e in list( self._meta.items() )}
+
+
+class DecodedItemsView( ItemsView ):
+    """View of the cache items that decode the stored values as they are iterated over.
+    Used when the values are kept in the arena or compressed.  Like the dictionary views, it reflect the later changes.
+    """
+    __slots__ = ()
+
+    def __iter__(self) -> Iterator[tuple]:
+        for key in OrderedDict.keys( self._mapping ):
+            yield (key ,self._mapping._get_decoded( key ))
+
+    def __contains__(self ,item: tuple) -> bool:
+        key ,value = item
+        try:
+            val = self._mapping._get_decoded( key )
+        except  KeyError:
+            return  False
+        return  val is value or val == value
+
+
+class DecodedValuesView( ValuesView ):
+    """View of the cache values that decode the stored values as they are iterated over.
+    Used when the values are kept in the arena or compressed.  Like the dictionary views, it reflect the later changes.
+    """
+    __slots__ = ()
+
+    def __iter__(self) -> Iterator[Any]:
+        for key in OrderedDict.keys( self._mapping ):
+            yield self._mapping._get_decoded( key )
+
+
 class Cache( OrderedDict ):
     """Cache based of the ordered dict object.
        ... "who says inheritance is bad" ...
 
     Functionality:
         - LRU (Least Recently Updated) cache.
+        - Pluggable eviction policy.  FIFO (Least Recently Updated) ,LRU (Least Recently Used) ,LFU (Least Frequently Used) and W-TinyLFU.
         - Maintain usage metrics.
         - Maintain spike metrics.  Rapid updates within the default 3 seconds.
         - Support time-to-live (ttl) eviction.  Updated item will have its ttl reset.
+        - Support background time-to-live (ttl) reaping off the read path.
         - Support telemetry communication with external via queue.
-    Future:
-        - LFU:  Least frequently used.
-        - LRU:  Least recently used.  This is different from the above (Least Recently Updated)
+        - Support serializing the value once on the writing thread for the queue.
+        - Support bulk get/set/delete of many items under one lock and one queued out batch.
+        - Support per entry time-to-live (ttl) that override the cache ttl, with optional jitter.
+        - Support read-through loading with one loader call per key in flight.
+        - Support serving stale entries while they are reloaded in the background.  Optionally ahead of time (XFetch).
+    Locking:
+        - Every instance has its own re-entrant lock.  Different namespaces never contend with each other.
+        - The instance lock serialize the mutation of the ordered dictionary, the eviction and the expiry heap.
+        - Sizing and checksumming of a value are done outside of the instance lock.
+        - Per key metadata bookkeeping is lockless by default and trap the `KeyError` of a concurrent delete.
+          Set `stripes` to serialize the bookkeeping of the same key with a lock striped by the key hash.
+        - Reads are not locked.  A concurrent delete surface as a `KeyError` or the default value.
     SEE:
         - https://dropbox.tech/infrastructure/caching-in-theory-and-practice
     """
-    CACHE_LOCK  = RLock()           # Lock for serializing access to shared data.
     ONE_NS_SEC  = 1_000_000_000     # One second in nano seconds.
     ONE_NS_MIN  = 60 * ONE_NS_SEC   # One minute in nano seconds.
     # NOTE: time.monotonic_ns() behave differently on different OS.  Different precision is returned.
@@ -114,6 +870,29 @@ class Cache( OrderedDict ):
             max     :int        Max entries threshold for triggering entries eviction. Default to `512`.
             size    :int        Max size in bytes threshold for triggering entries eviction. Default to `512K`.
             ttl     :int        Time to live in seconds. Default to `0`.
+            tti     :int        Time to idle in seconds.  An entry that is not looked up for this long is evicted locally
+                                and is not requested back from the other members.  Default to `0`.
+            sizer   :str|Callable   Strategy to size a stored value with.  SEE: `SizerType`.  Default to `deep`.
+                                A callable shall accept the value and return its size in bytes.
+                                The size is computed once per stored value and kept in the metadata.
+            policy  :str|EvictionPolicy Eviction policy to nominate the entry to evict on capacity.  SEE: `PolicyType`.  Default to `fifo`.
+            checksum:str|Callable   Strategy to checksum a stored value with.  SEE: `ChecksumType`.  Default to `md5`.
+                                A callable shall accept the value and return its checksum in bytes.
+            lazycrc :bool       Only checksum a value if it is queued out or there is a callback to notify.
+                                Otherwise the checksum of the entry is left as `None`.  Default to `False`.
+            serialize:bool      Pickle the value on the writing thread and queue out the `SerializedValue` bytes instead of the value.
+                                The `pickle` sizer and checksum reuse the bytes.  Default to `False`.
+            reaper  :bool       Expired entries are evicted by a background reaper calling `evict_expired()`.
+                                Reads treat an expired but not yet reaped entry as a miss.  Default to `False`.
+            arena   :int        Initial size in bytes of an `mmap` arena to store the values off the Python heap.
+                                Values are kept serialized in the arena and deserialized on every read.  Trade a decode
+                                per read for less garbage collection and memory.  Default to `0`, disabled.
+            compress:str        Algorithm to compress the large values with.  `zlib` or `lzma`.  SEE: `CompressType`.
+                                The values are compressed when stored and decompressed on every read.  Default to `None`.
+            cmpsize :int        Pickled size in bytes from which a value is compressed.  Default to `1024`.
+            localevict:bool     Capacity evictions are local to this cache and are not queued out.  Default to `False`.
+            jitter  :int        Percentage (0-99) to randomly shorten the ttl of each entry by.  Spread out the expiry
+                                of the entries that were set together.  Default to `0`.
             msgbdy  :str        Custom log message format to log out.
             logger  :Logger     Custom logger to use internally.
             queue   :Queue      Output queue to broadcast internal changes out.
@@ -128,6 +907,16 @@ class Cache( OrderedDict ):
                                 If 'prvcrc' is None then it is a insertion.
                                 If 'newcrc' is None then it is a deletion.
             cbwindow:int        The preceding number of seconds from the last value lookup to trigger a callback if it is updated.
+            dispatcher:CallbackDispatcher   Bounded pool to deliver the callbacks with.  Default to a private pool of two workers.
+            stripes :int        Number of key hash striped locks for the per key metadata bookkeeping.  Default to `0`, lockless.
+            claimer :Callable   Your function to call with the cache name and key before a missing key is loaded by `get_or_load()`.
+                                Return the seconds to wait for another party to set the key, or `0` to load it now.
+            loader  :Callable   Your function to call with a key to reload a stale entry in the background.
+            refresh :int        Percentage (1-99) of an entry's ttl after which it is stale.  A stale entry is still served
+                                and reloaded once in the background with the `loader`.  Default to `0`, disabled.
+            xfetch  :float      Beta of the probabilistic early refresh.  An entry is reloaded ahead of its expiry with a
+                                probability that grow as the expiry draw near and with the loader latency.  1.0 is typical.
+                                SEE: https://cseweb.ucsd.edu/~avattani/papers/cache_stampede.pdf
             debug   :bool       Enable internal debugging.  Default to `False`.
         Raise:
             TypeError
@@ -136,16 +925,43 @@ class Cache( OrderedDict ):
         self.__name     :str    = 'default'
         self.__maxlen   :int    = 512       # Max entries threshold for triggering entries eviction.
         self.__maxsize  :int    = 512*1024  # Max size in bytes threshold for triggering entries eviction. Default= 512K.
-        self.__ttl      :int    = 0         # Time to live in minutes.
+        self.__ttl      :int    = 0         # Time to live in seconds.
+        self.__tti      :int    = 0         # Time to idle in seconds.
+        self.__reaper   :bool   = False     # Expired entries are evicted by a background reaper.
+        self.__jitter   :float  = 0.0       # Fraction of the ttl to randomly shorten each entry by.
+        self.__localevict:bool  = False     # Capacity evictions are not queued out.
+        self.__sizer    :Callable = self._get_size  # Strategy to size a stored value with.
+        self.__checksum :Callable = self._get_md5_checksum  # Strategy to checksum a stored value with.
+        self.__lazycrc  :bool   = False     # Only checksum a value if it is needed.
+        self.__serialize:bool   = False     # Pickle the value on the writing thread.
+        self.__arena    :Arena  = None      # Off heap storage of the serialized values.
+        self.__compress :CompressType = None    # Algorithm to compress the large values with.
+        self.__cmpsize  :int    = 1024      # Pickled size in bytes from which a value is compressed.
+        self.__policy   :EvictionPolicy = FIFOPolicy()  # Eviction policy to nominate the entry to evict on capacity.
         self.__msgbdy   :str    = 'L#{lno:>4}\tIm:{iam}\tOp:{opc}\tTs:{tsm:<18}\tNm:{nms}\tKy:{key}\tCk:{crc}\tMg:{msg}'
         self.__logger   :logging.Logger     = None
         self.__queue    :queue.Queue        = None
         self.__callback :Callable           = None
         self.__cbwindow :int    = 3         # Callback window, in seconds, for changes in the cache since last looked up.
+        self.__dispatcher:CallbackDispatcher = None    # Bounded pool to deliver the callbacks with.
         self.__debug    :bool   = False     # Internal debug is disabled.
+        self.__lock     :RLock  = RLock()   # Instance lock for serializing access to the shared data.
+        self.__stripes  :list   = []        # Key hash striped locks for the per key metadata bookkeeping.
         self.__oldest   :int    = Cache.tsm_version()  # Oldest entry in the cache.
         self.__latest   :int    = Cache.tsm_version()  # Latest time the cache was touch on.
-        self.__meta     :dict   = {}
+        self.__meta     :dict   = {}        # Key to its `CacheEntry` record.
+        self.__metaview :MetadataView = MetadataView( self.__meta )  # Read-only view of the metadata.
+        self.__expiry   :list   = []        # Min-heap of (expiry ,seq ,key ,tsm) ordered by the expiry timestamp.
+        self.__seqnum   = itertools.count() # Tie breaker for heap entries with the same expiry.  Keys may not be comparable.
+        self.__idle     :list   = []        # Min-heap of (due ,seq ,key ,entry) ordered by the earliest time the entry can be idle.
+        self.__dropped  :OrderedDict = OrderedDict()    # Recently locally evicted keys to their eviction timestamp.
+        self.__flight   :SingleFlight = SingleFlight()  # In flight loads of the read-through `get_or_load()`.
+        self.__claimer  :Callable  = None   # Hook to defer a load to another party.
+        self.__arrival  :Condition = Condition()    # Notified when a key with a load in flight is set.
+        self.__loader   :Callable  = None   # Function to reload a stale entry with.
+        self.__refresh  :float  = 0.0       # Fraction of the ttl after which an entry is stale.
+        self.__xfetch   :float  = 0.0       # Beta of the probabilistic early refresh.
+        self.__refresher:CallbackDispatcher = None  # Single worker to reload the stale entries in the background.
         # Public instance metrics.
         self._reset_metrics()
 
@@ -162,6 +978,83 @@ class Cache( OrderedDict ):
                         self.__maxsize = abs(int( val ))
                     case 'ttl':
                         self.__ttl = abs(int( val ))
+                    case 'tti':
+                        self.__tti = abs(int( val ))
+                    case 'reaper':
+                        self.__reaper = bool( val )
+                    case 'localevict':
+                        self.__localevict = bool( val )
+                    case 'jitter':
+                        self.__jitter = min( abs(int( val )) ,99 ) / 100
+                    case 'checksum':
+                        if  isinstance( val ,str ):
+                            try:
+                                typ = ChecksumType( val.lower() )
+                            except  ValueError as ex:
+                                raise TypeError(f'Unsupported checksum "{val}"!') from ex
+                            match typ:
+                                case ChecksumType.MD5:
+                                    self.__checksum = self._get_md5_checksum
+                                case ChecksumType.BLAKE2B:
+                                    self.__checksum = self._get_blake2b_checksum
+                                case ChecksumType.PICKLE:
+                                    self.__checksum = self._get_pickled_checksum
+                        elif isinstance( val ,Callable ):
+                            self.__checksum = val
+                        else:
+                            raise TypeError('An instance of "type.Callable" or a "ChecksumType" is required as a checksum!')
+                    case 'lazycrc':
+                        self.__lazycrc = bool( val )
+                    case 'serialize':
+                        self.__serialize = bool( val )
+                    case 'arena':
+                        self.__arena = Arena( abs(int( val )))
+                    case 'compress':
+                        if  val:
+                            try:
+                                self.__compress = CompressType( str( val ).lower() )
+                            except  ValueError as ex:
+                                raise TypeError(f'Unsupported compress "{val}"!') from ex
+                    case 'cmpsize':
+                        self.__cmpsize = abs(int( val ))
+                    case 'policy':
+                        if  isinstance( val ,str ):
+                            try:
+                                typ = PolicyType( val.lower() )
+                            except  ValueError as ex:
+                                raise TypeError(f'Unsupported policy "{val}"!') from ex
+                            match typ:
+                                case PolicyType.FIFO:
+                                    self.__policy = FIFOPolicy()
+                                case PolicyType.LRU:
+                                    self.__policy = LRUPolicy()
+                                case PolicyType.LFU:
+                                    self.__policy = LFUPolicy()
+                                case PolicyType.TINYLFU:
+                                    self.__policy = TinyLFUPolicy( capacity=abs(int( kwargs.get('max') or self.__maxlen )))
+                        elif isinstance( val ,EvictionPolicy ):
+                            self.__policy = val
+                        else:
+                            raise TypeError('An instance of "EvictionPolicy" or a "PolicyType" is required as a policy!')
+                    case 'sizer':
+                        if  isinstance( val ,str ):
+                            try:
+                                typ = SizerType( val.lower() )
+                            except  ValueError as ex:
+                                raise TypeError(f'Unsupported sizer "{val}"!') from ex
+                            match typ:
+                                case SizerType.DEEP:
+                                    self.__sizer = self._get_size
+                                case SizerType.SHALLOW:
+                                    self.__sizer = sys.getsizeof
+                                case SizerType.SAMPLE:
+                                    self.__sizer = self._get_sampled_size
+                                case SizerType.PICKLE:
+                                    self.__sizer = self._get_pickled_size
+                        elif isinstance( val ,Callable ):
+                            self.__sizer = val
+                        else:
+                            raise TypeError('An instance of "type.Callable" or a "SizerType" is required as a sizer!')
                     case 'msgbdy':
                         self.__msgbdy = str( val )
                     case 'logger':
@@ -180,6 +1073,22 @@ class Cache( OrderedDict ):
                         if 'callback' not in kwargs:
                             raise TypeError('"cbwindow" can only be specify along with a callback function.')
                         self.__cbwindow = abs(int( val ))
+                    case 'dispatcher':
+                        if  not isinstance( val ,CallbackDispatcher ):
+                            raise TypeError('An instance of "CallbackDispatcher" is required as a dispatcher!')
+                        self.__dispatcher = val
+                    case 'stripes':
+                        self.__stripes = [ RLock() for _ in range( abs(int( val ))) ]
+                    case 'claimer':
+                        if  not isinstance( val ,Callable ):
+                            raise TypeError('An instance of "type.Callable" is required as a claimer function!')
+                        self.__claimer = val
+                    case 'loader':
+                        self.loader = val
+                    case 'refresh':
+                        self.__refresh = min( abs(int( val )) ,99 ) / 100
+                    case 'xfetch':
+                        self.__xfetch = abs(float( val ))
                     case 'debug':
                         self.__debug = bool( val )
 
@@ -187,12 +1096,20 @@ class Cache( OrderedDict ):
         if  self.__logger is None:
             self._setup_logger()
 
+        # Setup the default callback dispatcher.  Its worker threads are only started on demand.
+        if  self.__dispatcher is None and self.__callback:
+            self.__dispatcher = CallbackDispatcher( name=f'PyCache {self.__name}' )
+
         kwargs = { key: val for key ,val in kwargs.items()
-                            if  key  not in {'name' ,'max' ,'size' ,'ttl' ,'msgbdy' ,'logger' ,'queue' ,'callback' ,'cbwindow' ,'debug'}}
+                            if  key  not in {'name' ,'max' ,'size' ,'ttl' ,'tti' ,'reaper' ,'localevict' ,'jitter' ,'checksum' ,'lazycrc' ,'serialize' ,'arena' ,'compress' ,'cmpsize' ,'policy' ,'sizer' ,'msgbdy' ,'logger' ,'queue' ,'callback' ,'cbwindow' ,'dispatcher' ,'stripes' ,'claimer' ,'loader' ,'refresh' ,'xfetch' ,'debug'}}
         super().__init__( other ,**kwargs )
 
     # Public instance properties.
     #
+    @property
+    def lock(self) -> RLock:
+        return  self.__lock
+
     @property
     def logger(self) -> logging.Logger:
         return  self.__logger
@@ -206,8 +1123,8 @@ class Cache( OrderedDict ):
         return  self.__maxsize
 
     @property
-    def metadata(self) -> dict:
-        return  self.__meta
+    def metadata(self) -> 'MetadataView':
+        return  self.__metaview
 
     @property
     def msgbdy(self) -> str:
@@ -229,6 +1146,49 @@ class Cache( OrderedDict ):
     def ttl(self) -> int:
         return  self.__ttl
 
+    @property
+    def tti(self) -> int:
+        return  self.__tti
+
+    @property
+    def localevict(self) -> bool:
+        return  self.__localevict
+
+    @property
+    def arena(self) -> Arena:
+        return  self.__arena
+
+    @property
+    def compress(self) -> CompressType:
+        return  self.__compress
+
+    @property
+    def cmpratio(self) -> float:
+        """Ratio of the pickled size to the compressed size of the compressed values."""
+        return  self.cmpInSize / self.cmpOutSize if self.cmpOutSize else 0.0
+
+    @property
+    def reaper(self) -> bool:
+        return  self.__reaper
+
+    @property
+    def sizer(self) -> Callable:
+        return  self.__sizer
+
+    @property
+    def checksum(self) -> Callable:
+        return  self.__checksum
+
+    @property
+    def policy(self) -> EvictionPolicy:
+        return  self.__policy
+
+    @property
+    def hitratio(self) -> float:
+        """Ratio of the lookups that found an entry in the cache."""
+        total = self.lookups + self.misses
+        return  self.lookups / total if total else 0.0
+
     @property
     def queue(self) -> queue.Queue:
         return  self.__queue
@@ -237,6 +1197,24 @@ class Cache( OrderedDict ):
     def callback(self) -> Callable:
         return  self.__callback
 
+    @property
+    def dispatcher(self) -> CallbackDispatcher:
+        return  self.__dispatcher
+
+    @property
+    def flight(self) -> SingleFlight:
+        return  self.__flight
+
+    @property
+    def loader(self) -> Callable:
+        return  self.__loader
+
+    @loader.setter
+    def loader(self ,loader: Callable | None) -> None:
+        if  loader is not None and not isinstance( loader ,Callable ):
+            raise TypeError('An instance of "type.Callable" is required as a loader function!')
+        self.__loader = loader
+
     # This class's private method section.
     #
     def _reset_metrics(self):
@@ -245,12 +1223,22 @@ class Cache( OrderedDict ):
         self.__meta.clear()
         self.evicts   :int  = 0   # Total number of evicts  since initialization.
         self.deletes  :int  = 0   # Total number of deletes since initialization.
-        self.misses   :int  = 0   # Total number of misses  since initialization.
-        self.lookups  :int  = 0   # Total number of lookups since initialization.
+        self.localEvicts:int= 0   # Total number of evicts  that were not queued out since initialization.  Expiries excluded.
+        self.expires  :int  = 0   # Total number of ttl expiries since initialization.
+        self.replDeletes:int= 0   # Total number of deletes that arrived from outside since initialization.
+        self.misses   :int  = 0   # Total number of lookups that missed since initialization.
+        self.lookups  :int  = 0   # Total number of lookups that hit    since initialization.
         self.inserts  :int  = 0   # Total number of inserts since initialization.
         self.updates  :int  = 0   # Total number of updates since initialization.
         self.spikes   :int  = 0   # Total number of change to the cache where previous change was <= 5 seconds ago.
         self.spikeInt :float= 0.0 # Average spike interval between changes.
+        self.refreshes:int  = 0   # Total number of stale entries reloaded in the background.
+        self.unpickles:int  = 0   # Total number of serialized values unpickled on their first read.
+        self.compresses:int = 0   # Total number of values compressed since initialization.
+        self.cmpInSize:int  = 0   # Total pickled   bytes of the compressed values.
+        self.cmpOutSize:int = 0   # Total compressed bytes of the compressed values.
+        self.cmpTime  :int  = 0   # Total nano seconds spent compressing.
+        self.dcmTime  :int  = 0   # Total nano seconds spent decompressing.
         self.ttlSize  :int  = sys.getsizeof( self ) # Total size of this cache object.
 
     def _setup_logger(self):
@@ -305,36 +1293,139 @@ class Cache( OrderedDict ):
         txt =  txt.format( now=now ,lno=lno ,iam=iam ,opc=opc ,tsm=tsm ,nms=nms ,key=key ,crc=crc ,md5=md5 ,msg=msg )
         self.__logger.debug( txt )
 
-    def _evict_items_by_ttl(self) -> int:
-        """Evict cache time-to-live (ttl) based items.
+    def _evict_items_by_ttl(self,
+            limit: int | None = None ) -> int:
+        """Evict cache time-to-live (ttl) and time-to-idle (tti) based items.
+        Entries are popped off the expiry heap in the order they expire.  Expiring k entries cost O(k log n)
+        and a check that find nothing to expire only peek at the head of the heap.
+        An entry popped off the idle heap that was looked up since it was scheduled is pushed back to when it can
+        next be idle.
+        All these evictions are local and not queued out.  The ttl is computed from the origin timestamp that is kept
+        with the entry, so every member holding the entry expire it at the same time without being told.
+        The ttl expiries are counted in `expires`.  The idle evictions depend on the local look ups and are local evictions.
 
+        Args:
+            limit       Optional maximum number of entries to evict in this call.
         Return:
             Number of evictions.
         """
         now = Cache.tsm_version()
-        ttl = self.__ttl * Cache.ONE_NS_SEC     # Convert seconds in nanosecond.
         evt: int = 0
 
-        if  ttl > (now - self.__oldest):
+        if (not self.__expiry or self.__expiry[0][0] >= now) and (not self.__idle or self.__idle[0][0] >= now):
             return  0   # NOTE: Nothing is old enough to evict.
 
         if  self.__debug:
             self._log_ops_msg( opc='EVT' ,tsm=now ,nms=self.__name ,key=None ,crc=None ,msg='Checking for eviction candidates.')
 
-        oldest: int = Cache.tsm_version()
-        with  Cache.CACHE_LOCK: # TODO: Not working!
-            for key in self.__meta.copy():  # Make a shallow copy of the keys.
-                val = self.__meta[ key ]
-                if  ttl < now - val['tsm']:
-                    if  self.__contains__( key ):
-                        _ = super().pop( key )
-                    evt += 1
-                    self._post_del( key=key ,tsm=now ,eviction=True ,queue_out=True )
-                elif val['tsm'] < oldest:
-                    oldest = val['tsm']
-            self.__oldest = oldest
+        with  self.__lock:
+            while self.__expiry and self.__expiry[0][0] < now and (limit is None or evt < limit):
+                _ ,_ ,key ,tsm = heapq.heappop( self.__expiry )
+                if  key not in self.__meta or self.__meta[ key ].tsm != tsm:
+                    continue    # NOTE: Stale heap entry.  The key was deleted or updated after it was scheduled.
+
+                if  super().__contains__( key ):
+                    self._release_value( super().pop( key ))
+                evt += 1
+                self._post_del( key=key ,tsm=now ,eviction=True ,queue_out=False ,expired=True )
+            self.__oldest = self.__expiry[0][3] if self.__expiry else now
+
+            tti = self.__tti * Cache.ONE_NS_SEC
+            while self.__idle and self.__idle[0][0] < now and (limit is None or evt < limit):
+                due ,_ ,key ,ent = heapq.heappop( self.__idle )
+                if  self.__meta.get( key ) is not ent:
+                    continue    # NOTE: Stale heap entry.  The key was deleted after it was scheduled.
+
+                lkp = max( ent.lkp ,due - tti )  # NOTE: Never looked up entry is idle since it was inserted.
+                if  lkp + tti >= now:
+                    heapq.heappush( self.__idle ,(lkp + tti ,next( self.__seqnum ) ,key ,ent))
+                    continue
+
+                if  super().__contains__( key ):
+                    self._release_value( super().pop( key ))
+                evt += 1
+                self._post_del( key=key ,tsm=now ,eviction=True ,queue_out=False )
         return  evt
 
+    def _key_lock(self,
+            key: Any ) -> AbstractContextManager:
+        """Get the striped lock for the per key metadata bookkeeping.
+
+        Args:
+            key         Key to get the lock for.
+        Return:
+            The striped lock for the key, or a null context if striping is disabled.
+        """
+        if  not self.__stripes:
+            return  nullcontext()
+        return  self.__stripes[ hash( key ) % len( self.__stripes )]
+
+    def _is_expired(self,
+            key: Any,
+            now: int | None = None ) -> bool:
+        """Check if the entry have out lived its time-to-live (ttl) or time-to-idle (tti) but have not been evicted yet.
+
+        Args:
+            key         Key to the entry to check.
+            now         Optional current timestamp.
+        Return:
+            True if the entry is expired.
+        """
+        ent = self.__meta.get( key )
+        if  ent is None:
+            return  False
+        ttl = ent.ttl or self.__ttl
+        if  ttl == 0 and self.__tti == 0:
+            return  False
+        if  now is None:
+            now =  Cache.tsm_version()
+        if  self.__tti and (ent.lkp or ent.tsm) + self.__tti * Cache.ONE_NS_SEC < now:
+            return  True
+        return  ttl > 0 and ent.tsm + int( ttl * Cache.ONE_NS_SEC ) < now
+
+    def _schedule_expiry(self,
+            key: Any,
+            tsm: int,
+            ttl: float | None = None ) -> None:
+        """Schedule the key into the expiry heap.
+        Previously scheduled entries for the same key are left in the heap and skipped when they are popped.
+        The heap is compacted once the stale entries out number the live entries.
+
+        Args:
+            key         Key to schedule for expiry.
+            tsm         The timestamp of the entry that the expiry is calculated from.
+            ttl         Optional time to live in seconds.  Default to the cache ttl.
+        """
+        if  ttl is None:
+            ttl =  self.__ttl
+        with  self.__lock:
+            heapq.heappush( self.__expiry ,(tsm + int( ttl * Cache.ONE_NS_SEC ) ,next( self.__seqnum ) ,key ,tsm))
+
+            if  len( self.__expiry ) > 2 * len( self.__meta ) + 64:
+                self.__expiry = [ e for e in self.__expiry if e[2] in self.__meta and self.__meta[ e[2] ].tsm == e[3] ]
+                heapq.heapify( self.__expiry )
+
+    def _schedule_idle(self,
+            key: Any,
+            ent: CacheEntry,
+            tsm: int ) -> None:
+        """Schedule a newly inserted entry into the idle heap.
+        The entry is scheduled once.  It is only rescheduled when it is popped off the heap and found looked up since,
+        so the look ups themselves do not touch the heap.
+        The heap is compacted once the stale entries out number the live entries.
+
+        Args:
+            key         Key to schedule for idle eviction.
+            ent         Metadata of the entry.  A heap entry for a metadata that is no longer in the cache is stale.
+            tsm         The timestamp the entry was inserted at.
+        """
+        with  self.__lock:
+            heapq.heappush( self.__idle ,(tsm + self.__tti * Cache.ONE_NS_SEC ,next( self.__seqnum ) ,key ,ent))
+
+            if  len( self.__idle ) > 2 * len( self.__meta ) + 64:
+                self.__idle = [ e for e in self.__idle if self.__meta.get( e[2] ) is e[3] ]
+                heapq.heapify( self.__idle )
+
     def _get_size(self ,obj: object ,seen: set | None = None) -> int:
         """Recursively finds size of nested objects.
 
@@ -364,20 +1455,299 @@ class Cache( OrderedDict ):
 
         return size
 
+    def _get_sampled_size(self ,obj: object ,depth: int = 2 ,sample: int = 16) -> int:
+        """Estimate the size of nested objects by walking a bounded depth and sampling the items.
+
+        Args:
+            obj     Object, optionally with nested objects.
+            depth   Number of nesting levels to walk down.
+            sample  Number of items to sample per container.  The rest are extrapolated from the sample.
+        Return:
+            size    Estimated total size of the input object.
+        """
+        size = sys.getsizeof( obj )
+        if  depth <= 0:
+            return size
+
+        if isinstance( obj ,dict ):
+            cnt = len( obj )
+            itm = [ self._get_sampled_size( k ,depth -1 ,sample ) + self._get_sampled_size( v ,depth -1 ,sample )
+                    for k ,v in itertools.islice( obj.items() ,sample )]
+        elif isinstance( obj , list |tuple |set |frozenset ):
+            cnt = len( obj )
+            itm = [ self._get_sampled_size( i ,depth -1 ,sample ) for i in itertools.islice( obj ,sample )]
+        else:
+            return size
+
+        if  itm:
+            size += sum( itm ) * cnt // len( itm )
+        return size
+
+    def _get_pickled_size(self ,obj: object) -> int:
+        """The size of the serialized object.
+
+        Args:
+            obj     Object, optionally with nested objects.  A `SerializedValue` is measured as is.
+        Return:
+            size    Length of the pickled object.
+        """
+        if  isinstance( obj ,SerializedValue ):
+            return len( obj )
+        return len( pickle.dumps( obj ,protocol=pickle.HIGHEST_PROTOCOL ))
+
+    def _get_md5_checksum(self ,obj: object) -> bytes:
+        """MD5 of the string representation of the object.
+
+        Args:
+            obj     Object to checksum.
+        Return:
+            16 bytes digest.
+        """
+        return hashlib.md5( str( obj ).encode('utf-8') ).digest()    # noqa: S324
+
+    def _get_blake2b_checksum(self ,obj: object) -> bytes:
+        """BLAKE2b of the string representation of the object.
+
+        Args:
+            obj     Object to checksum.
+        Return:
+            16 bytes digest.
+        """
+        return hashlib.blake2b( str( obj ).encode('utf-8') ,digest_size=16 ).digest()
+
+    def _get_pickled_checksum(self ,obj: object) -> bytes:
+        """BLAKE2b of the serialized object.
+
+        Args:
+            obj     Object to checksum.  A `SerializedValue` is checksummed as is.
+        Return:
+            16 bytes digest.
+        """
+        if  not isinstance( obj ,SerializedValue ):
+            obj = pickle.dumps( obj ,protocol=pickle.HIGHEST_PROTOCOL )
+        return hashlib.blake2b( obj ,digest_size=16 ).digest()
+
+    def _get_value_blob(self,
+            value: Any,
+            queue_out: bool | None = True ) -> SerializedValue | None:
+        """Serialize the value on the writing thread if it is to be queued out or stored in the arena.
+
+        Args:
+            value       Value to serialize.
+            queue_out   The value is to be queued out.
+        Return:
+            The serialized value or None if serialization is disabled or not needed.
+        """
+        if  isinstance( value ,SerializedValue ):
+            return  value   # NOTE: Already serialized, such as a value that arrived from outside.
+        if  (self.__serialize and self.__queue and queue_out) or self.__arena is not None or self.__compress is not None:
+            return  SerializedValue( pickle.dumps( value ,protocol=pickle.HIGHEST_PROTOCOL ))
+        return  None
+
+    def _get_value_size(self,
+            value: Any,
+            blob: SerializedValue | None = None ) -> int:
+        """Size the value with the sizer.  The `pickle` sizer reuse the serialized value.
+
+        Args:
+            value       Value to size.
+            blob        Optional serialized value.
+        Return:
+            Size of the value in bytes.
+        """
+        if  blob is not None and self.__sizer == self._get_pickled_size:
+            return  len( blob )
+        return  self.__sizer( value )
+
+    def _get_value_crc(self,
+            value: Any,
+            blob: SerializedValue | None = None,
+            queue_out: bool | None = True ) -> bytes | None:
+        """Checksum the value with the checksum.  The `pickle` checksum reuse the serialized value.
+
+        Args:
+            value       Value to checksum.
+            blob        Optional serialized value.
+            queue_out   The value is to be queued out.
+        Return:
+            Checksum of the value or None if the checksum is lazy and nobody need it.
+        """
+        if  self.__lazycrc and not (self.__queue and queue_out) and not self.__callback:
+            return  None
+        if  blob is not None and self.__checksum == self._get_pickled_checksum:
+            return  self.__checksum( blob )
+        return  self.__checksum( value )
+
+    def _get_entry_ttl(self,
+            ttl: float      | None = None,
+            queue_out: bool | None = True ) -> float | None:
+        """Get the time to live to keep with a new entry.  A locally originated entry get its ttl jittered.
+
+        Args:
+            ttl         Optional time to live in seconds.  Default to the cache ttl.
+            queue_out   The entry originated locally.  An entry that arrived from outside was already jittered.
+        Return:
+            The time to live in seconds or None for the cache ttl.
+        """
+        if  self.__jitter and queue_out and (ttl or self.__ttl):
+            return  round((ttl or self.__ttl) * (1 - random.random() * self.__jitter) ,3 )    # noqa: S311
+        return  ttl or None
+
+    def _encode_value(self,
+            value: Any,
+            blob: SerializedValue | None = None ) -> Any:
+        """Encode a value into what is stored in the dictionary.
+
+        A serialized value that is over `cmpsize` is compressed, if that make it smaller.
+
+        Args:
+            value       Value to store.
+            blob        Optional serialized value.
+        Return:
+            The slot of the serialized value in the arena, or the compressed value, or the value as is.
+        """
+        if  self.__arena is None and self.__compress is None:
+            return  value
+        if  blob is None:
+            blob =  pickle.dumps( value ,protocol=pickle.HIGHEST_PROTOCOL )
+
+        cmp = None
+        if  self.__compress is not None and len( blob ) >= self.__cmpsize:
+            bgn = time.perf_counter_ns()
+            cmp = zlib.compress( blob ) if self.__compress == CompressType.ZLIB else lzma.compress( blob )
+            self.cmpTime += time.perf_counter_ns() - bgn
+            if  len( cmp ) < len( blob ):
+                self.compresses += 1
+                self.cmpInSize  += len( blob )
+                self.cmpOutSize += len( cmp )
+            else:
+                cmp =  None     # NOTE: Incompressible.
+
+        if  self.__arena is None:
+            return  value if cmp is None else CompressedValue( cmp )
+        with  self.__lock:
+            return  self.__arena.put( blob if cmp is None else cmp ,cmp is not None )
+
+    def _decompress(self,
+            cmp: bytes ) -> bytes:
+        """Decompress a compressed serialized value.
+
+        Args:
+            cmp         The compressed bytes.
+        Return:
+            The serialized value.
+        """
+        bgn = time.perf_counter_ns()
+        blob = zlib.decompress( cmp ) if self.__compress == CompressType.ZLIB else lzma.decompress( cmp )
+        self.dcmTime += time.perf_counter_ns() - bgn
+        return  blob
+
+    def _get_stored_size(self,
+            value: Any,
+            blob: SerializedValue | None,
+            stored: Any ) -> int:
+        """Size what is stored for the value.  A compressed value is counted by its compressed size and a value in the
+        arena by the size of its slot.
+
+        Args:
+            value       Value that was stored.
+            blob        Optional serialized value.
+            stored      What is stored in the dictionary for the value.
+        Return:
+            Size in bytes.
+        """
+        if  isinstance( stored ,CompressedValue ):
+            return  len( stored )
+        if  isinstance( stored ,ArenaSlot ):
+            return  stored.siz
+        return  self._get_value_size( value ,blob )
+
+    def _decode_value(self,
+            stored: Any,
+            key: Any | None = None ) -> Any:
+        """Decode what is stored in the dictionary back into the value.
+        A `SerializedValue` is unpickled on its first read and, given its key, replaced with the value in the dictionary.
+        It was sized as bytes, so it is sized again with the sizer like a value that was stored locally.
+        To be called while holding the lock that the stored value was looked up with.
+
+        Args:
+            stored      What is stored in the dictionary.
+            key         Optional key of the stored value to replace a serialized value with its value.
+        Return:
+            The value.
+        """
+        if  isinstance( stored ,ArenaSlot ):
+            blob = self.__arena.get( stored )
+            return  pickle.loads( self._decompress( blob ) if stored.cmp else blob )    # noqa: S301
+        if  isinstance( stored ,CompressedValue ):
+            return  pickle.loads( self._decompress( stored ))   # noqa: S301
+        if  isinstance( stored ,SerializedValue ):
+            val = pickle.loads( stored )    # noqa: S301
+            if  key is not None:
+                OrderedDict.__setitem__( self ,key ,val )
+                self.unpickles += 1
+                ent = self.__meta.get( key )
+                if  ent is not None and self.__sizer != self._get_pickled_size:
+                    size = self.__sizer( val )
+                    self.ttlSize += size - ent.siz
+                    ent.siz = size
+            return  val
+        return  stored
+
+    def _get_decoded(self,
+            key: Any ) -> Any:
+        """Get the decoded value of a key without the look up bookkeeping.
+
+        Args:
+            key         Key of the value.
+        Return:
+            The value.
+        Raise:
+            KeyError if the key is not in the cache.
+        """
+        with  self.__lock:
+            return  self._decode_value( OrderedDict.__getitem__( self ,key ) ,key )
+
+    def _decode_values(self) -> None:
+        """Unpickle all the serialized values that have not been read yet.
+        To be called while holding the lock before the values are iterated over.
+        """
+        for key in [ key for key ,val in OrderedDict.items( self ) if isinstance( val ,SerializedValue )]:
+            self._decode_value( OrderedDict.__getitem__( self ,key ) ,key )
+
+    def _release_value(self,
+            stored: Any ) -> None:
+        """Release what was stored in the dictionary for a value that is deleted or replaced.
+
+        Args:
+            stored      What was stored in the dictionary.
+        """
+        if  isinstance( stored ,ArenaSlot ):
+            with  self.__lock:
+                self.__arena.release( stored )
+
     def _evict_items_by_capacity(self) -> int:
         """Evict cache capacity based items.
-        To be called when we add an item to the cache.
+        To be called when we add an item to the cache.  The entry to evict is nominated by the eviction policy.
 
         Return:
             Number of evictions.
         """
         now = Cache.tsm_version()
-        with  Cache.CACHE_LOCK: # TODO: Not working!
+        with  self.__lock:
             try:
-                key ,value = super().popitem( last=False )  # FIFO
-                self.ttlSize -= self._get_size( value )
-
-                self._post_del(  key=key ,tsm=now ,eviction=True ,queue_out=True )
+                try:
+                    key = self.__policy.victim()
+                    if  not super().__contains__( key ):
+                        self.__policy.discard( key )    # NOTE: Stale nomination.
+                        raise KeyError( key )
+                    stored = super().pop( key )
+                except  KeyError:
+                    # NOTE: The policy is not tracking any entry.  Fallback to the least recently updated.
+                    key ,stored = super().popitem( last=False )
+                self._release_value( stored )
+
+                self._post_del(  key=key ,tsm=now ,eviction=True ,queue_out=not self.__localevict )
             except  KeyError:
                 # Someone else deleted the last item.  We are good.
                 pass
@@ -387,7 +1757,9 @@ class Cache( OrderedDict ):
             key: Any,
             tsm: int        | None = None,
             eviction: bool  | None = False,
-            queue_out: bool | None = True ) -> None:
+            queue_out: bool | None = True,
+            replicated: bool| None = False,
+            expired: bool   | None = False ) -> None:
         """Post deletion processing.  Update the metadata and internal metrics.
         Queue out the details if required.
 
@@ -396,63 +1768,144 @@ class Cache( OrderedDict ):
             tsm         Optional timestamp for the deletion.
             eviction    Originated from a cache eviction or deletion.
             queue_out   Request queuing out operation info to external receiver.
+            replicated  The deletion arrived from outside, such as from another member.
+            expired     The eviction is a ttl expiry.  Every member expire the entry on its own, so it is not dropped.
         """
         crc = None
         lkp = None
         elp = None
         if  tsm is None:
             tsm =  Cache.tsm_version()
-        elp = 0
-        try:
-            crc = self.__meta[ key ]['crc'] # Old crc value.
-            lkp = self.__meta[ key ]['lkp'] # Last looked up.
-            elp = tsm - lkp                 # Elapsed nano seconds.
-
-            # Get the change out to members ASAP.
-            if  self.__queue and queue_out:
-                opc = 'EVT' if eviction else 'DEL'
-                self.__queue.put((opc ,tsm ,self.__name ,key ,crc ,None ,None))
+        with  self.__lock:
+            self.__policy.discard( key )
+        with  self._key_lock( key ):
+            try:
+                ent = self.__meta[ key ]
+                crc = ent.crc                   # Old crc value.
+                lkp = ent.lkp                   # Last looked up.
+                elp = tsm - lkp                 # Elapsed nano seconds.
+                self.ttlSize -= ent.siz         # Size computed when the value was stored.
+
+                # Get the change out to members ASAP.
+                if  self.__queue and queue_out:
+                    opc = 'EVT' if eviction else 'DEL'
+                    self.__queue.put((opc ,tsm ,self.__name ,key ,crc ,None ,None))
+                    if  self.__debug:
+                        self._log_ops_msg( opc=opc ,tsm=tsm ,nms=self.__name ,key=key ,crc=crc ,msg='Queued.')
+
+                del self.__meta[ key ]
+
+                # Increment metrics.
+                if  eviction:
+                    self.evicts  += 1
+                    if  expired:
+                        self.expires += 1
+                    elif not (self.__queue and queue_out):
+                        self.localEvicts += 1
+                        self.__dropped[ key ] = tsm
+                        if  len( self.__dropped ) > self.__maxlen:
+                            _ = self.__dropped.popitem( last=False )
+                else:
+                    self.deletes += 1
+                    if  replicated:
+                        self.replDeletes += 1
+                self._set_spike()
+            except  KeyError:
+                # NOTE: Deleted from another thread.
                 if  self.__debug:
-                    self._log_ops_msg( opc=opc ,tsm=tsm ,nms=self.__name ,key=key ,crc=crc ,msg='Queued.')
-
-            del self.__meta[ key ]
-
-            # Increment metrics.
-            if  eviction:
-                self.evicts  += 1
-            else:
-                self.deletes += 1
-            self._set_spike()
-        except  KeyError:
-            # NOTE: Deleted from another thread.
-            if  self.__debug:
-                self.__logger.warning( f"Key '{key}' not found in cache '{self.__name}'.")
+                    self.__logger.warning( f"Key '{key}' not found in cache '{self.__name}'.")
 
         # Callback to notify a change in the cache.
         if  self.__callback and elp and elp < (self.__cbwindow * Cache.ONE_NS_SEC):
             # Type: 1=Deletion ,2=Update ,3=Incoherent
             # The key/value got changed since last read.
             arg = {'typ': CallbackType.DELETE ,'nms': self.__name ,'key': key ,'lkp': lkp ,'tsm': tsm ,'elp': elp ,'prvcrc': crc ,'newcrc': crc}
-            t1 = Thread( target=self.__callback ,args=[arg] ,name='PyCache' )
-            t1.start()  # NOTE: Launch and forget.
+            _ = self.__dispatcher.submit( self.__callback ,arg )
 
     def _post_get(self,
             key: Any    ) -> None:
-        """Post lookup processing.  Update the metadata.
+        """Post lookup processing.  Update the metadata and the eviction policy.
+        Reload the entry in the background if it is stale.
         """
         try:
-            self.__meta[ key ]['lkp'] = Cache.tsm_version() # Timestamp for the just lookup operation.
+            ent = self.__meta[ key ]
+            ent.lkp = Cache.tsm_version()   # Timestamp for the just lookup operation.
+            if  self.__loader and (self.__refresh or self.__xfetch):
+                self._check_refresh( key ,ent )
         except  KeyError:
             # NOTE: Deleted from another thread.
             if  self.__debug:
                 self.__logger.warning( f"Key '{key}' not found in cache '{self.__name}'.")
+        if  self.__policy.tracks_access:
+            with  self.__lock:
+                self.__policy.access( key )
+
+    def _check_refresh(self,
+            key: Any,
+            ent: CacheEntry ) -> None:
+        """Check if the just looked up entry is due for a background reload.
+        It is due once it is older than the `refresh` fraction of its ttl, or earlier by the XFetch probability of
+        `now - delta * beta * log( rand )  >= expiry` with the average loader latency as the delta.
+
+        Args:
+            key         Key to the entry that was looked up.
+            ent         Metadata of the entry.
+        """
+        ttl = ent.ttl or self.__ttl
+        if  not ttl:
+            return
+        hard = int( ttl * Cache.ONE_NS_SEC )
+        now  = ent.lkp
+        due  = bool( self.__refresh ) and now - ent.tsm >= hard * self.__refresh
+        if  not due and self.__xfetch:
+            dlt = self.__flight.loadInt or Cache.ONE_NS_SEC / 100   # NOTE: Guess 10ms before the first load.
+            due = now - dlt * self.__xfetch * math.log( 1.0 - random.random() ) >= ent.tsm + hard   # noqa: S311
+        if  due and not self.__flight.inflight( key ):
+            if  self.__refresher is None:
+                with  self.__lock:
+                    if  self.__refresher is None:
+                        self.__refresher = CallbackDispatcher( workers=1 ,backlog=self.__maxlen ,name=f'{self.__name} refresh')
+            # NOTE: Reload with the ttl as requested.  The jittered ttl would be jittered again and shrink on every refresh.
+            _ = self.__refresher.submit( self._refresh ,{'nms': self.__name ,'key': key ,'tsm': ent.tsm ,'ttl': ent.otl or None})
+
+    def _refresh(self,
+            arg: dict ) -> None:
+        """Reload a stale entry with the loader.  Called on the background refresher.
+
+        Args:
+            arg         Context of the entry to reload.  {'nms': name ,'key': key ,'tsm': tsm ,'ttl': ttl}
+        """
+        key = arg['key']
+
+        def updated() -> bool:
+            ent = self.__meta.get( key )
+            return  ent is not None and ent.tsm != arg['tsm']
+
+        def load() -> Any:
+            if  updated():
+                # NOTE: Updated since it was found stale.  A `get_or_load()` waiting on this flight get the current value.
+                with  self.__lock:
+                    if  OrderedDict.__contains__( self ,key ):
+                        return  self._decode_value( OrderedDict.__getitem__( self ,key ) ,key )
+            val = self.__loader( key )
+            self.__setitem__( key ,val ,ttl=arg['ttl'] )
+            self.refreshes += 1
+            return  val
+
+        if  not updated():
+            _ = self.__flight.do( key ,load )
 
     def _post_set(self,
             key: Any,
             value: Any,
             tsm: int        | None = None,
             update: bool    | None = True,
-            queue_out: bool | None = True ) -> None:
+            queue_out: bool | None = True,
+            size: int       | None = None,
+            crc: bytes      | None = None,
+            blob: SerializedValue | None = None,
+            ttl: float      | None = None,
+            otl: float      | None = None ) -> None:
         """Post insert/update processing.  Update the metadata and internal metrics.
         Queue out the details if required.
 
@@ -462,52 +1915,87 @@ class Cache( OrderedDict ):
             tsm         Optional timestamp for the deletion.
             update      Originated from a cache update or insert.
             queue_out   Request queuing out operation info to external receiver.
+            size        Optional size of the value that was set.  Computed with the sizer if not provided.
+            crc         Optional checksum of the value that was set.  Computed with the checksum if not provided.
+            blob        Optional serialized value to queue out in place of the value.
+            ttl         Optional time to live in seconds for this entry.  Default to the cache ttl.
+            otl         Optional time to live as requested, before the jitter.  Default to `ttl`.
         """
+        elp = 0
+        md5 = crc
+        prv = None
+        new = None  # New metadata to schedule for idle eviction.
         if  tsm is None:
             tsm =  Cache.tsm_version()
-        try:
-            if  key not in self.__meta:
-                self.__meta[ key ] = {'tsm': tsm ,'crc': None ,'lkp': 0}
-
-            crc = self.__meta[ key ]['crc'] # Old crc value.
-            lkp = self.__meta[ key ]['lkp'] # Last looked up.
-            elp = tsm - lkp                 # Elapsed nano seconds.
-            md5 = hashlib.md5( bytearray(str( value ) ,encoding='utf-8') ).digest()  # noqa: S324   New crc value.
-
-            # Get the change out to members ASAP.
-            if  self.__queue and queue_out:
-                opc = 'UPD' if update else 'INS'
-                self.__queue.put((opc ,tsm ,self.__name ,key ,md5 ,value ,None))
+        # NOTE: The instance lock is never taken while holding the key lock.  The ttl, capacity and bulk paths take the
+        #       instance lock first and then the key lock, so the instance locked bookkeeping is done after the key lock.
+        with  self._key_lock( key ):
+            try:
+                ent = self.__meta.get( key )
+                if  ent is None:
+                    ent = new = self.__meta[ key ] = CacheEntry( tsm=tsm )
+                    if  self.__dropped:
+                        _ = self.__dropped.pop( key ,None )
+                if  size is None:
+                    size = self._get_value_size( value ,blob )
+
+                prv = ent.crc                   # Old crc value.
+                lkp = ent.lkp                   # Last looked up.
+                elp = tsm - lkp                 # Elapsed nano seconds.
+                if  md5 is None:
+                    md5 = self._get_value_crc( value ,blob ,queue_out )    # New crc value.
+
+                # Get the change out to members ASAP.
+                if  self.__queue and queue_out:
+                    opc = 'UPD' if update else 'INS'
+                    msg = (opc ,tsm ,self.__name ,key ,md5 ,value if blob is None else blob ,None)
+                    self.__queue.put( msg + (ttl ,) if ttl else msg )  # NOTE: The per entry ttl trail the message.
+                    if  self.__debug:
+                        self._log_ops_msg( opc=opc ,tsm=tsm ,nms=self.__name ,key=key ,crc=md5 ,msg=f'{opc} Queued out from _post_set()')
+
+                ent.tsm = tsm
+                ent.crc = md5
+                self.ttlSize += size - ent.siz
+                ent.siz = size
+                ent.ttl = ttl or 0
+                ent.otl = (ttl if otl is None else otl) or 0
+
+                # Increment metrics.
+                if  update:
+                    self.updates += 1
+                else:
+                    self.inserts += 1
+                self._set_spike()
+            except  KeyError:
+                # NOTE: Deleted from another thread.
                 if  self.__debug:
-                    self._log_ops_msg( opc=opc ,tsm=tsm ,nms=self.__name ,key=key ,crc=md5 ,msg=f'{opc} Queued out from _post_set()')
-
-            self.__meta[ key ]['tsm'] = tsm
-            self.__meta[ key ]['crc'] = md5
+                    self.__logger.warning( f"Key '{key}' not found in cache '{self.__name}'.")
 
-            # Increment metrics.
+        if  new is not None and self.__tti:
+            self._schedule_idle( key ,new ,tsm )
+        if  ttl or self.__ttl:
+            self._schedule_expiry( key ,tsm ,ttl or self.__ttl )
+        with  self.__lock:
             if  update:
-                with  Cache.CACHE_LOCK: # TODO: Not working!
-                    try:
-                        self.move_to_end( key ,last=True )    # FIFO
-                    except  KeyError:
-                        # Someone else deleted the last item.  We are good.
-                        pass
-                self.updates += 1
-            else:
-                self.inserts += 1
-            self._set_spike()
-        except  KeyError:
-            # NOTE: Deleted from another thread.
-            if  self.__debug:
-                self.__logger.warning( f"Key '{key}' not found in cache '{self.__name}'.")
+                try:
+                    self.move_to_end( key ,last=True )    # FIFO
+                    self.__policy.update( key )
+                except  KeyError:
+                    # Someone else deleted the last item.  We are good.
+                    pass
+            elif super().__contains__( key ):
+                self.__policy.insert( key )
+
+        if  self.__flight.inflight( key ):
+            with  self.__arrival:
+                self.__arrival.notify_all()     # NOTE: Wake up the load that is waiting for this key.
 
         # Callback to notify a change in the cache.
         if  self.__callback and elp and elp < (self.__cbwindow * Cache.ONE_NS_SEC):
             # Type: 1=Deletion ,2=Update ,3=Incoherent
             # The key/value got changed since last read.
-            arg = {'typ': CallbackType.UPDATE ,'nms': self.__name ,'key': key ,'lkp': lkp ,'tsm': tsm ,'elp': elp ,'prvcrc': crc ,'newcrc': crc}
-            t1 = Thread( target=self.__callback ,args=[arg] ,name='PyCache' )
-            t1.start()  # NOTE: Launch and forget.
+            arg = {'typ': CallbackType.UPDATE ,'nms': self.__name ,'key': key ,'lkp': lkp ,'tsm': tsm ,'elp': elp ,'prvcrc': prv ,'newcrc': md5}
+            _ = self.__dispatcher.submit( self.__callback ,arg )
 
     def _set_spike(self,
             now: int | None = None ) -> None:
@@ -529,10 +2017,20 @@ class Cache( OrderedDict ):
 
     # Private OrderedDict magic/dunder methods overwrite section.
     #
+    def __contains__(self,
+            key: Any ) -> bool:
+        """Dict __contains__() dunder overwrite.
+        An expired but not yet reaped entry is not in the cache, the same as for the reads.
+
+        SEE:    dict.__contains__()
+        """
+        return  super().__contains__( key ) and not self._is_expired( key )
+
     def __delitem__(self,
             key: Any,
             tsm: int        | None = None,
-            queue_out: bool | None = True ) -> None:
+            queue_out: bool | None = True,
+            replicated: bool| None = False ) -> None:
         """Dict __delitem__() dunder overwrite.
         Check for ttl evict then call the parent method and then do some house keeping.
 
@@ -541,25 +2039,22 @@ class Cache( OrderedDict ):
             key         Key to the item to delete.
             tsm         Optional timestamp for the deletion.
             queue_out   Request queuing out operation info to external receiver.
+            replicated  The deletion arrived from outside.  Counted in `replDeletes`.
         Raise:
             KeyError
         """
         if  tsm is None:
             tsm =  Cache.tsm_version()
-        if  self.__ttl > 0:
+        if  (self.__expiry or self.__idle) and not self.__reaper:
             _ = self._evict_items_by_ttl()
 
         if  self.__debug:
-            crc = self.__meta[ key ]['crc'] if key in self.__meta else None
+            crc = self.__meta[ key ].crc if key in self.__meta else None
             self._log_ops_msg( opc='DEL' ,tsm=tsm ,nms=self.__name ,key=key ,crc=crc ,msg='Deleted via __delitem__()')
 
-        with  Cache.CACHE_LOCK: # TODO: Not working!
-            if  self.__contains__( key ):
-                size = self._get_size(super().__getitem__( key ))
-
-            super().__delitem__( key )
-            self.ttlSize -= size
-        self._post_del( key=key ,tsm=tsm ,eviction=False ,queue_out=queue_out )
+        with  self.__lock:
+            self._release_value( super().pop( key ))
+        self._post_del( key=key ,tsm=tsm ,eviction=False ,queue_out=queue_out ,replicated=replicated )
 
     def __getitem__(self,
             key: Any ) -> Any:
@@ -572,13 +2067,25 @@ class Cache( OrderedDict ):
         Raise:
             KeyError
         """
-        if  self.__ttl > 0:
+        if  (self.__expiry or self.__idle) and not self.__reaper:
             _ = self._evict_items_by_ttl()
         try:
-            val = super().__getitem__( key )
+            if  self.__arena is None:
+                val = super().__getitem__( key )
+                if  isinstance( val ,SerializedValue ):
+                    with  self.__lock:
+                        val = self._decode_value( super().__getitem__( key ) ,key )
+                elif isinstance( val ,CompressedValue ):
+                    val = self._decode_value( val )
+            else:
+                with  self.__lock:
+                    val = self._decode_value( super().__getitem__( key ))
         except:
             self.misses += 1
             raise
+        if  self.__reaper and self._is_expired( key ):
+            self.misses += 1
+            raise KeyError( key )   # NOTE: Expired but not yet reaped.
 
         self.lookups += 1
         self._post_get( key )
@@ -590,7 +2097,7 @@ class Cache( OrderedDict ):
 
         SEE:    dict.__iter__()
         """
-        if  self.__ttl > 0:
+        if  (self.__expiry or self.__idle) and not self.__reaper:
             _ = self._evict_items_by_ttl()
 
         return super().__iter__()   # Type: odict_iterator
@@ -599,7 +2106,9 @@ class Cache( OrderedDict ):
             key: Any,
             value: Any,
             tsm: int        | None = None,
-            queue_out: bool | None = True ) -> None:
+            queue_out: bool | None = True,
+            crc: bytes      | None = None,
+            ttl: float      | None = None ) -> None:
         """Dict __setitem__() dunder overwrite.
         Check for ttl evict then call the parent method and then do some house keeping.
 
@@ -609,31 +2118,38 @@ class Cache( OrderedDict ):
             value       Value of the item to set.
             tsm         Optional timestamp for the deletion.
             queue_out   Request queuing out operation info to external receiver.
+            crc         Optional precomputed checksum of the value.  Such as one that arrived along with the value.
+            ttl         Optional time to live in seconds for this entry.  Default to the cache ttl.
         """
         if  tsm is None:
             tsm =  Cache.tsm_version()
-        if  self.__ttl > 0:
+        if  (self.__expiry or self.__idle) and not self.__reaper:
             _ = self._evict_items_by_ttl()
 
+        blob: SerializedValue = self._get_value_blob( value ,queue_out )    # NOTE: Serialized once on the writing thread.
+        stored = self._encode_value( value ,blob )
+        size: int = self._get_stored_size( value ,blob ,stored )    # NOTE: Sized once and kept in the metadata for the delete/evict.
+        otl = ttl
+        ttl = self._get_entry_ttl( ttl ,queue_out )
+
         # NOTE: Very coarse way to check for eviction.  Not meant to be precise.
         while super().__len__()     > 0 and \
-            ((super().__len__() + 1 > self.__maxlen) or (self.ttlSize + sys.getsizeof( value ) > self.__maxsize)):
+            ((super().__len__() + 1 > self.__maxlen) or (self.ttlSize + size > self.__maxsize)):
                 _ = self._evict_items_by_capacity()
 
-        with  Cache.CACHE_LOCK: # TODO: Not working!
-            updmode: bool = self.__contains__( key )   # If exist we are in UPD mode ,else INS mode.
-            if  updmode:
-                self.ttlSize -= self._get_size( super().__getitem__( key )) # Decrement the previous object size.
-            super().__setitem__( key ,value )
-            self.ttlSize += self._get_size( super().__getitem__( key ))     # Increment the current  object size.
+        with  self.__lock:
+            updmode: bool = super().__contains__( key )    # If exist we are in UPD mode ,else INS mode.
+            if  updmode and self.__arena is not None:
+                self._release_value( super().__getitem__( key ))
+            super().__setitem__( key ,stored )
 
         if  self.__debug:
             opc = f"{'UPD' if updmode else 'INS'}"
             msg = f"{'Updated' if updmode else 'Inserted'} via __setitem__()."
-            crc = self.__meta[ key ]['crc'] if key in self.__meta else None
-            self._log_ops_msg( opc=opc ,tsm=tsm ,nms=self.__name ,key=key ,crc=crc ,msg=msg)
+            lcs = self.__meta[ key ].crc if key in self.__meta else None
+            self._log_ops_msg( opc=opc ,tsm=tsm ,nms=self.__name ,key=key ,crc=lcs ,msg=msg)
 
-        self._post_set( key=key ,value=value ,tsm=tsm ,update=updmode ,queue_out=queue_out )
+        self._post_set( key=key ,value=value ,tsm=tsm ,update=updmode ,queue_out=queue_out ,size=size ,crc=crc ,blob=blob ,ttl=ttl ,otl=otl or 0 )
 
     # Public dictionary methods section.
     #
@@ -645,6 +2161,12 @@ class Cache( OrderedDict ):
         Call the parent method and then do some house keeping.
         """
         super().clear()
+        self.__expiry.clear()
+        self.__idle.clear()
+        self.__dropped.clear()
+        if  self.__arena is not None:
+            self.__arena.clear()
+        self.__policy.clear()
         self.__oldest = Cache.tsm_version()
         self.__latest = Cache.tsm_version()
         self._reset_metrics()
@@ -655,10 +2177,10 @@ class Cache( OrderedDict ):
 
         SEE:    OrderedDict.copy()
         """
-        if  self.__ttl > 0:
+        if  (self.__expiry or self.__idle) and not self.__reaper:
             _ = self._evict_items_by_ttl()
 
-        with Cache.CACHE_LOCK:
+        with  self.__lock:
             return super().copy()   # Type: pycache.Cache
 
 #   @classmethod
@@ -666,6 +2188,76 @@ class Cache( OrderedDict ):
 #       ...
 #       No need to overwrite.
 
+    def evict_expired(self,
+            limit: int | None = None ) -> int:
+        """Evict the expired entries.  Meant to be called periodically by a background reaper.
+
+        Args:
+            limit       Optional maximum number of entries to evict in this call.
+                        Use it to keep each call, and the time the cache is locked, bounded.
+        Return:
+            Number of evictions.
+        """
+        if  not self.__expiry and not self.__idle:
+            return  0
+        return  self._evict_items_by_ttl( limit )
+
+    def has_expired(self,
+            tsm: int,
+            ttl: float | None = None ) -> bool:
+        """Check if an entry set at the origin timestamp have already out lived its time-to-live.
+        Use it to ignore an entry that arrive from outside after every member have expired it.
+
+        Args:
+            tsm         The origin timestamp of the entry.
+            ttl         Optional time to live in seconds of the entry.  Default to the cache ttl.
+        Return:
+            True if the entry is expired.
+        """
+        ttl = ttl or self.__ttl
+        return  ttl > 0 and tsm + int( ttl * Cache.ONE_NS_SEC ) < Cache.tsm_version()
+
+    def is_dropped(self,
+            key: Any ) -> bool:
+        """Check if the key was recently evicted locally only.  Such as for being idle or on capacity with `localevict`.
+        Such a key should not be requested back from the other members.  A ttl expiry is not a drop.
+
+        Args:
+            key         Key to check.
+        Return:
+            True if the key was locally evicted and have not been set since.
+        """
+        return  key in self.__dropped
+
+    def snapshot(self) -> list[tuple]:
+        """Take a snapshot of the live entries with their metadata to restore them elsewhere.
+        The values are exported pickled as stored, so the values that have not been read are not unpickled.
+        A value that cannot be pickled is left out.
+
+        Return:
+            List of `(key ,blob ,tsm ,crc ,ttl)` tuples.  Restore with `__setitem__( key ,SerializedValue( blob ) ,tsm ,False ,crc ,ttl )`.
+        """
+        ents = []
+        with  self.__lock:
+            for key ,stored in OrderedDict.items( self ):
+                ent = self.__meta.get( key )
+                if  ent is None or self._is_expired( key ):
+                    continue
+                if  isinstance( stored ,ArenaSlot ):
+                    blob = self.__arena.get( stored )
+                    blob = self._decompress( blob ) if stored.cmp else blob
+                elif isinstance( stored ,CompressedValue ):
+                    blob = self._decompress( stored )
+                elif isinstance( stored ,SerializedValue ):
+                    blob = bytes( stored )
+                else:
+                    try:
+                        blob = pickle.dumps( stored ,protocol=pickle.HIGHEST_PROTOCOL )
+                    except  (pickle.PicklingError ,TypeError ,AttributeError):
+                        continue    # NOTE: Cannot be restored.
+                ents.append((key ,blob ,ent.tsm ,ent.crc ,ent.ttl or None))
+        return  ents
+
     def get(self,
             key: Any,
             default: Any | None = None ) -> Any|None:
@@ -677,35 +2269,235 @@ class Cache( OrderedDict ):
             key         Key to the item to get.
             default     Default value to return if the key doesn't exist in the cache.
         """
-        if  self.__ttl > 0:
+        if  (self.__expiry or self.__idle) and not self.__reaper:
             _ = self._evict_items_by_ttl()
 
-        with Cache.CACHE_LOCK:
-            val = super().get( key ,default )
-        self.lookups += 1
+        with  self.__lock:
+            hit = super().__contains__( key )
+            val = self._decode_value( super().get( key ,default ) ,key if hit else None )
+        if  hit and self.__reaper and self._is_expired( key ):
+            hit = False
+            val = default   # NOTE: Expired but not yet reaped.
+
+        if  hit:
+            self.lookups += 1
+            self._post_get( key )
+        else:
+            self.misses  += 1
         return val
 
+    def get_many(self,
+            keys: Iterable[Any] ) -> dict:
+        """Get many items under one lock acquisition.
+        Check for ttl evict then call the parent method and then do some house keeping.
+
+        Args:
+            keys        Keys to the items to get.
+        Return:
+            Dictionary of the found keys and their values.  Keys that doesn't exist are left out.
+        """
+        if  (self.__expiry or self.__idle) and not self.__reaper:
+            _ = self._evict_items_by_ttl()
+
+        keys  = list( keys )
+        found = {}
+        with  self.__lock:
+            for key in keys:
+                if  super().__contains__( key ):
+                    found[ key ] = self._decode_value( super().__getitem__( key ) ,key )
+
+        if  self.__reaper:
+            now = Cache.tsm_version()
+            found = { key: val for key ,val in found.items() if not self._is_expired( key ,now )}   # NOTE: Expired but not yet reaped.
+
+        self.lookups += len( found )
+        self.misses  += len( keys ) - len( found )
+        for key in found:
+            self._post_get( key )
+        return found
+
+    def get_or_load(self,
+            key: Any,
+            loader: Callable[[Any] ,Any],
+            ttl: float | None = None ) -> Any:
+        """Get an item.  If doesn't exist load it with the loader and set it into the cache.
+        Only one thread per key call the loader.  The other threads that miss the same key wait for its result.
+        The loaded value is set through `__setitem__()` and queued out like any other change.
+        If a `claimer` is configured, it can defer the load to another party for a while.  If the key is not set by
+        then, the loader is called.
+
+        Args:
+            key         Key to the item to get.
+            loader      Function to call with the key to load the value.
+            ttl         Optional time to live in seconds for the loaded entry.  Default to the cache ttl.
+        Return:
+            The cached or loaded value.
+        Raise:
+            Any exception raised by the loader.
+        """
+        try:
+            return  self.__getitem__( key )
+        except  KeyError:
+            pass
+
+        def cached() -> bool:
+            return  OrderedDict.__contains__( self ,key ) and not self._is_expired( key )
+
+        def load() -> Any:
+            # NOTE: Another thread could had set it just before this load took off.
+            with  self.__lock:
+                if  cached():
+                    return  self._decode_value( OrderedDict.__getitem__( self ,key ) ,key )
+
+            wait = self.__claimer( self.__name ,key ) if self.__claimer else 0
+            if  wait and wait > 0:
+                with  self.__arrival:
+                    arrived = self.__arrival.wait_for( cached ,wait )
+                if  arrived:
+                    try:
+                        with  self.__lock:
+                            val = self._decode_value( OrderedDict.__getitem__( self ,key ) ,key )
+                        self.__flight.deferred += 1
+                        return  val
+                    except  KeyError:
+                        pass    # NOTE: Deleted from another thread.  Load it.
+                self.__flight.timeouts += 1
+
+            val = loader( key )
+            self.__setitem__( key ,val ,ttl=ttl )
+            return  val
+
+        val ,_ = self.__flight.do( key ,load )
+        return  val
+
+    def set(self,
+            key: Any,
+            value: Any,
+            ttl: float | None = None ) -> None:
+        """Set an item with an optional time to live of its own.
+
+        Args:
+            key         Key to the item to set.
+            value       Value of the item to set.
+            ttl         Optional time to live in seconds for this entry.  Default to the cache ttl.
+        """
+        self.__setitem__( key ,value ,ttl=ttl )
+
+    def set_many(self,
+            items: Mapping | Iterable[tuple[Any ,Any]],
+            tsm: int        | None = None,
+            queue_out: bool | None = True,
+            ttl: float      | None = None ) -> None:
+        """Insert or update many items under one lock acquisition and queue them out as one `BAT` batch.
+        The values are serialized, sized and checksummed before the lock is taken.
+
+        Args:
+            items       Mapping or iterable of key/value pairs to set.
+            tsm         Optional timestamp for all the items.
+            queue_out   Request queuing out operation info to external receiver.
+            ttl         Optional time to live in seconds for all the items.  Default to the cache ttl.
+        """
+        if  tsm is None:
+            tsm =  Cache.tsm_version()
+        if  (self.__expiry or self.__idle) and not self.__reaper:
+            _ = self._evict_items_by_ttl()
+
+        prep = []
+        for key ,value in (items.items() if isinstance( items ,Mapping ) else items):
+            blob = self._get_value_blob( value ,queue_out )
+            stored = self._encode_value( value ,blob )
+            prep.append((key ,value ,blob ,self._get_stored_size( value ,blob ,stored ) ,self._get_value_crc( value ,blob ,queue_out ) ,self._get_entry_ttl( ttl ,queue_out ) ,stored))
+
+        batch: dict = {}
+        with  self.__lock:
+            # NOTE: Very coarse way to check for eviction.  Not meant to be precise.
+            cnt = len({ p[0] for p in prep } - self.__meta.keys())
+            siz = sum( p[3] for p in prep )
+            while super().__len__()     > 0 and \
+                ((super().__len__() + cnt > self.__maxlen) or (self.ttlSize + siz > self.__maxsize)):
+                    _ = self._evict_items_by_capacity()
+
+            for key ,value ,blob ,size ,crc ,ent_ttl ,stored in prep:
+                updmode: bool = super().__contains__( key )    # If exist we are in UPD mode ,else INS mode.
+                if  updmode and self.__arena is not None:
+                    self._release_value( super().__getitem__( key ))
+                super().__setitem__( key ,stored )
+                self._post_set( key=key ,value=value ,tsm=tsm ,update=updmode ,queue_out=False ,size=size ,crc=crc ,ttl=ent_ttl ,otl=ttl or 0 )
+                batch[ key ] = ('UPD' if updmode else 'INS' ,key ,tsm ,crc ,value if blob is None else blob ,ent_ttl)
+
+            # NOTE: The batch alone is over the capacity.  Its earliest items are evicted and queued out as such.
+            while super().__len__() > self.__maxlen or (super().__len__() > 1 and self.ttlSize > self.__maxsize):
+                _ = self._evict_items_by_capacity()
+
+        if  self.__debug:
+            self._log_ops_msg( opc='BAT' ,tsm=tsm ,nms=self.__name ,key=None ,crc=None ,msg=f'Set {len( batch )} items via set_many().')
+
+        if  self.__queue and queue_out and batch:
+            self.__queue.put(('BAT' ,tsm ,self.__name ,None ,None ,[ b for b in batch.values() if b[1] in self.__meta ] ,None))
+
+    def delete_many(self,
+            keys: Iterable[Any],
+            tsm: int        | None = None,
+            queue_out: bool | None = True,
+            replicated: bool| None = False ) -> int:
+        """Delete many items under one lock acquisition and queue them out as one `BAT` batch.
+        Keys that doesn't exist are ignored.
+
+        Args:
+            keys        Keys to the items to delete.
+            tsm         Optional timestamp for the deletion.
+            queue_out   Request queuing out operation info to external receiver.
+            replicated  The deletions arrived from outside.  Counted in `replDeletes`.
+        Return:
+            Number of deleted items.
+        """
+        if  tsm is None:
+            tsm =  Cache.tsm_version()
+        if  (self.__expiry or self.__idle) and not self.__reaper:
+            _ = self._evict_items_by_ttl()
+
+        batch: list = []
+        with  self.__lock:
+            for key in keys:
+                if  super().__contains__( key ):
+                    ent = self.__meta.get( key )
+                    self._release_value( super().pop( key ))
+                    self._post_del( key=key ,tsm=tsm ,eviction=False ,queue_out=False ,replicated=replicated )  # NOTE: Queued out below as one batch.
+                    batch.append(('DEL' ,key ,tsm ,ent.crc if ent else None ,None ,None))
+
+        if  self.__debug:
+            self._log_ops_msg( opc='BAT' ,tsm=tsm ,nms=self.__name ,key=None ,crc=None ,msg=f'Deleted {len( batch )} items via delete_many().')
+
+        if  self.__queue and queue_out and batch:
+            self.__queue.put(('BAT' ,tsm ,self.__name ,None ,None ,batch ,None))
+        return  len( batch )
+
     def items(self) -> ItemsView[Any]:
         """Return a set-like object providing a view on cache's items.
         Check for ttl evict then call the parent method.
+        The values kept in the arena or compressed are decoded as the view is iterated over.
 
         SEE:    OrderedDict.items()
         """
-        if  self.__ttl > 0:
+        if  (self.__expiry or self.__idle) and not self.__reaper:
             _ = self._evict_items_by_ttl()
 
-        with Cache.CACHE_LOCK:
+        if  self.__arena is not None or self.__compress is not None:
+            return  DecodedItemsView( self )
+        with  self.__lock:
+            self._decode_values()
             return super().items()  # Type: odict_items
 
     def keys(self) -> KeysView[Any]:
         """Return a set-like object providing a view on cache's keys.
+        With the background reaper, the expired entries that are not reaped yet are still in the view and in `len()`.
 
         SEE:    OrderedDict.keys()
         """
-        if  self.__ttl > 0:
+        if  (self.__expiry or self.__idle) and not self.__reaper:
             _ = self._evict_items_by_ttl()
 
-        with Cache.CACHE_LOCK:
+        with  self.__lock:
             return super().keys()   # TYPE: odict_keys
 
     def pop(self,
@@ -720,15 +2512,17 @@ class Cache( OrderedDict ):
             key         Key to the item to get.
             default     Default value to return if the key doesn't exist in the cache.
         """
-        if  self.__ttl > 0:
+        if  (self.__expiry or self.__idle) and not self.__reaper:
             _ = self._evict_items_by_ttl()
 
         if  self.__debug:
-            crc = self.__meta[ key ]['crc'] if  key in self.__meta  and 'crc' in self.__meta[ key ] else None
+            crc = self.__meta[ key ].crc if  key in self.__meta else None
             self._log_ops_msg( opc='POP' ,tsm=None ,nms=self.__name ,key=key ,crc=crc ,msg='In pop()')
 
-        with  Cache.CACHE_LOCK: # TODO: Not working!
-            val = super().pop( key ,default )
+        with  self.__lock:
+            stored = super().pop( key ,default )
+            val = self._decode_value( stored )
+            self._release_value( stored )
 
         self._post_del( key=key ,eviction=False ,queue_out=True )
         return val
@@ -744,14 +2538,16 @@ class Cache( OrderedDict ):
             last        True is LIFO ,False is FIFO
             default     Default value to return if the key doesn't exist in the cache.
         """
-        if  self.__ttl > 0:
+        if  (self.__expiry or self.__idle) and not self.__reaper:
             _ = self._evict_items_by_ttl()
 
-        with  Cache.CACHE_LOCK: # TODO: Not working!
-            key ,val = super().popitem( last )
+        with  self.__lock:
+            key ,stored = super().popitem( last )
+            val = self._decode_value( stored )
+            self._release_value( stored )
 
         if  self.__debug:
-            crc = self.__meta[ key ]['crc'] if  key in self.__meta  and 'crc' in self.__meta[ key ] else None
+            crc = self.__meta[ key ].crc if  key in self.__meta else None
             self._log_ops_msg( opc='POPI' ,tsm=None ,nms=self.__name ,key=key ,crc=crc ,msg='In popitem()')
 
         self._post_del( key=key ,eviction=False ,queue_out=True )
@@ -770,50 +2566,46 @@ class Cache( OrderedDict ):
             key         Key to the item to get.
             default     Default value to return if the key doesn't exist in the cache.
         """
-        if  self.__ttl > 0:
+        if  (self.__expiry or self.__idle) and not self.__reaper:
             _ = self._evict_items_by_ttl()
 
         if  self.__debug:
-            crc = self.__meta[ key ]['crc'] if key in self.__meta and 'crc' in self.__meta[ key ] else None
+            crc = self.__meta[ key ].crc if key in self.__meta else None
             self._log_ops_msg( opc='SETD' ,tsm=None ,nms=self.__name ,key=key ,crc=crc ,msg='In setdefault()')
 
-        with Cache.CACHE_LOCK:
-            return super().setdefault( key ,default )
+        with  self.__lock:
+            return self._decode_value( super().setdefault( key ,default ) ,key )
 
     def update(self,
             iterable: Iterable[Any] ) -> None:
         """Update the cache with new values.
         Check for ttl evict then call the parent method and then do some house keeping.
 
+        The changes are queued out as one `BAT` batch.  SEE: set_many()
+
         SEE:    dict.update()
         Args:
-            iterable    A list of key/value pairs to update the cache with.
+            iterable    A mapping or a list of key/value pairs to update the cache with.
         """
-        if  self.__ttl > 0:
-            _ = self._evict_items_by_ttl()
-
-        with  Cache.CACHE_LOCK: # TODO: Not working!
-            updates = {}
-            for key ,val in iterable.items():
-                updates[ key ] = {'val': val ,'upd': self.__contains__( key )}    # If exist we are in UPD mode ,else INS mode.
-                if  self.__debug:
-                    crc = self.__meta[ key ]['crc'] if  key in self.__meta  and 'crc' in self.__meta[ key ] else None
-                    self._log_ops_msg( opc='UPDT' ,tsm=None ,nms=self.__name ,key=key ,crc=crc ,msg='In update()')
+        if  self.__debug:
+            self._log_ops_msg( opc='UPDT' ,tsm=None ,nms=self.__name ,key=None ,crc=None ,msg='In update()')
 
-            super().update( iterable )
-            for key ,val in updates.items():
-                self._post_set( key ,val['val'] ,update=val['upd'] ,queue_out=True )
+        self.set_many( iterable )
 
     def values(self) -> ValuesView[Any]:
         """Return an object providing a view on cache's values.
         Check for ttl evict then call the parent method.
+        The values kept in the arena or compressed are decoded as the view is iterated over.
 
         SEE:    OrderedDict.values()
         """
-        if  self.__ttl > 0:
+        if  (self.__expiry or self.__idle) and not self.__reaper:
             _ = self._evict_items_by_ttl()
 
-        with Cache.CACHE_LOCK:
+        if  self.__arena is not None or self.__compress is not None:
+            return  DecodedValuesView( self )
+        with  self.__lock:
+            self._decode_values()
             return super().values() # TYPE: odict_values
 
 
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+#
+# Benchmark the throughput of the local cache as the number of namespaces and
+# application threads scale up.  No cluster traffic is involved, so this only
+# measure the contention on the cache locks.
+#
+# Usage:
+#   benchmark_locking                       # Default: 4 namespaces ,8 threads.
+#   benchmark_locking -n 8 -t 16 -s 64      # 8 namespaces ,16 threads ,64 lock stripes.
+
+import argparse
+import random
+import threading
+import time
+
+from pycache import Cache
+
+DURATION = 2.0  # Seconds per measurement.
+KEYSPACE = 1000 # Number of distinct keys per namespace.
+
+
+def worker(caches ,stop ,counts ,idx):
+    rnd = random.Random( idx )
+    ops = 0
+    while not stop.is_set():
+        cache = caches[ rnd.randrange( len( caches ))]
+        key = rnd.randrange( KEYSPACE )
+        if  rnd.random() < 0.2:
+            cache[ key ] = ops
+        else:
+            cache.get( key )
+        ops += 1
+    counts[ idx ] = ops
+
+
+def measure(namespaces ,threads ,stripes) -> float:
+    caches = [ Cache( name=f"bench{n}" ,max=KEYSPACE * 2 ,stripes=stripes ) for n in range( namespaces )]
+    stop   = threading.Event()
+    counts = [0] * threads
+    pool   = [ threading.Thread( target=worker ,args=(caches ,stop ,counts ,i)) for i in range( threads )]
+
+    for t in pool:
+        t.start()
+    time.sleep( DURATION )
+    stop.set()
+    for t in pool:
+        t.join()
+
+    return sum( counts ) / DURATION
+
+
+def main():
+    parser = argparse.ArgumentParser( description='Benchmark the cache locking throughput.')
+    parser.add_argument('-n' ,'--namespaces' ,type=int ,default=4 ,help='Maximum number of cache namespaces.')
+    parser.add_argument('-t' ,'--threads'    ,type=int ,default=8 ,help='Maximum number of application threads.')
+    parser.add_argument('-s' ,'--stripes'    ,type=int ,default=0 ,help='Number of key lock stripes per cache.')
+    args = parser.parse_args()
+
+    print(f"{'Namespaces':>10} {'Threads':>8} {'Ops/sec':>12}")
+    n = 1
+    while n <= args.namespaces:
+        t = 1
+        while t <= args.threads:
+            print(f"{n:>10} {t:>8} {measure( n ,t ,args.stripes ):>12,.0f}")
+            t *= 2
+        n *= 2
+
+
+if __name__ == '__main__':
+    main()
+
+# The MIT License (MIT)
+# Copyright (c) 2023 Edward Lau.
+#
+# Permission is hereby granted ,free of charge ,to any person obtaining a copy
+# of this software and associated documentation files (the "Software") ,to deal
+# in the Software without restriction ,including without limitation the rights
+# to use ,copy ,modify ,merge ,publish ,distribute ,sublicense ,and/or sell
+# copies of the Software ,and to permit persons to whom the Software is
+# furnished to do so ,subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS" ,WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED ,INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY ,FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT.
+# IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM,
+# DAMAGES OR OTHER LIABILITY ,WHETHER IN AN ACTION OF CONTRACT ,TORT OR
+# OTHERWISE ,ARISING FROM ,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE
+# OR OTHER DEALINGS IN THE SOFTWARE.
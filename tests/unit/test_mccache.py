@@ -12,6 +12,7 @@ import  pytest
 import  queue
 import  struct
 import  threading
+import  time
 import  unittest.mock   as  mock
 
 from    collections.abc     import Callable
@@ -350,6 +351,251 @@ class   TestClass:
 #       lcs =   None
 #       mccache._process_UPD(   nms ,key ,tsm ,lts ,opc ,crc ,lcs ,val ,sdr )
 
+    def test_private_opcode_02(self):
+        """Test the batch Op Code is applied with a collision check per entry.
+        """
+        import  mccache
+        c   =   mccache.get_cache('batch')
+        nms =   c.name
+        tsm =   PyCache.tsm_version()
+
+        c.__setitem__('k1' ,'old' ,tsm     ,False)
+        c.__setitem__('k2' ,'new' ,tsm +10 ,False)
+        c.__setitem__('k3' ,'del' ,tsm     ,False)
+        mccache._mcPending[(nms ,'k1' ,tsm)] = {'tsm': tsm ,'crc': None ,'members': {'10.0.0.1': None}}
+
+        val = [ (mccache.OpCode.UPD ,'k1' ,tsm +5 ,None ,'k1 batched')
+               ,(mccache.OpCode.UPD ,'k2' ,tsm +5 ,None ,'k2 batched')
+               ,(mccache.OpCode.INS ,'k4' ,tsm +5 ,None ,mccache.SerializedValue( pickle.dumps('k4 batched')))
+               ,(mccache.OpCode.DEL ,'k3' ,tsm +5 ,None ,None)]
+        mccache._process_BAT( nms ,None ,tsm +5 ,None ,mccache.OpCode.BAT ,None ,None ,val ,'10.0.0.1' )
+
+        assert  c['k1'] == 'k1 batched' ,f"Expect   k1 batched ,but actual is {c['k1']}"
+        assert  c['k2'] == 'new'        ,f"Expect   new     ,but actual is {c['k2']}"
+        assert  c['k4'] == 'k4 batched' ,f"Expect   k4 batched ,but actual is {c['k4']}"
+        assert 'k3' not in c            ,"Expect k3 to be deleted."
+        assert (nms ,'k1' ,tsm) not in mccache._mcPending ,"Expect the older pending ack to be invalidated."
+
+    def test_private_opcode_03(self):
+        """Test the claim Op Code defer the load to the claimant.
+        """
+        import  mccache
+        nms =   'claim'
+        tsm =   PyCache.tsm_version()
+
+        mccache._process_CLM( nms ,'k1' ,tsm ,None ,mccache.OpCode.CLM ,None ,None ,None ,'mbr1' )
+        assert (nms ,'k1') in mccache._mcClaims ,"Expect the claim to be recorded."
+        a = mccache._claim_load( nms ,'k1' )
+        assert  0 < a <= mccache._mcConfig.claim_timeout ,f"Expect to wait ,but actual is {a}"
+        a = mccache._claim_load( nms ,'k2' )
+        assert  a == 0              ,f"Expect   0       ,but actual is {a}"
+
+        # Claimant left the group.
+        mccache._process_BYE( None ,None ,tsm ,None ,mccache.OpCode.BYE ,None ,None ,None ,'mbr1' )
+        assert (nms ,'k1') not in mccache._mcClaims ,"Expect the claim to be dropped."
+
+    def test_wire_01(self):
+        """Test the cached values travel as raw pickled bytes and arrive to be unpickled on their first read.
+        """
+        import  mccache
+        from    pycache import SerializedValue
+        tsm = PyCache.tsm_version()
+        mbr = {'10.0.0.1': None ,'10.0.0.2': None}
+
+        def roundtrip( val_t: tuple ,magic: int ) -> tuple:
+            ack = mccache._make_pending_ack(('wire' ,'k1' ,tsm) ,val_t ,mbr ,mccache._mcConfig.packet_mtu )
+            for frg_b in ack['message']:
+                frg_b = bytes([ magic ]) + frg_b[1:]
+                aky_t = mccache._collect_fragment( frg_b ,'10.0.0.1')
+            return  mccache._assemble_message( aky_t )[1]
+
+        blob = pickle.dumps({'a': 1})
+        assert  b'pycache' not in pickle.dumps(('UPD' ,None ,blob)) ,"Expect no pycache class on the wire."
+        val_o = roundtrip(( mccache.OpCode.UPD ,None ,blob ,60 ) ,mccache.MAGIC_BYTE )
+        assert  isinstance( val_o[2] ,SerializedValue ) and val_o[3] == 60 ,f"Expect a SerializedValue ,but actual is {val_o}"
+        val_o = roundtrip(( mccache.OpCode.BAT ,None ,[( mccache.OpCode.INS ,'k2' ,tsm ,None ,blob ) ,( mccache.OpCode.DEL ,'k3' ,tsm ,None ,None )]) ,mccache.MAGIC_BYTE )
+        assert  isinstance( val_o[2][0][4] ,SerializedValue ) and val_o[2][1][4] is None ,f"Expect the batched values wrapped ,but actual is {val_o}"
+        val_o = roundtrip(( mccache.OpCode.UPD ,None ,{'a': 1}) ,mccache.MAGIC_BYTE1 )
+        assert  val_o[2] == {'a': 1}    ,f"Expect the value of an older member as is ,but actual is {val_o}"
+
+    def test_batch_01(self):
+        """Test the batch split keep an oversize entry in its place and size the entries off their serialized value.
+        """
+        import  mccache
+        from    pycache import SerializedValue
+        tsm = PyCache.tsm_version()
+        mbr = {'10.0.0.1': None ,'10.0.0.2': None}
+        big = SerializedValue( pickle.dumps('x' * 300 ))
+        ents= [ (mccache.OpCode.INS ,'k1' ,tsm ,None ,SerializedValue( pickle.dumps( 1 )))
+               ,(mccache.OpCode.UPD ,'k2' ,tsm ,None ,big ,60)
+               ,(mccache.OpCode.DEL ,'k1' ,tsm ,None ,None)]
+        with mock.patch.object( mccache ,'BATCH_SIZE' ,200 ) ,mock.patch.object( mccache ,'_mcPending' ,{} ) as pnd ,\
+             mock.patch.object( mccache.pickle ,'dumps' ,wraps=pickle.dumps ) as dmp:
+            frgs = mccache._queue_batches('batch' ,tsm ,ents ,mbr )
+            ent = [ c.args[0] for c in dmp.call_args_list if isinstance( c.args[0] ,tuple ) and c.args[0][1:2] == ('k2' ,) and big in c.args[0]]
+            assert  not ent             ,"Expect the entry to be sized off its serialized value and not pickled whole."
+            assert  list( pnd.keys() ) == [('batch' ,None ,tsm) ,('batch' ,'k2' ,tsm) ,('batch' ,None ,tsm +1)] ,f"Expect the oversize entry in its place ,but actual is {list( pnd.keys() )}"
+            assert  len( frgs ) == sum( len( p['message'] ) for p in pnd.values() ) ,"Expect the fragments of every message."
+
+            _ = mccache._queue_batches('batch' ,tsm ,ents[:1] ,mbr )    # NOTE: Another batch at the same nano second.
+            assert  len( pnd ) == 4     ,f"Expect a distinct pending batch ,but actual is {list( pnd.keys() )}"
+
+    def test_private_opcode_04(self):
+        """Test an entry that arrive already expired from its origin timestamp is ignored.
+        """
+        import  mccache
+        c   =   mccache.get_cache('expired')
+        nms =   c.name
+        tsm =   PyCache.tsm_version() - 2 * PyCache.ONE_NS_SEC
+
+        mccache._process_UPD( nms ,'k1' ,tsm ,None ,mccache.OpCode.UPD ,None ,None ,'k1 expired' ,'10.0.0.1' ,1 )
+        mccache._process_UPD( nms ,'k2' ,tsm ,None ,mccache.OpCode.UPD ,None ,None ,'k2 live'    ,'10.0.0.1' ,60 )
+        val = [ (mccache.OpCode.UPD ,'k3' ,tsm ,None ,'k3 expired' ,1)]
+        mccache._process_BAT( nms ,None ,tsm ,None ,mccache.OpCode.BAT ,None ,None ,val ,'10.0.0.1' )
+
+        assert 'k1' not in c            ,"Expect the expired k1 to be ignored."
+        assert  c['k2'] == 'k2 live'    ,f"Expect   k2 live ,but actual is {c.get('k2')}"
+        assert 'k3' not in c            ,"Expect the expired batched k3 to be ignored."
+
+    def test_agent_01(self ,tmp_path):
+        """Test a cache proxied to the host agent over its Unix domain socket.
+        """
+        import  mccache
+        path =  str( tmp_path / 'agent.sock' )
+        with mock.patch.object( mccache._mcConfig ,'agent_socket' ,path ):
+            t = threading.Thread( target=mccache._agent ,args=(path ,) ,daemon=True )
+            t.start()
+            while not os.path.exists( path ):
+                time.sleep( 0.01 )
+            mccache._mcAgent.sock = None
+            assert  os.stat( path ).st_mode & 0o777 == 0o600 ,"Expect the socket to be accessible to the user only."
+
+            p = mccache.McCacheProxy('agent')
+            p['k1'] = 1
+            p.set('k2' ,2 ,ttl=60 )
+            c = mccache.get_cache('agent')
+            assert  c['k1'] == 1        ,"Expect the agent to own the entry."
+            assert  c.metadata['k2']['ttl'] == 60 ,f"Expect   60      ,but actual is {c.metadata['k2']['ttl']}"
+            assert  p['k2'] == 2 and 'k1' in p and len( p ) == 2 ,"Expect the proxy to read the agent's cache."
+            assert  sorted( p.keys() ) == ['k1' ,'k2'] ,f"Expect   [k1 ,k2] ,but actual is {p.keys()}"
+
+            del p['k1']
+            with pytest.raises( KeyError ):
+                _ = p['k1']             # NOTE: The agent's exception is raised in the client.
+            a = p.get_or_load('k3' ,lambda k: f"loaded {k}" )
+            assert  a == 'loaded k3' and c['k3'] == 'loaded k3' ,f"Expect   loaded k3 ,but actual is {a}"
+            assert  p.metrics()['agent']['count'] == 2 ,"Expect the agent's metrics."
+            with mock.patch.object( mccache._mcConfig ,'claim_timeout' ,1.0 ):
+                assert  p._call('claim' ,'k4') == 0 ,"Expect the first local claim to be granted."
+                assert  p._call('claim' ,'k4') > 0  ,"Expect the later local callers to wait for the claimed load."
+                p['k4'] = 4
+                assert  p._call('claim' ,'k4') == 0 ,"Expect the claim to be released once the value is set."
+                assert  p._call('claim' ,'k5') == 0 ,"Expect the first local claim to be granted."
+                with mock.patch.object( mccache.McCacheProxy ,'__contains__' ,return_value=True ):
+                    # NOTE: The entry went away between a check and a get.  It must not be returned as None.
+                    a = p.get_or_load('k5' ,lambda k: f"loaded {k}" )
+                assert  a == 'loaded k5'    ,f"Expect   loaded k5 ,but actual is {a}"
+            mccache._mcAgent.sock.close()
+            mccache._mcAgent.sock = None
+
+        with mock.patch.object( mccache._mcConfig ,'agent_mode' ,mccache.McCacheAgentMode.CLIENT ):
+            with mock.patch.object( mccache ,'_agent_request' ,return_value={} ) as req:
+                mccache.clear_cache('agent')
+                mccache.get_cluster_metrics('agent')
+                mccache.get_cluster_checksum('agent' ,'k2')
+                mccache.get_local_checksum('agent' ,'k2')
+            mtds = [ c.args[0][0] for c in req.call_args_list ]
+            assert  mtds == ['clear_cache' ,'cluster_metrics' ,'cluster_checksum' ,'checksum'] ,f"Expect the calls forwarded to the agent ,but actual is {mtds}"
+        assert  all( mtd in mccache.AGENT_CALLS for mtd in mtds ) ,"Expect the agent to serve the forwarded calls."
+        obq = queue.Queue()
+        with mock.patch.object( mccache ,'_mcOBQueue' ,obq ):
+            assert  mccache._agent_call(('clear_cache' ,'agent' ,(None ,) ,{})) == (True ,None) ,"Expect the agent to clear the cluster."
+            assert  obq.get()[0] == mccache.OpCode.RST ,"Expect the agent to queue the clear into the cluster."
+        ok ,val = mccache._agent_call(('checksum' ,'agent' ,('k2' ,) ,{}))
+        assert  ok and val == mccache._get_local_checksum('agent' ,'k2') ,f"Expect the agent's checksum ,but actual is {val}"
+
+        pdir =  tmp_path / 'open'
+        pdir.mkdir()
+        pdir.chmod( 0o777 )
+        mccache._agent( str( pdir / 'agent.sock' ))   # NOTE: Return after logging the error.
+        assert  not os.path.exists( pdir / 'agent.sock' ) ,"Expect no socket in a directory writable by others."
+
+    def test_snapshot_01(self ,tmp_path):
+        """Test the snapshot on exit and the warm up on start.
+        """
+        import  mccache
+        from    pycache import SerializedValue
+        path =  str( tmp_path / 'mccache.snp' )
+        c = mccache.get_cache('snapshot')
+        c['k1'] = {'a': 1}
+        c.set('k2' ,[2] ,ttl=60 )
+        tsm = c.metadata['k1']['tsm']
+        crc = c.metadata['k1']['crc']
+        assert  mccache._snapshot( path ) >= 2 ,"Expect the entries to be snapshot."
+        assert  not os.path.exists( f"{path}.{os.getpid()}.tmp" ) ,"Expect the temporary file to be replaced."
+
+        c.__setitem__( threading.Lock() ,0 ,None ,False )   # NOTE: A key that cannot be pickled.  Not multicast.
+        assert  mccache._snapshot( str( tmp_path / 'fail.snp' )) == 0 ,"Expect the failure to be logged."
+        assert  os.listdir( tmp_path ) == ['mccache.snp'] ,f"Expect no file left behind ,but actual is {os.listdir( tmp_path )}"
+
+        c.clear()
+        assert  mccache._warm_up( path ) >= 2 ,"Expect the entries to be restored."
+        assert  isinstance( dict.__getitem__( c ,'k1' ) ,SerializedValue ) ,"Expect the value unpickled on its first read."
+        assert  c['k1'] == {'a': 1} and c['k2'] == [2] ,"Expect the restored values."
+        assert  c.metadata['k1']['tsm'] == tsm and c.metadata['k1']['crc'] == crc ,"Expect the original tsm and crc."
+        assert  c.metadata['k2']['ttl'] == 60 ,f"Expect   60      ,but actual is {c.metadata['k2']['ttl']}"
+        assert  mccache._warm_up( str( tmp_path / 'none.snp' )) == 0 ,"Expect no snapshot to be ignored."
+
+        obq = queue.Queue()
+        with mock.patch.object( mccache ,'_mcOBQueue' ,obq ):
+            val = {'k1': {'tsm': tsm + 1 ,'crc': b'newer'} ,'k2': {'tsm': tsm - 1 ,'crc': c.metadata['k2']['crc']}}
+            mccache._process_SYC('snapshot' ,None ,tsm ,None ,'SYC' ,None ,None ,val ,'10.0.0.1')
+            assert  obq.qsize() == 1    ,f"Expect   1       ,but actual is {obq.qsize()}"
+            opc ,_ ,nms ,key ,*_ = obq.get()
+            assert  (opc ,key) == (mccache.OpCode.REQ ,'k1') ,"Expect only the entry newer than the snapshot to be requested."
+
+    def test_cached_01(self):
+        """Test the memoization decorator.
+        """
+        import  asyncio
+        import  mccache
+        calls = []
+
+        @mccache.cached('cached.test' ,ttl=60)
+        def square( x ,y=0 ):
+            calls.append(( x ,y ))
+            return  x * x + y
+
+        assert  square( 3 ) == 9        ,"Expect 9."
+        assert  square( 3 ) == 9        ,"Expect 9 from the cache."
+        assert  square( 3 ,y=1 ) == 10  ,"Expect 10."
+        assert  calls == [(3 ,0) ,(3 ,1)] ,f"Expect two calls ,but actual is {calls}"
+        m = square.metrics()
+        assert  m['hits'] == 1 and m['misses'] == 2 ,f"Expect 1 hit and 2 misses ,but actual is {m}"
+        k = mccache._make_cached_key( square.__qualname__ ,(3 ,) ,{})
+        assert  mccache.get_cache('cached.test').metadata[ k ]['ttl'] == 60 ,"Expect the per function ttl."
+        k = mccache._make_cached_key( None ,([1 ,2] ,) ,{})
+        assert  isinstance( k ,bytes ) and len( k ) == 16 ,"Expect a digest for unhashable arguments."
+
+        @mccache.cached()
+        async def cube( x ):
+            calls.append( x )
+            await asyncio.sleep( 0.05 )
+            return  x ** 3
+
+        async def main():
+            return  await asyncio.gather( *[ cube( 2 ) for _ in range( 5 )])
+
+        assert  asyncio.run( main() ) == [8] * 5 ,"Expect 8 for all."
+        assert  calls.count( 2 ) == 1   ,f"Expect one call ,but actual is {calls}"
+        m = cube.metrics()
+        assert  m['hits'] == 4 and m['misses'] == 1 ,f"Expect 4 hits and 1 miss ,but actual is {m}"
+
+        with mock.patch.object( PyCache ,'__contains__' ,return_value=True ):
+            # NOTE: The entry went away between a check and a get.  It must not be returned as a cached None.
+            assert  asyncio.run( cube( 3 )) == 27 ,"Expect a miss to reload, not a cached None."
+        assert  cube.metrics()['misses'] == 2 ,f"Expect 2 misses ,but actual is {cube.metrics()}"
+
 
     #   Parameterized test with different input values to tests.  Much cleaner than for loops.
     @pytest.mark.parametrize("input1 ,expect" ,[(1 ,1) ,(2 ,2) ,(3 ,3)] )
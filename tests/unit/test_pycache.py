@@ -3,16 +3,20 @@
 # SEE:  https://docs.pytest.org/en/7.4.x/explanation/anatomy.html
 # SEE:  https://realpython.com/pytest-python-testing
 
+import asyncio
 import hashlib
 import logging
+import pickle
 import queue
+import random
+import threading
 import time
 
 import pytest
 
 from collections import OrderedDict
 from datetime import datetime ,timezone
-from pycache import Cache
+from pycache import Arena ,ArenaSlot ,Cache ,CallbackDispatcher ,CompressedValue ,SerializedValue
 
 # SEE: https://docs.python.org/3/library/stdtypes.html#dict
 #
@@ -423,6 +427,606 @@ class   TestCache:
         with pytest.raises(KeyError ,match=r'k1'):
             _ = c['k1'] # Should be evicted.
 
+    def test_eviction_02(self):
+        c = Cache( ttl=1 )   # Expiry is ordered by the entry timestamp.
+        c['k1'] = 1
+        c['k2'] = 2
+        time.sleep(0.6)
+        c['k1'] = 11        # Update reset the ttl for k1.
+        c['k3'] = 3
+        time.sleep(0.6)
+
+        a = sorted(c.keys())
+        assert  a == ['k1' ,'k3']   ,f"Expect   ['k1' ,'k3'] ,but actual is {a}"
+        a = c.evicts
+        assert  a == 1      ,f"Expect   1       ,but actual is {a}"
+
+        time.sleep(0.6)
+        a = len(c.keys())
+        assert  a == 0      ,f"Expect   0       ,but actual is {a}"
+        a = c.evicts
+        assert  a == 3      ,f"Expect   3       ,but actual is {a}"
+
+        c = Cache( ttl=60 )  # Stale heap entries from repeated updates are compacted.
+        for i in range(1000):
+            c['k1'] = i
+        a = c['k1']
+        assert  a == 999    ,f"Expect   999     ,but actual is {a}"
+        a = c.evicts
+        assert  a == 0      ,f"Expect   0       ,but actual is {a}"
+
+        c = Cache( tti=60 )  # Stale idle heap entries from repeated deletes are compacted.
+        for i in range(1000):
+            c[f"k{i}"] = i
+            del c[f"k{i}"]
+        c['k1'] = 1
+        a = len( c._Cache__idle )
+        assert  a <= 66     ,f"Expect   <=66    ,but actual is {a}"
+
+    def test_eviction_03(self):
+        c = Cache( ttl=1 ,reaper=True )     # Expired entries are left for the background reaper.
+        a = c.reaper
+        assert  a == True   ,f"Expect   True    ,but actual is {a}"
+
+        c['k1'] = 1
+        c['k2'] = 2
+        c['k3'] = 3
+        time.sleep(1.2)
+
+        with pytest.raises(KeyError ,match=r'k1'):
+            _ = c['k1'] # Expired but not reaped is a miss.
+        a = c.get('k2')
+        assert  a is None   ,f"Expect   None    ,but actual is {a}"
+        a = len(c)
+        assert  a == 3      ,f"Expect   3       ,but actual is {a}"
+
+        a = c.evict_expired( 2 )    # Bounded batch.
+        assert  a == 2      ,f"Expect   2       ,but actual is {a}"
+        a = c.evict_expired( 2 )
+        assert  a == 1      ,f"Expect   1       ,but actual is {a}"
+        a = len(c)
+        assert  a == 0      ,f"Expect   0       ,but actual is {a}"
+
+    def test_eviction_04(self):
+        q = queue.Queue()
+        c = Cache( queue=q ,max=2 ,localevict=True )   # Capacity evictions are not queued out.
+        assert 'localevict' not in c ,"Expect the option to not be an entry."
+        c['k1'] = 1
+        c['k2'] = 2
+        c['k3'] = 3
+        a = [ q.get()[0] for _ in range( q.qsize() )]
+        assert  a == ['INS' ,'INS' ,'INS']  ,f"Expect   no EVT ,but actual is {a}"
+        assert  c.evicts == 1 and c.localEvicts == 1 ,f"Expect   1 local eviction ,but actual is {c.localEvicts}"
+        assert  c.is_dropped('k1')  ,"Expect the local eviction to not be requested back."
+
+        c.__delitem__('k2' ,None ,False ,replicated=True )  # Delete that arrived from outside.
+        del c['k3']
+        a = [ q.get()[0] for _ in range( q.qsize() )]
+        assert  a == ['DEL']    ,f"Expect   ['DEL'] ,but actual is {a}"
+        assert  c.deletes == 2 and c.replDeletes == 1 ,f"Expect   1 replicated delete ,but actual is {c.replDeletes}"
+        c.set_many({'k4': 4 ,'k5': 5})
+        c.delete_many(['k4' ,'k5'])         # Local bulk delete.
+        assert  c.deletes == 4 and c.replDeletes == 1 ,f"Expect   no more replicated deletes ,but actual is {c.replDeletes}"
+
+        c = Cache( queue=q ,max=2 )         # Capacity evictions are queued out by default.
+        c['k1'] = 1
+        c['k2'] = 2
+        c['k3'] = 3
+        a = [ q.get()[0] for _ in range( q.qsize() )]
+        assert 'EVT' in a       ,f"Expect   EVT     ,but actual is {a}"
+        assert  c.localEvicts == 0 ,f"Expect   0       ,but actual is {c.localEvicts}"
+
+    def test_eviction_05(self):
+        q = queue.Queue()
+        c = Cache( queue=q ,ttl=1 )     # Expiry is local.  Every member expire from the same origin timestamp.
+        c['k1'] = 1
+        _ = q.get()
+        time.sleep( 1.1 )
+        assert 'k1' not in c.keys()     ,"Expect k1 to have expired."
+        assert  q.empty()               ,"Expect the expiry to not be queued out."
+        assert  c.expires == 1 and c.localEvicts == 0 ,f"Expect   1 expiry ,but actual is {c.expires}"
+        assert  not c.is_dropped('k1')  ,"Expect the expiry to not be dropped."
+
+        now = Cache.tsm_version()
+        assert  c.has_expired( now - 2 * Cache.ONE_NS_SEC )         ,"Expect an entry set 2 seconds ago to have expired."
+        assert  not c.has_expired( now - 2 * Cache.ONE_NS_SEC ,5 )  ,"Expect its own ttl to be used."
+        assert  not c.has_expired( now )                            ,"Expect an entry set now to not have expired."
+
+    def test_arena_01(self):
+        a = Arena( 64 )     # Free list allocator.
+        s1 = a.put( b'x' * 20 )
+        s2 = a.put( b'y' * 10 )
+        assert  (s1.off ,s2.off) == (0 ,32) ,f"Expect   (0 ,32) ,but actual is {(s1.off ,s2.off)}"
+        assert  a.get( s2 ) == b'y' * 10    ,"Expect the stored bytes back."
+        a.release( s1 )
+        s3 = a.put( b'z' * 5 )
+        assert  s3.off == 0         ,f"Expect   0 first fit ,but actual is {s3.off}"
+        s4 = a.put( b'w' * 100 )    # NOTE: Grow the arena.
+        assert  a.size >= 160 and a.get( s2 ) == b'y' * 10 ,"Expect the arena to grow and keep the blocks."
+        for s in (s2 ,s3 ,s4):
+            a.release( s )
+        assert  a.used == 0 and a._free == [[0 ,a.size]] ,f"Expect one coalesced free block ,but actual is {a._free}"
+
+        c = Cache( arena=1024 ,max=3 )  # Values are stored serialized off the heap.
+        assert 'arena' not in c     ,"Expect the option to not be an entry."
+        c['k1'] = {'a': [1 ,2]}
+        c['k2'] = 'v2'
+        assert  isinstance( OrderedDict.__getitem__( c ,'k1' ) ,ArenaSlot ) ,"Expect only the slot in the heap."
+        assert  c['k1'] == {'a': [1 ,2]} and c.get('k2') == 'v2' ,"Expect the decoded values."
+        assert  c['k1'] is not c['k1']     ,"Expect a decode per read."
+        c['k2'] = 'v2' * 100        # NOTE: Replace and release the old block.
+        a = c.metadata['k2']['siz']
+        assert  a == OrderedDict.__getitem__( c ,'k2' ).siz ,f"Expect the size of the slot ,but actual is {a}"
+        c['k3'] = 3
+        c['k4'] = 4                 # NOTE: Evict k1.
+        assert  c.get_many(['k2' ,'k3']) == {'k2': 'v2' * 100 ,'k3': 3} ,"Expect the decoded values."
+        assert  sorted( c.values() ,key=str ) == [3 ,4 ,'v2' * 100] ,f"Expect the decoded values ,but actual is {c.values()}"
+        v = c.items()
+        assert  ('k3' ,3) in v and ('k5' ,5) not in v ,"Expect a view of the decoded items."
+        c.pop('k2')                 # NOTE: The view reflect the later changes.
+        c['k2'] = 'v2' * 100
+        assert  len( v ) == 3 and list( v )[-1] == ('k2' ,'v2' * 100) ,f"Expect a live view ,but actual is {v}"
+        assert  3 in c.values()     ,"Expect the decoded value in the view."
+        assert  c.pop('k3') == 3    ,"Expect the decoded value."
+        del c['k4']
+        c.delete_many(['k2'])
+        assert  c.arena.used == 0   ,f"Expect all blocks freed ,but actual is {c.arena.used}"
+
+    def test_compress_01(self):
+        c = Cache( compress='zlib' ,cmpsize=100 )  # Large values are compressed in memory.
+        assert 'compress' not in c  ,"Expect the option to not be an entry."
+        c['k1'] = 'x' * 5000
+        c['k2'] = 'small'
+        assert  isinstance( OrderedDict.__getitem__( c ,'k1' ) ,CompressedValue ) ,"Expect the large value compressed."
+        assert  OrderedDict.__getitem__( c ,'k2' ) == 'small' ,"Expect the small value as is."
+        assert  c['k1'] == 'x' * 5000 and c.get('k2') == 'small' ,"Expect the decompressed values."
+        assert  c.ttlSize < 5000    ,f"Expect the compressed size ,but actual is {c.ttlSize}"
+        assert  c.compresses == 1 and c.cmpratio > 10 ,f"Expect   a high ratio ,but actual is {c.cmpratio}"
+        assert  c.cmpTime > 0 and c.dcmTime > 0 ,"Expect the time spent to be measured."
+        assert  c.pop('k1') == 'x' * 5000   ,"Expect the decompressed value."
+
+        c = Cache( compress='lzma' ,cmpsize=100 ,arena=1024 )
+        c['k1'] = 'y' * 5000
+        assert  OrderedDict.__getitem__( c ,'k1' ).cmp  ,"Expect the compressed value in the arena."
+        assert  list( c.values() ) == ['y' * 5000] ,"Expect the decompressed values."
+        with pytest.raises( TypeError ):
+            Cache( compress='gzip' )
+
+    def test_lazy_01(self):
+        c = Cache()         # Serialized value that arrived from outside is unpickled on its first read.
+        c.__setitem__('k1' ,SerializedValue( pickle.dumps({'a': 1})) ,None ,False )
+        c.__setitem__('k2' ,SerializedValue( pickle.dumps([2])) ,None ,False )
+        assert  isinstance( OrderedDict.__getitem__( c ,'k1' ) ,SerializedValue ) ,"Expect the bytes to be stored as is."
+        assert  c.unpickles == 0    ,f"Expect   0       ,but actual is {c.unpickles}"
+        s = c.metadata['k1']['siz']
+        t = c.ttlSize
+
+        a = c['k1']
+        assert  a == {'a': 1}       ,f"Expect   {{'a': 1}} ,but actual is {a}"
+        assert  c['k1'] is a        ,"Expect the unpickled value to replace the bytes."
+        assert  c.unpickles == 1    ,f"Expect   1       ,but actual is {c.unpickles}"
+        a = c.metadata['k1']['siz']
+        assert  a == c.sizer({'a': 1}) ,f"Expect the value sized like a local value ,but actual is {a}"
+        a = c.ttlSize - t
+        assert  a == c.sizer({'a': 1}) - s ,f"Expect the total size re-accounted ,but actual is {a}"
+        assert  list( c.values() ) == [{'a': 1} ,[2]] ,f"Expect the values unpickled ,but actual is {list( c.values() )}"
+        assert  c.unpickles == 2    ,f"Expect   2       ,but actual is {c.unpickles}"
+
+    def test_sizer_01(self):
+        d = {'a': [1 ,2 ,3] ,'b': {'c': 'nested string value'}}
+        for sizer in ('deep' ,'shallow' ,'sample' ,'pickle' ,lambda v: 100):
+            c = Cache( sizer=sizer )
+            e = c.ttlSize
+            c['k1'] = d
+            c['k2'] = 'string value'
+            s = c.metadata['k1']['siz'] + c.metadata['k2']['siz']
+            assert  c.ttlSize == e + s  ,f"Expect   {e + s}  ,but actual is {c.ttlSize}"
+
+            c['k1'] = 'updated'
+            s = c.metadata['k1']['siz'] + c.metadata['k2']['siz']
+            assert  c.ttlSize == e + s  ,f"Expect   {e + s}  ,but actual is {c.ttlSize}"
+
+            del c['k1']
+            _ = c.pop('k2')
+            assert  c.ttlSize == e      ,f"Expect   {e}     ,but actual is {c.ttlSize}"
+
+        c = Cache( sizer=lambda v: 100 )
+        c['k1'] = d
+        a = c.metadata['k1']['siz']
+        assert  a == 100    ,f"Expect   100     ,but actual is {a}"
+
+        with pytest.raises(TypeError ,match=r'Unsupported sizer "bogus"!'):
+            c = Cache( sizer='bogus' )
+
+    def test_policy_01(self):
+        # FIFO evict the least recently updated even if it is read.
+        c = Cache( max=3 )
+        for k in ('k1' ,'k2' ,'k3'):
+            c[ k ] = k
+        _ = c['k1']
+        c['k4'] = 'k4'
+        a = list( c.keys() )
+        assert  a == ['k2' ,'k3' ,'k4'] ,f"Expect   ['k2' ,'k3' ,'k4'] ,but actual is {a}"
+
+        # LRU keep the recently read.
+        c = Cache( max=3 ,policy='lru' )
+        for k in ('k1' ,'k2' ,'k3'):
+            c[ k ] = k
+        _ = c['k1']
+        _ = c.get('k2')
+        c['k4'] = 'k4'
+        a = sorted( c.keys() )
+        assert  a == ['k1' ,'k2' ,'k4'] ,f"Expect   ['k1' ,'k2' ,'k4'] ,but actual is {a}"
+
+        # LFU keep the frequently read.
+        c = Cache( max=3 ,policy='lfu' )
+        for k in ('k1' ,'k2' ,'k3'):
+            c[ k ] = k
+        for _ in range( 3 ):
+            _ = c['k1']
+            _ = c['k3']
+        _ = c['k2']
+        c['k4'] = 'k4'
+        a = sorted( c.keys() )
+        assert  a == ['k1' ,'k3' ,'k4'] ,f"Expect   ['k1' ,'k3' ,'k4'] ,but actual is {a}"
+        c['k5'] = 'k5'  # The new k4 is the least frequently used.
+        a = sorted( c.keys() )
+        assert  a == ['k1' ,'k3' ,'k5'] ,f"Expect   ['k1' ,'k3' ,'k5'] ,but actual is {a}"
+
+        with pytest.raises(TypeError ,match=r'Unsupported policy "bogus"!'):
+            c = Cache( policy='bogus' )
+
+    def test_policy_02(self):
+        # Half the lookups are on a hot working set and the other half is a scan of one hit wonders.
+        def run(policy: str) -> Cache:
+            c = Cache( max=100 ,policy=policy )
+            r = random.Random( 1 )
+            s = iter( range( 10_000 ,100_000 ))
+            for _ in range( 10_000 ):
+                k = r.randrange( 50 ) if r.random() < 0.5 else next( s )
+                if  c.get( k ) is None:
+                    c[ k ] = k
+            return c
+
+        lru = run('lru')
+        tlf = run('tinylfu')
+        assert  tlf.hitratio > lru.hitratio + 0.1 ,f"Expect   TinyLFU to beat LRU ,but actual is {tlf.hitratio} vs {lru.hitratio}"
+        a = sum( 1 for k in range( 50 ) if k in tlf )
+        assert  a == 50     ,f"Expect   50      ,but actual is {a}"
+        assert  tlf.policy.rejected > tlf.policy.admitted ,"Expect most of the scan to be rejected."
+
+    def test_metadata_01(self):
+        c = Cache()
+        c['k1'] = 'v1'
+        m = c.metadata
+        assert  'k1' in m           ,"Expect   'k1' in the metadata."
+        assert  len( m ) == 1       ,f"Expect   1       ,but actual is {len( m )}"
+        assert  m['k1']['tsm'] == m['k1'].tsm   ,"Expect the record to be readable as a dictionary."
+        assert  m['k1']['siz'] > 0  ,"Expect the size to be recorded."
+        with pytest.raises(KeyError):
+            _ = m['k1']['bogus']
+        with pytest.raises(TypeError):
+            m['k2'] = {}            # Read-only view.
+
+        d = m.copy()
+        assert  type( d['k1'] ) is dict ,"Expect a plain dictionary copy."
+        assert  d['k1'] == m['k1']  ,"Expect the copy to equal the record."
+        assert  set( d['k1'] ) == {'tsm' ,'crc' ,'lkp' ,'siz' ,'ttl' ,'otl'} ,f"Expect all the fields ,but actual is {d['k1']}"
+
+    def test_checksum_01(self):
+        v = {'a': [1 ,2 ,3] ,'b': 'nested string value'}
+        for checksum ,expect in (('md5'      ,hashlib.md5( str( v ).encode() ).digest()),   # noqa: S324
+                                 ('blake2b'  ,hashlib.blake2b( str( v ).encode() ,digest_size=16 ).digest()),
+                                 ('pickle'   ,None),
+                                 (lambda v: b'fixed' ,b'fixed')):
+            c = Cache( checksum=checksum )
+            c['k1'] = v
+            a = c.metadata['k1']['crc']
+            if  expect is None:
+                assert  len( a ) == 16  ,f"Expect   16 bytes ,but actual is {a}"
+            else:
+                assert  a == expect     ,f"Expect   {expect} ,but actual is {a}"
+
+        # Lazy checksum is skipped without a consumer.
+        c = Cache( lazycrc=True )
+        c['k1'] = v
+        assert  c.metadata['k1']['crc'] is None ,"Expect no checksum without a queue or callback."
+        q = queue.Queue()
+        c = Cache( lazycrc=True ,queue=q )
+        c['k1'] = v
+        assert  c.metadata['k1']['crc'] is not None ,"Expect a checksum for the queued out value."
+
+        # A precomputed checksum is kept as is.
+        c = Cache()
+        c.__setitem__('k1' ,v ,None ,True ,b'precomputed')
+        assert  c.metadata['k1']['crc'] == b'precomputed' ,"Expect the precomputed checksum."
+
+        with pytest.raises(TypeError ,match=r'Unsupported checksum "bogus"!'):
+            c = Cache( checksum='bogus' )
+
+    def test_serialize_01(self):
+        q = queue.Queue()
+        c = Cache( queue=q ,serialize=True ,sizer='pickle' ,checksum='pickle' )
+        v = {'a': [1 ,2 ,3]}
+        c['k1'] = v
+        v['a'].append( 4 )  # Mutated after it was set.
+
+        opc ,_ ,_ ,key ,crc ,val ,_ = q.get()
+        assert  isinstance( val ,SerializedValue ) ,f"Expect   SerializedValue ,but actual is {type( val )}"
+        assert  pickle.loads( val ) == {'a': [1 ,2 ,3]} ,"Expect the value as it was set."
+        assert  crc == c.metadata['k1']['crc'] ,"Expect the queued checksum to be the stored checksum."
+        assert  crc == hashlib.blake2b( val ,digest_size=16 ).digest() ,"Expect the checksum off the serialized bytes."
+        a = c.metadata['k1']['siz']
+        assert  a == len( val ) ,f"Expect   {len( val )} ,but actual is {a}"
+
+        # Not serialized if it is not queued out.
+        c.__setitem__('k2' ,v ,None ,False)
+        assert  q.empty()   ,"Expect nothing queued out."
+
+    def test_bulk_01(self):
+        q = queue.Queue()
+        c = Cache( queue=q ,max=4 )
+        c.set_many({'k1': 1 ,'k2': 2})
+        c.set_many([('k2' ,22) ,('k3' ,3)])
+
+        opc ,tsm ,nms ,key ,_ ,val ,_ = q.get()
+        assert  opc == 'BAT'    ,f"Expect   BAT     ,but actual is {opc}"
+        assert  key is None     ,f"Expect   None    ,but actual is {key}"
+        a = [(e[0] ,e[1] ,e[4]) for e in val]
+        assert  a == [('INS' ,'k1' ,1) ,('INS' ,'k2' ,2)] ,f"Expect   two inserts ,but actual is {a}"
+        _ ,_ ,_ ,_ ,_ ,val ,_ = q.get()
+        a = [(e[0] ,e[1] ,e[4]) for e in val]
+        assert  a == [('UPD' ,'k2' ,22) ,('INS' ,'k3' ,3)] ,f"Expect   update and insert ,but actual is {a}"
+        assert  val[0][3] == c.metadata['k2']['crc'] ,"Expect the queued checksum to be the stored checksum."
+        assert  q.empty()       ,"Expect one message per batch."
+
+        a = c.get_many(['k1' ,'k3' ,'k9'])
+        assert  a == {'k1': 1 ,'k3': 3} ,f"Expect   k1 and k3 ,but actual is {a}"
+        assert  c.misses  == 1  ,f"Expect   1       ,but actual is {c.misses}"
+
+        a = c.delete_many(['k1' ,'k2' ,'k9'])
+        assert  a == 2          ,f"Expect   2       ,but actual is {a}"
+        assert  list( c.keys()) == ['k3'] ,f"Expect   ['k3']  ,but actual is {list( c.keys())}"
+        _ ,_ ,_ ,_ ,_ ,val ,_ = q.get()
+        a = [(e[0] ,e[1]) for e in val]
+        assert  a == [('DEL' ,'k1') ,('DEL' ,'k2')] ,f"Expect   two deletes ,but actual is {a}"
+
+        # Update is queued out as one batch.
+        c.update({'k3': 33 ,'k4': 4})
+        _ ,_ ,_ ,_ ,_ ,val ,_ = q.get()
+        a = [(e[0] ,e[1]) for e in val]
+        assert  a == [('UPD' ,'k3') ,('INS' ,'k4')] ,f"Expect   update and insert ,but actual is {a}"
+        assert  q.empty()       ,"Expect one message per update."
+        c.delete_many(['k3' ,'k4'])
+        _ = q.get()
+
+        # Batch over the capacity evict the earliest entries.
+        c.set_many({f"b{i}": i for i in range( 6 )})
+        a = len( c )
+        assert  a == 4          ,f"Expect   4       ,but actual is {a}"
+        assert  c.evicts == 2   ,f"Expect   2       ,but actual is {c.evicts}"
+
+    def test_get_or_load_01(self):
+        c = Cache()
+        calls = []
+        gate  = threading.Event()
+
+        def loader(key):
+            calls.append( key )
+            gate.wait( 2 )
+            return  f"loaded {key}"
+
+        results = []
+        threads = [ threading.Thread( target=lambda: results.append( c.get_or_load('k1' ,loader ))) for _ in range( 8 )]
+        for t in threads:
+            t.start()
+        while c.flight.waits < 7:
+            time.sleep( 0.01 )
+        gate.set()
+        for t in threads:
+            t.join()
+
+        assert  calls == ['k1']     ,f"Expect   one load ,but actual is {calls}"
+        assert  results == ['loaded k1'] * 8 ,f"Expect   the loaded value for all ,but actual is {results}"
+        assert  c['k1'] == 'loaded k1'  ,"Expect the loaded value to be cached."
+        m = c.flight.metrics()
+        assert  m['loads'] == 1     ,f"Expect   1       ,but actual is {m['loads']}"
+        assert  m['waitMax'] == 7   ,f"Expect   7       ,but actual is {m['waitMax']}"
+
+        # Cached value is not loaded again.
+        assert  c.get_or_load('k1' ,loader) == 'loaded k1' ,"Expect the cached value."
+        assert  len( calls ) == 1   ,f"Expect   1       ,but actual is {len( calls )}"
+
+        # Loader exception is raised and nothing is cached.
+        def failed(key):
+            raise ValueError( key )
+        with pytest.raises(ValueError):
+            c.get_or_load('k2' ,failed)
+        assert 'k2' not in c        ,"Expect nothing cached."
+
+        # Per entry ttl.
+        _ = c.get_or_load('k3' ,loader ,ttl=1)
+        assert  c.metadata['k3']['ttl'] == 1 ,f"Expect   1       ,but actual is {c.metadata['k3']['ttl']}"
+        time.sleep( 1.1 )
+        assert 'k3' not in c.keys() ,"Expect k3 to have expired."
+        assert 'k1'     in c.keys() ,"Expect k1 to have no expiry."
+
+    def test_get_or_load_02(self):
+        claims = []
+        def claimer(nms ,key):
+            claims.append( key )
+            return  0.5 if key == 'k1' else 0.1     # Another party is loading.
+
+        c = Cache( claimer=claimer )
+        assert 'claimer' not in c   ,"Expect the option to not be an entry."
+        threading.Timer( 0.1 ,lambda: c.__setitem__('k1' ,'from peer' ,None ,False)).start()
+        a = c.get_or_load('k1' ,lambda key: 'local')
+        assert  a == 'from peer'    ,f"Expect   from peer ,but actual is {a}"
+        assert  c.flight.deferred == 1 ,f"Expect   1       ,but actual is {c.flight.deferred}"
+
+        # Claimant never deliver.  Fall back to a local load.
+        a = c.get_or_load('k2' ,lambda key: 'local')
+        assert  a == 'local'        ,f"Expect   local   ,but actual is {a}"
+        assert  c.flight.timeouts == 1 ,f"Expect   1       ,but actual is {c.flight.timeouts}"
+        assert  claims == ['k1' ,'k2'] ,f"Expect   ['k1' ,'k2'] ,but actual is {claims}"
+
+    def test_ttl_entry_01(self):
+        q = queue.Queue()
+        c = Cache( queue=q ,ttl=60 )
+        c.set('k1' ,1 ,ttl=1)
+        c['k2'] = 2
+        msg = q.get()
+        assert  len( msg ) == 8 and msg[7] == 1 ,f"Expect   the ttl to trail the message ,but actual is {msg}"
+        msg = q.get()
+        assert  len( msg ) == 7     ,f"Expect   no ttl for the cache ttl ,but actual is {msg}"
+        assert  c.metadata['k2']['ttl'] == 0 ,f"Expect   0       ,but actual is {c.metadata['k2']['ttl']}"
+
+        time.sleep( 1.1 )
+        assert 'k1' not in c.keys() ,"Expect k1 to have expired."
+        assert 'k2'     in c.keys() ,"Expect k2 to have not expired."
+
+        # Jittered ttl is shorter, spread out and queued out.
+        q = queue.Queue()
+        c = Cache( queue=q ,ttl=100 ,jitter=20 )
+        assert 'jitter' not in c    ,"Expect the option to not be an entry."
+        c.set_many({f"k{i}": i for i in range( 50 )})
+        _ ,_ ,_ ,_ ,_ ,val ,_ = q.get()
+        a = { e[5] for e in val }
+        assert  all( 80 <= t <= 100 for t in a ) ,f"Expect   80 to 100 ,but actual is {a}"
+        assert  len( a ) > 1        ,"Expect the ttl to be spread out."
+        assert  val[0][5] == c.metadata['k0']['ttl'] ,"Expect the queued ttl to be the stored ttl."
+
+        # Entry from outside is not jittered again.
+        c.__setitem__('k99' ,99 ,None ,False ,None ,30)
+        assert  c.metadata['k99']['ttl'] == 30 ,f"Expect   30      ,but actual is {c.metadata['k99']['ttl']}"
+
+    def test_tti_01(self):
+        q = queue.Queue()
+        c = Cache( queue=q ,tti=1 )
+        assert 'tti' not in c   ,"Expect the option to not be an entry."
+        c['k1'] = 1
+        c['k2'] = 2
+        _ = q.get() ,q.get()
+        time.sleep( 0.6 )
+        assert  c['k1'] == 1    ,"Expect k1 to be looked up."
+        time.sleep( 0.6 )
+
+        # k2 was never looked up.  k1 was looked up 0.6 second ago.
+        assert 'k1'     in c.keys() ,"Expect k1 to have not been idle."
+        assert 'k2' not in c.keys() ,"Expect k2 to have been idle."
+        assert  c.evicts == 1   ,f"Expect    1 ,but actual is {c.evicts}"
+        assert  q.empty()       ,"Expect the idle eviction to not be queued out."
+        assert  c.is_dropped('k2') and not c.is_dropped('k1') ,"Expect only k2 to be dropped."
+        assert  c.localEvicts == 1 and c.expires == 0 ,"Expect the idle eviction to be a local eviction."
+
+        c['k2'] = 2
+        assert  not c.is_dropped('k2') ,"Expect k2 to no longer be dropped once it is set."
+
+        # Reads treat an idle but not yet reaped entry as a miss.
+        c = Cache( tti=1 ,reaper=True )
+        c['k1'] = 1
+        time.sleep( 1.1 )
+        assert  c.get('k1') is None ,"Expect the idle entry to be a miss."
+        assert 'k1' not in c        ,"Expect the idle entry to not be in the cache."
+        assert  len( c ) == 1       ,"Expect the idle entry to be counted until it is reaped."
+        assert  c.evict_expired() == 1 ,"Expect the reaper to evict the idle entry."
+
+    def test_refresh_01(self):
+        calls = []
+        def loader(key):
+            calls.append( key )
+            time.sleep( 0.1 )
+            return  f"fresh {key}"
+
+        c = Cache( ttl=2 ,refresh=50 ,loader=loader )
+        c['k1'] = 'stale k1'
+        assert  c['k1'] == 'stale k1'   ,"Expect the value before it is stale."
+        time.sleep( 1.1 )
+        for _ in range( 5 ):
+            assert  c['k1'] == 'stale k1'   ,"Expect the stale value while it is reloading."
+        time.sleep( 0.3 )
+        assert  c['k1'] == 'fresh k1'   ,"Expect the reloaded value."
+        assert  calls == ['k1']         ,f"Expect   one reload ,but actual is {calls}"
+        assert  c.refreshes == 1        ,f"Expect   1       ,but actual is {c.refreshes}"
+
+        # XFetch with a huge beta always reload early.
+        c = Cache( ttl=60 ,xfetch=1e9 ,loader=loader )
+        c['k2'] = 'stale k2'
+        _ = c['k2']
+        time.sleep( 0.3 )
+        assert  c['k2'] == 'fresh k2'   ,"Expect the early reloaded value."
+
+        c = Cache( ttl=2 ,jitter=50 ,refresh=10 ,loader=lambda key: key )  # Refresh with jitter.
+        c['k4'] = 'k4'
+        for _ in range( 10 ):
+            _ = c['k4']
+            time.sleep( 0.25 )
+        assert 'k4' in c            ,"Expect the refreshed key to never expire."
+        assert  1.0 <= c.metadata['k4']['ttl'] <= 2 and c.metadata['k4']['otl'] == 0 ,f"Expect the ttl jittered off 2 ,but actual is {c.metadata['k4']}"
+
+        c = Cache( ttl=60 ,loader=loader )
+        c['k3'] = 'new k3'
+        c._refresh({'nms': c.name ,'key': 'k3' ,'tsm': 0 ,'ttl': None})   # NOTE: Updated since it was found stale.
+        assert  c['k3'] == 'new k3' and 'k3' not in calls ,"Expect no reload of an updated entry."
+
+    def test_hitratio_01(self):
+        c = Cache()
+        c['k1'] = 1
+        _ = c['k1']
+        _ = c.get('k1')
+        _ = c.get('k2')
+        with pytest.raises(KeyError):
+            _ = c['k2']
+        assert  c.lookups == 2  ,f"Expect   2       ,but actual is {c.lookups}"
+        assert  c.misses  == 2  ,f"Expect   2       ,but actual is {c.misses}"
+        assert  c.hitratio == 0.5 ,f"Expect   0.5     ,but actual is {c.hitratio}"
+
+    def test_locking_01(self):
+        c1 = Cache()
+        c2 = Cache( stripes=8 )
+        assert  c1.lock is not c2.lock ,"Expect each cache to have its own lock."
+
+        def work(c ,n):
+            for i in range( 500 ):
+                c[f"k{n}_{i % 50}"] = i
+                _ = c.get(f"k{n}_{i % 50}")
+
+        threads = [ threading.Thread( target=work ,args=(c ,n)) for c in (c1 ,c2) for n in range( 4 )]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        for c in (c1 ,c2):
+            a = len( c )
+            assert  a == 200    ,f"Expect   200     ,but actual is {a}"
+            s = sum( m['siz'] for m in c.metadata.values() )
+            assert  c.ttlSize - s == Cache( sizer=c.sizer ).ttlSize ,"Expect the size to be consistent."
+
+    def test_locking_02(self):
+        c = Cache( stripes=8 ,max=20 )     # Striped with the ttl and capacity evictions.
+
+        def work(n):
+            for i in range( 2000 ):
+                c.set(f"k{n}_{i % 50}" ,i ,ttl=0.01 )   # NOTE: The cache ttl is whole seconds.  The entry ttl is not.
+                _ = c.get(f"k{n}_{i % 50}")
+                if  i % 100 == 0:
+                    c.set_many({f"b{n}_{j}": j for j in range( 5 )})
+                    c.delete_many([f"b{n}_{j}" for j in range( 5 )])
+
+        threads = [ threading.Thread( target=work ,args=(n ,) ,daemon=True ) for n in range( 8 )]
+        for t in threads:
+            t.start()
+        end = time.time() + 30
+        for t in threads:
+            t.join( timeout=max( 0 ,end - time.time() ))
+        assert  not any( t.is_alive() for t in threads ) ,"Expect no deadlock between the instance and the key locks."
+        assert  c.evicts > 0        ,"Expect the evictions to be exercised."
+        assert  len( c ) <= 20      ,f"Expect   <=20    ,but actual is {len( c )}"
+        time.sleep( 0.05 )
+        _ = c._evict_items_by_ttl()
+        assert  len( c ) == 0       ,f"Expect   0       ,but actual is {len( c )}"
+
     def test_queue(self):
         q = queue.Queue()
         c = Cache( queue=q )
@@ -492,6 +1096,45 @@ class   TestCache:
         time.sleep(0.5)
         c['k1'] = False
 
+    def test_callback_dispatcher(self):
+        gate = threading.Event()
+        got  = []
+        def callback(ctx: dict):
+            gate.wait( 5 )
+            got.append( ctx )
+
+        d = CallbackDispatcher( workers=1 ,backlog=2 )
+        assert  d.submit( callback ,{'nms': 'n' ,'key': 'k0' ,'prvcrc': b'0' ,'newcrc': b'1'})
+        time.sleep( 0.1 )   # The worker is now blocked delivering k0.
+        assert  d.submit( callback ,{'nms': 'n' ,'key': 'k1' ,'prvcrc': b'1' ,'newcrc': b'2'})
+        assert  d.submit( callback ,{'nms': 'n' ,'key': 'k1' ,'prvcrc': b'2' ,'newcrc': b'3'})  # Coalesced.
+        assert  d.submit( callback ,{'nms': 'n' ,'key': 'k2' ,'prvcrc': b'0' ,'newcrc': b'1'})
+        assert  not d.submit( callback ,{'nms': 'n' ,'key': 'k3' ,'prvcrc': b'0' ,'newcrc': b'1'}) # Dropped.
+        gate.set()
+        assert  d.join( 5 )
+
+        m = d.metrics()
+        assert  m['workers']   == 1 ,f"Expect   1       ,but actual is {m['workers']}"
+        assert  m['delivered'] == 3 ,f"Expect   3       ,but actual is {m['delivered']}"
+        assert  m['coalesced'] == 1 ,f"Expect   1       ,but actual is {m['coalesced']}"
+        assert  m['dropped']   == 1 ,f"Expect   1       ,but actual is {m['dropped']}"
+        k1 = [ c for c in got if c['key'] == 'k1' ][0]
+        assert  (k1['prvcrc'] ,k1['newcrc']) == (b'1' ,b'3') ,f"Expect   the whole change ,but actual is {k1}"
+
+    def test_callback_dispatcher_loop(self):
+        got = []
+        async def callback(ctx: dict):
+            got.append( ctx['key'] )
+
+        async def main():
+            d = CallbackDispatcher( loop=asyncio.get_running_loop() )
+            d.submit( callback ,{'nms': 'n' ,'key': 'k1'})
+            await asyncio.to_thread( d.join ,5 )
+            await asyncio.sleep( 0.1 )
+
+        asyncio.run( main() )
+        assert  got == ['k1']   ,f"Expect   ['k1']  ,but actual is {got}"
+
 
 # The MIT License (MIT)
 # Copyright (c) 2023 Edward Lau.